@@ -0,0 +1,184 @@
+"""
+Authentication backends for the REST API.
+
+CachedTokenAuthentication keeps the token -> user lookup of DRF's
+TokenAuthentication in a process-local LRU with TTL, optionally backed by a
+shared Django cache (TOKEN_AUTH_CACHE['SHARED_CACHE']). Entries are dropped
+on logout, token rotation, and any save or deletion of the user (see
+auth_app.signals). Other worker processes see these changes after at most
+TOKEN_AUTH_CACHE['TTL'] seconds.
+
+StatelessJWTAuthentication accepts "Bearer" access tokens and rebuilds the
+user from the token claims without a database query. Revoked tokens are
+tracked in the cache named by JWT_REVOCATION['CACHE']. Every token of one
+login shares a session id ("sid" claim), so logout revokes the refresh
+token and the access tokens issued from it, too.
+
+authenticate_raw_token accepts either kind of credential without an
+Authorization header, for WebSocket handshakes.
+"""
+
+import copy
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.cache import LRUTTLCache
+
+_local_cache = None
+
+
+def get_local_cache():
+    """Return the process-local token cache, creating it from settings on first use."""
+    global _local_cache
+    if _local_cache is None:
+        config = settings.TOKEN_AUTH_CACHE
+        _local_cache = LRUTTLCache(maxsize=config['MAX_SIZE'], ttl=config['TTL'])
+    return _local_cache
+
+
+def get_shared_cache():
+    """Return the configured shared cache, or None if only the local cache is used."""
+    alias = settings.TOKEN_AUTH_CACHE.get('SHARED_CACHE')
+    return caches[alias] if alias else None
+
+
+def shared_key(key):
+    """Return the shared cache key for a token without storing the token itself."""
+    return 'authtoken:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(key):
+    """Forget the cached lookup of one token."""
+    get_local_cache().delete(key)
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.delete(shared_key(key))
+
+
+def invalidate_user(user_id):
+    """Forget all cached lookups that resolve to the given user."""
+    get_local_cache().delete_where(lambda entry: entry[0].pk == user_id)
+    shared = get_shared_cache()
+    if shared is not None:
+        keys = Token.objects.filter(user_id=user_id).values_list('key', flat=True)
+        shared.delete_many([shared_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that serves repeated token lookups from a cache."""
+
+    def authenticate_credentials(self, key):
+        local = get_local_cache()
+        entry = local.get(key)
+        if entry is None:
+            shared = get_shared_cache()
+            entry = shared.get(shared_key(key)) if shared is not None else None
+            if entry is None:
+                entry = super().authenticate_credentials(key)
+                if shared is not None:
+                    shared.set(shared_key(key), entry, settings.TOKEN_AUTH_CACHE['TTL'])
+            local.set(key, entry)
+        user, token = entry
+        # Hand out copies so per-request state never leaks into the cache.
+        return copy.copy(user), token
+
+
+def jwt_pair_for_user(user):
+    """Return a refresh/access token pair carrying the claims the stateless user is built from."""
+    refresh = RefreshToken.for_user(user)
+    # Copied into every access token made from this refresh token.
+    refresh['sid'] = refresh['jti']
+    refresh['email'] = user.email
+    refresh['first_name'] = user.first_name
+    refresh['last_name'] = user.last_name
+    return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+
+def get_revocation_cache():
+    return caches[settings.JWT_REVOCATION['CACHE']]
+
+
+def revoke_jwt(token):
+    """Reject the token (by jti) and every token of its session (by sid) until they expire anyway."""
+    revocations = {f"jwt:revoked:{token['jti']}": max(int(token['exp'] - time.time()), 1)}
+    if token.get('sid'):
+        revocations[f"jwt:revoked:{token['sid']}"] = int(jwt_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+    cache = get_revocation_cache()
+    for key, timeout in revocations.items():
+        cache.set(key, True, timeout)
+
+
+def revoke_user_jwts(user_id):
+    """Reject every token of the user issued up to now, e.g. after deactivation."""
+    lifetime = max(jwt_settings.ACCESS_TOKEN_LIFETIME, jwt_settings.REFRESH_TOKEN_LIFETIME)
+    get_revocation_cache().set(f"jwt:revoked-user:{user_id}", time.time(), int(lifetime.total_seconds()))
+
+
+def is_jwt_revoked(token):
+    """Return True if the token, its session or all tokens of its user were revoked."""
+    user_key = f"jwt:revoked-user:{token[jwt_settings.USER_ID_CLAIM]}"
+    token_keys = [f"jwt:revoked:{token.get('jti')}"]
+    if token.get('sid'):
+        token_keys.append(f"jwt:revoked:{token['sid']}")
+    revoked = get_revocation_cache().get_many([*token_keys, user_key])
+    if any(revoked.get(key) for key in token_keys):
+        return True
+    revoked_at = revoked.get(user_key)
+    return revoked_at is not None and token.get('iat', 0) <= revoked_at
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that never queries the user table.
+
+    The user is an unsaved User instance carrying the id, email and name
+    from the claims. It compares equal to the stored user and works in ORM
+    filters, but it must not be saved.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = int(validated_token[jwt_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken("Token contained no recognizable user identification")
+        if is_jwt_revoked(validated_token):
+            raise InvalidToken("Token has been revoked")
+        email = validated_token.get('email', '')
+        user = get_user_model()(
+            pk=user_id,
+            username=email,
+            email=email,
+            first_name=validated_token.get('first_name', ''),
+            last_name=validated_token.get('last_name', ''),
+            is_active=True,
+        )
+        user._state.adding = False
+        return user
+
+
+def authenticate_raw_token(raw):
+    """
+    Return the user for a bare token key or JWT access token, or None if it is invalid.
+
+    Browsers cannot set headers on WebSocket handshakes, so sockets pass the
+    credential as a query parameter instead.
+    """
+    try:
+        if raw.count('.') == 2:
+            backend = StatelessJWTAuthentication()
+            return backend.get_user(backend.get_validated_token(raw))
+        user, _ = CachedTokenAuthentication().authenticate_credentials(raw)
+        return user
+    except AuthenticationFailed:
+        return None
@@ -0,0 +1,88 @@
+"""
+Case-insensitive user lookups by email address.
+
+Addresses are matched as LOWER(email) IN (<lowercased addresses>), which
+the unique partial index auth_user_email_lower_uniq (migration
+auth_app.0001_user_email_lower_index) answers with one index probe per
+address instead of a scan of the user table. The same index stops two
+accounts from differing only in the case of their address.
+
+lookup_email and lookup_emails serve the email checks from a process-local
+LRU with TTL (EMAIL_LOOKUP_CACHE) that holds misses as well as hits.
+Entries are dropped when a user is saved or deleted (see auth_app.signals);
+other worker processes see the change after at most
+EMAIL_LOOKUP_CACHE['TTL'] seconds.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
+
+from core.cache import LRUTTLCache
+
+_cache = None
+_MISSING = object()
+
+
+def get_email_cache():
+    """Return the process-local lookup cache, creating it from settings on first use."""
+    global _cache
+    if _cache is None:
+        config = settings.EMAIL_LOOKUP_CACHE
+        _cache = LRUTTLCache(maxsize=config['MAX_SIZE'], ttl=config['TTL'])
+    return _cache
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def users_with_emails(emails):
+    """Return a queryset of the users whose address matches one of ``emails`` in any case."""
+    # email > '' repeats the index predicate so the partial index qualifies.
+    return get_user_model().objects.alias(email_lower=Lower('email')).filter(
+        email_lower__in=[normalize_email(email) for email in emails], email__gt='',
+    )
+
+
+def users_with_email(email):
+    return users_with_emails([email])
+
+
+def user_record(user):
+    return {"id": user.id, "email": user.email, "fullname": f"{user.first_name} {user.last_name}"}
+
+
+def lookup_emails(emails):
+    """
+    Return {normalized address: {"id", "email", "fullname"} or None} for
+    the given addresses. Addresses not in the cache are resolved together
+    with one query.
+    """
+    cache = get_email_cache()
+    records, uncached = {}, []
+    for key in dict.fromkeys(filter(None, map(normalize_email, emails))):
+        record = cache.get(key, _MISSING)
+        if record is _MISSING:
+            uncached.append(key)
+        else:
+            records[key] = record
+    if uncached:
+        users = users_with_emails(uncached).only('id', 'email', 'first_name', 'last_name')
+        found = {normalize_email(user.email): user_record(user) for user in users}
+        for key in uncached:
+            records[key] = found.get(key)
+            cache.set(key, records[key])
+    return records
+
+
+def lookup_email(email):
+    """Return {"id", "email", "fullname"} of the user with this address, or None."""
+    return lookup_emails([email]).get(normalize_email(email))
+
+
+def forget_email(user):
+    """Drop cached lookups of the user's current address and any that resolved to the user."""
+    cache = get_email_cache()
+    cache.delete(normalize_email(user.email))
+    cache.delete_where(lambda record: record is not None and record['id'] == user.pk)
@@ -1,6 +1,10 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from django.contrib.auth import get_user_model, authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+
+from .authentication import is_jwt_revoked, jwt_pair_for_user
+from .emails import users_with_email
 
 User = get_user_model()
 
@@ -17,8 +21,8 @@ class RegistrationSerializer(serializers.Serializer):
     repeated_password = serializers.CharField(write_only=True)
 
     def validate_email(self, value):
-        """Ensure email address is not already registered."""
-        if User.objects.filter(email=value).exists():
+        """Ensure email address is not already registered, in any case."""
+        if users_with_email(value).exists():
             raise serializers.ValidationError("Email already registered.")
         return value
 
@@ -50,9 +54,8 @@ class RegistrationSerializer(serializers.Serializer):
 
     def to_representation(self, instance):
         """Return a serialized representation including JWT token."""
-        refresh = RefreshToken.for_user(instance)
         return {
-            "token": str(refresh.access_token),
+            "token": jwt_pair_for_user(instance)["access"],
             "user_id": instance.id,
             "email": instance.email,
             "fullname": f"{instance.first_name} {instance.last_name}"
@@ -80,10 +83,18 @@ class CustomTokenObtainPairSerializer(serializers.Serializer):
         if not user:
             raise serializers.ValidationError("No active account found with the given credentials")
 
-        refresh = RefreshToken.for_user(user)
         return {
-            "token": str(refresh.access_token),
+            "token": jwt_pair_for_user(user)["access"],
             "user_id": user.id,
             "email": user.email,
             "fullname": f"{user.first_name} {user.last_name}"
-        }
\ No newline at end of file
+        }
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuses refresh tokens revoked by logout or deactivation."""
+
+    def validate(self, attrs):
+        if is_jwt_revoked(self.token_class(attrs['refresh'])):
+            raise InvalidToken("Token has been revoked")
+        return super().validate(attrs)
@@ -1,9 +1,11 @@
 from django.urls import path
 
-from .views import RegistrationView, CustomLoginView, EmailCheckView
+from .views import RegistrationView, CustomLoginView, LogoutView, EmailCheckView, EmailBatchCheckView
 
 urlpatterns = [
     path('registration/', RegistrationView.as_view(), name='registration'),
     path('login/', CustomLoginView.as_view(), name='login'),
+    path('logout/', LogoutView.as_view(), name='logout'),
     path('email-check/', EmailCheckView.as_view(), name='email-check'),
+    path('email-check/batch/', EmailBatchCheckView.as_view(), name='email-check-batch'),
 ]
@@ -1,11 +1,17 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.tokens import Token as JWTToken
+from rest_framework_simplejwt.views import TokenRefreshView as BaseTokenRefreshView
 from django.contrib.auth import authenticate, get_user_model
+from django.db import IntegrityError, transaction
 
-from .serializers import RegistrationSerializer
+from core.throttling import TokenBucketThrottle
+from .authentication import jwt_pair_for_user, revoke_jwt
+from .emails import lookup_email, lookup_emails, normalize_email
+from .serializers import RegistrationSerializer, RevocableTokenRefreshSerializer
 
 User = get_user_model()
 
@@ -22,10 +28,16 @@ class RegistrationView(APIView):
         """Register a new user."""
         serializer = RegistrationSerializer(data=request.data)
         if serializer.is_valid():
-            user = serializer.save()
+            try:
+                with transaction.atomic():
+                    user = serializer.save()
+            except IntegrityError:
+                # Lost a race with a concurrent registration of the same address.
+                return Response({"email": ["Email already registered."]}, status=status.HTTP_400_BAD_REQUEST)
             token, _ = Token.objects.get_or_create(user=user)
             data = serializer.to_representation(user)
             data["token"] = token.key
+            data.update(jwt_pair_for_user(user))
             return Response(data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -33,7 +45,8 @@ class CustomLoginView(APIView):
     """
     API endpoint for user login.
 
-    Authenticates user credentials and returns an authentication token.
+    Authenticates user credentials and returns an authentication token
+    plus a JWT access/refresh pair for the stateless "Bearer" scheme.
     """
     permission_classes = [AllowAny]
 
@@ -50,16 +63,47 @@ class CustomLoginView(APIView):
         token, _ = Token.objects.get_or_create(user=user)
         return Response({
             "token": token.key, "user_id": user.id,
-            "email": user.email, "fullname": f"{user.first_name} {user.last_name}"
+            "email": user.email, "fullname": f"{user.first_name} {user.last_name}",
+            **jwt_pair_for_user(user),
         }, status=200)
-    
+
+
+class LogoutView(APIView):
+    """
+    API endpoint for user logout.
+
+    Deletes the authentication token used for the request, which also
+    drops it from the token lookup cache. A JWT is added to the revocation
+    list together with its session, which covers the refresh token.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """Invalidate the current token."""
+        if isinstance(request.auth, Token):
+            Token.objects.filter(key=request.auth.key).delete()
+        elif isinstance(request.auth, JWTToken):
+            revoke_jwt(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TokenRefreshView(BaseTokenRefreshView):
+    """Simple JWT's refresh endpoint, minus revoked refresh tokens."""
+    serializer_class = RevocableTokenRefreshSerializer
+
+
 class EmailCheckView(APIView):
     """
     API endpoint for verifying if an email exists in the system.
 
     Used for frontend validation when adding collaborators or new users.
+    Matching ignores case and is served from a short-lived cache (see
+    auth_app.api.emails); clients are throttled with a token bucket at the
+    'email_check' rate.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'email_check'
 
     def get(self, request):
         """Check if a user with the given email exists."""
@@ -70,13 +114,41 @@ class EmailCheckView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        user = User.objects.filter(email=email).first()
-        if not user:
+        record = lookup_email(email)
+        if not record:
             return Response({"exists": False}, status=status.HTTP_200_OK)
 
-        return Response({
-            "exists": True,
-            "id": user.id,
-            "email": user.email,
-            "fullname": f"{user.first_name} {user.last_name}"
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response({"exists": True, **record}, status=status.HTTP_200_OK)
+
+
+class EmailBatchCheckView(APIView):
+    """
+    API endpoint for resolving many email addresses at once.
+
+    Lets collaborator pickers look up a pasted list of addresses with one
+    request and at most one query instead of one email check per address.
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'email_check_batch'
+    max_emails = 100
+
+    def post(self, request):
+        """Return the users found for the given addresses and the addresses without one."""
+        emails = request.data.get('emails')
+        if not isinstance(emails, list) or not all(isinstance(email, str) for email in emails):
+            return Response({"detail": "emails must be a list of addresses."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(emails) > self.max_emails:
+            return Response({"detail": f"At most {self.max_emails} addresses per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        records = lookup_emails(emails)
+        users, missing, seen = [], [], set()
+        for email in emails:
+            record = records.get(normalize_email(email))
+            if record is None:
+                missing.append(email)
+            elif record['id'] not in seen:
+                seen.add(record['id'])
+                users.append(record)
+        return Response({"users": users, "missing": missing}, status=status.HTTP_200_OK)
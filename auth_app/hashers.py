@@ -0,0 +1,49 @@
+"""
+Password hashers whose cost comes from settings.PASSWORD_HASHING.
+
+The algorithm names are Django's own, so existing hashes stay valid.
+Each hasher reports ``must_update`` whenever a stored hash was made with a
+different cost, so Django rehashes the password on the next successful
+login, both when the cost is raised and when it is lowered.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher, BCryptSHA256PasswordHasher, PBKDF2PasswordHasher,
+)
+
+
+def _cost(name):
+    return settings.PASSWORD_HASHING[name]
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with PASSWORD_HASHING['PBKDF2_ITERATIONS'] iterations."""
+
+    @property
+    def iterations(self):
+        return _cost('PBKDF2_ITERATIONS')
+
+
+class TunedBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    """bcrypt-SHA256 with a work factor of PASSWORD_HASHING['BCRYPT_ROUNDS']."""
+
+    @property
+    def rounds(self):
+        return _cost('BCRYPT_ROUNDS')
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with time, memory and parallelism cost from PASSWORD_HASHING (requires argon2-cffi)."""
+
+    @property
+    def time_cost(self):
+        return _cost('ARGON2_TIME_COST')
+
+    @property
+    def memory_cost(self):
+        return _cost('ARGON2_MEMORY_COST')
+
+    @property
+    def parallelism(self):
+        return _cost('ARGON2_PARALLELISM')
@@ -0,0 +1,64 @@
+"""
+Measure password verifications per second on one core for each hasher policy.
+
+A login is dominated by the password check, so the number of verifications a
+single process manages per second is the login throughput of one worker
+core. The costs come from settings.PASSWORD_HASHING, so the effect of a
+tuning change can be measured by setting the environment variables first.
+
+Usage:
+    python manage.py benchmark_login --duration 3
+    BCRYPT_ROUNDS=10 python manage.py benchmark_login --policy bcrypt
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    help = "Print password verifications (logins) per second per core for each hasher policy."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--policy', action='append', choices=list(settings.PASSWORD_HASHER_POLICIES),
+                            help='Policy to measure; repeat for several. Defaults to all.')
+        parser.add_argument('--duration', type=float, default=2.0, help='Seconds to measure each policy.')
+
+    def handle(self, *args, **options):
+        policies = options['policy'] or list(settings.PASSWORD_HASHER_POLICIES)
+        active = settings.PASSWORD_HASHING['POLICY']
+        self.stdout.write(f"{'policy':8} {'cost':34} {'hash ms':>8} {'logins/s':>9}")
+        for policy in policies:
+            hasher = import_string(settings.PASSWORD_HASHER_POLICIES[policy])()
+            try:
+                hash_ms, encoded = self.time_hash(hasher)
+            except ValueError as exc:
+                self.stdout.write(self.style.WARNING(f"{policy:8} skipped: {exc}"))
+                continue
+            rate = self.measure(hasher, encoded, options['duration'])
+            marker = '  (active)' if policy == active else ''
+            self.stdout.write(f"{policy:8} {self.describe_cost(hasher):34} {hash_ms:8.1f} {rate:9.1f}{marker}")
+
+    def time_hash(self, hasher):
+        """Hash a sample password once; return (milliseconds, encoded hash)."""
+        start = time.perf_counter()
+        encoded = hasher.encode('benchmark-password', hasher.salt())
+        return (time.perf_counter() - start) * 1000, encoded
+
+    def measure(self, hasher, encoded, duration):
+        """Return successful verifications per second over at least ``duration`` seconds."""
+        count, start = 0, time.perf_counter()
+        while True:
+            if not hasher.verify('benchmark-password', encoded):
+                raise RuntimeError(f"{hasher.algorithm} failed to verify its own hash")
+            count += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= duration:
+                return count / elapsed
+
+    def describe_cost(self, hasher):
+        details = hasher.safe_summary(hasher.encode('x', hasher.salt()))
+        return ', '.join(f'{key}={value}' for key, value in details.items()
+                         if key not in ('algorithm', 'salt', 'hash', 'checksum'))
@@ -0,0 +1,54 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_email_conflicts(apps, schema_editor):
+    """Refuse to build the index while addresses collide, and name the accounts that do."""
+    User = apps.get_model("auth", "User")
+    users = (
+        User.objects.using(schema_editor.connection.alias)
+        .filter(email__gt="")
+        .annotate(email_lower=Lower("email"))
+    )
+    conflicts = (
+        users.values("email_lower")
+        .annotate(total=Count("*"))
+        .filter(total__gt=1)
+        .values_list("email_lower", flat=True)
+    )
+    clashing = users.filter(email_lower__in=list(conflicts)).order_by(
+        "email_lower", "id"
+    )
+    if clashing:
+        accounts = "\n".join(
+            f"  id={user.id} username={user.username!r} email={user.email!r}"
+            for user in clashing
+        )
+        raise RuntimeError(
+            "Cannot create the case-insensitive unique index on auth_user.email; these accounts "
+            "share an address when case is ignored. Merge or change them, then migrate again:\n"
+            + accounts
+        )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_email_conflicts, migrations.RunPython.noop),
+        # auth.User belongs to django.contrib.auth, so the index cannot be
+        # declared on the model. Blank addresses are left out of it.
+        migrations.RunSQL(
+            sql=(
+                "CREATE UNIQUE INDEX auth_user_email_lower_uniq "
+                "ON auth_user (LOWER(email)) WHERE email > ''"
+            ),
+            reverse_sql="DROP INDEX auth_user_email_lower_uniq",
+        ),
+    ]
@@ -0,0 +1,46 @@
+"""
+Write hooks for authentication data.
+
+Drops cached token lookups on logout and token rotation (token deletion)
+and whenever a user is saved or deleted, e.g. on deactivation. Deactivated
+users also get their outstanding JWTs revoked. Cached email lookups of a
+saved or deleted user are dropped too.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .api.authentication import invalidate_token, invalidate_user, revoke_user_jwts
+from .api.emails import forget_email
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    """Invalidate the cache entry of a deleted token."""
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_tokens(sender, instance, **kwargs):
+    """Invalidate cached lookups of a changed or deleted user."""
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def revoke_inactive_user_jwts(sender, instance, signal, **kwargs):
+    """Reject outstanding JWTs of a deactivated or deleted user."""
+    if signal is post_delete or not instance.is_active:
+        revoke_user_jwts(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_email_lookups(sender, instance, **kwargs):
+    """Invalidate cached email checks that a new, changed or deleted user affects."""
+    forget_email(instance)
@@ -1,3 +1,242 @@
-from django.test import TestCase
+from importlib import import_module
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from auth_app.api.authentication import (
+    CachedTokenAuthentication, StatelessJWTAuthentication, get_local_cache, jwt_pair_for_user,
+)
+from auth_app.api.emails import get_email_cache, users_with_email
+from boards_app.api.models import Board
+from core.throttling import TokenBucketThrottle
+from task_app.api.models import Task
+
+User = get_user_model()
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """Token lookups are cached and dropped on logout, rotation and deactivation."""
+
+    def setUp(self):
+        get_local_cache().clear()
+        self.user = User.objects.create_user(username='user@test.de', email='user@test.de', password='pw')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.url = reverse('tasks_assigned')
+
+    def test_repeated_lookup_skips_database(self):
+        backend = CachedTokenAuthentication()
+        with self.assertNumQueries(1):
+            user, _ = backend.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            cached, _ = backend.authenticate_credentials(self.token.key)
+        self.assertEqual(cached, user)
+        self.assertIsNot(cached, user)
+
+    def test_logout_invalidates(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(self.client.post(reverse('logout')).status_code, 204)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_rotation_invalidates(self):
+        self.client.get(self.url)
+        self.token.delete()
+        Token.objects.create(user=self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_deactivation_invalidates(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+
+class StatelessJWTAuthenticationTests(APITestCase):
+    """Bearer tokens authenticate from their claims and honour the revocation list."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='jwt@test.de', email='jwt@test.de',
+                                             first_name='Jay', last_name='Dub', password='pw')
+        self.board = Board.objects.create(name='JWT', created_by=self.user)
+        Task.objects.create(board=self.board, title='mine', assigned_to=self.user)
+        pair = jwt_pair_for_user(self.user)
+        self.access, self.refresh = pair['access'], pair['refresh']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+
+    def test_authentication_needs_no_query(self):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        with self.assertNumQueries(0):
+            user, _ = StatelessJWTAuthentication().authenticate(request)
+        self.assertEqual(user, self.user)
+        self.assertEqual((user.email, user.first_name, user.last_name), ('jwt@test.de', 'Jay', 'Dub'))
+
+    def test_read_endpoint(self):
+        response = self.client.get(reverse('tasks_assigned'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+    def test_logout_revokes_token(self):
+        self.assertEqual(self.client.post(reverse('logout')).status_code, 204)
+        self.assertEqual(self.client.get(reverse('tasks_assigned')).status_code, 401)
+
+    def test_logout_revokes_the_session(self):
+        response = self.client.post(reverse('token_refresh'), {'refresh': self.refresh})
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(self.client.post(reverse('logout')).status_code, 204)
+
+        self.client.credentials()
+        self.assertEqual(self.client.post(reverse('token_refresh'), {'refresh': self.refresh}).status_code, 401)
+        for access in (self.access, response.data['access']):
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+            self.assertEqual(self.client.get(reverse('tasks_assigned')).status_code, 401)
+
+    def test_deactivation_revokes_tokens(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('tasks_assigned')).status_code, 401)
+
+    def test_login_returns_both_schemes(self):
+        self.client.credentials()
+        response = self.client.post(reverse('login'), {'email': 'jwt@test.de', 'password': 'pw'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue({'token', 'access', 'refresh'} <= set(response.data))
+
+
+def hashing(**costs):
+    return override_settings(PASSWORD_HASHING={**settings.PASSWORD_HASHING, **costs})
+
+
+class PasswordHashingPolicyTests(APITestCase):
+    """Hash cost follows settings and stored hashes are migrated on login."""
+
+    def login(self):
+        return self.client.post(reverse('login'), {'email': 'hash@test.de', 'password': 'pw'})
+
+    def iterations(self):
+        return int(User.objects.get(email='hash@test.de').password.split('$')[1])
+
+    def test_cost_comes_from_settings(self):
+        with hashing(PBKDF2_ITERATIONS=1500):
+            User.objects.create_user(username='hash@test.de', email='hash@test.de', password='pw')
+        self.assertEqual(self.iterations(), 1500)
+
+    def test_login_rehashes_on_upgrade_and_downgrade(self):
+        with hashing(PBKDF2_ITERATIONS=1000):
+            User.objects.create_user(username='hash@test.de', email='hash@test.de', password='pw')
+        for cost in (3000, 2000):
+            with hashing(PBKDF2_ITERATIONS=cost):
+                self.assertEqual(self.login().status_code, 200)
+            self.assertEqual(self.iterations(), cost)
+
+
+class EmailCheckTests(APITestCase):
+    """Email checks ignore case, hit the index and cache, and are throttled per client."""
+
+    def setUp(self):
+        cache.clear()
+        get_email_cache().clear()
+        self.user = User.objects.create_user(username='Known@Test.de', email='Known@Test.de', password='pw',
+                                             first_name='Kim', last_name='Known')
+        self.url = reverse('email-check')
+
+    def check(self, email):
+        response = self.client.get(self.url, {'email': email})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_match_ignores_case_and_is_cached(self):
+        with self.assertNumQueries(1):
+            data = self.check('known@test.DE')
+        self.assertEqual(data, {'exists': True, 'id': self.user.id, 'email': 'Known@test.de', 'fullname': 'Kim Known'})
+        with self.assertNumQueries(0):
+            self.assertTrue(self.check(' KNOWN@test.de')['exists'])
+
+    def test_cached_miss_is_dropped_when_the_user_registers(self):
+        self.assertFalse(self.check('new@test.de')['exists'])
+        with self.assertNumQueries(0):
+            self.assertFalse(self.check('new@test.de')['exists'])
+        User.objects.create_user(username='new@test.de', email='New@test.de')
+        self.assertTrue(self.check('new@test.de')['exists'])
+
+    def test_changed_address_is_not_served_from_cache(self):
+        self.check('known@test.de')
+        self.user.email = 'renamed@test.de'
+        self.user.save()
+        self.assertFalse(self.check('known@test.de')['exists'])
+
+    def test_registration_rejects_address_in_other_case(self):
+        response = self.client.post(reverse('registration'), {
+            'fullname': 'Kim Known', 'email': 'KNOWN@test.de', 'password': 'pw', 'repeated_password': 'pw',
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data)
+
+    def test_lookup_uses_the_lowercase_index(self):
+        self.assertIn('auth_user_email_lower_uniq', users_with_email('known@test.de').explain())
+
+    def test_index_migration_names_conflicting_accounts(self):
+        migration = import_module('auth_app.migrations.0001_user_email_lower_index')
+        schema_editor = SimpleNamespace(connection=connection)
+        migration.check_email_conflicts(apps, schema_editor)
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX auth_user_email_lower_uniq')
+        twin = User.objects.create_user(username='twin', email='KNOWN@test.de')
+        User.objects.create_user(username='blank', email='')
+        with self.assertRaisesMessage(RuntimeError, f"id={twin.id} username='twin' email='KNOWN@test.de'") as raised:
+            migration.check_email_conflicts(apps, schema_editor)
+        self.assertIn(f'id={self.user.id} ', str(raised.exception))
+        self.assertNotIn('blank', str(raised.exception))
+
+    def test_token_bucket_throttles_bursts_and_refills(self):
+        rates = {**TokenBucketThrottle.THROTTLE_RATES, 'email_check': '2/min'}
+        with mock.patch.object(TokenBucketThrottle, 'THROTTLE_RATES', rates), \
+                mock.patch.object(TokenBucketThrottle, 'timer') as timer:
+            timer.return_value = 1000.0
+            self.check('a@test.de')
+            self.check('b@test.de')
+            response = self.client.get(self.url, {'email': 'c@test.de'})
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], '30')
+            timer.return_value = 1030.0
+            self.check('c@test.de')
+
+
+class EmailBatchCheckTests(APITestCase):
+    """Batch email checks resolve a list of addresses with one query."""
+
+    def setUp(self):
+        cache.clear()
+        get_email_cache().clear()
+        self.users = [User.objects.create_user(username=f'u{i}@test.de', email=f'u{i}@test.de') for i in range(3)]
+        self.client.force_authenticate(self.users[0])
+        self.url = reverse('email-check-batch')
+
+    def test_resolves_many_addresses_in_one_query(self):
+        emails = ['U0@test.de', 'u1@test.de', 'nobody@test.de', 'u0@TEST.de', 'u2@test.de']
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, {'emails': emails}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([user['id'] for user in response.data['users']], [user.id for user in self.users])
+        self.assertEqual(response.data['missing'], ['nobody@test.de'])
+        with self.assertNumQueries(0):
+            self.client.post(self.url, {'emails': emails}, format='json')
+
+    def test_rejects_bad_or_oversized_input(self):
+        self.assertEqual(self.client.post(self.url, {'emails': 'u0@test.de'}, format='json').status_code, 400)
+        emails = [f'x{i}@test.de' for i in range(101)]
+        self.assertEqual(self.client.post(self.url, {'emails': emails}, format='json').status_code, 400)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.post(self.url, {'emails': []}, format='json').status_code, 401)
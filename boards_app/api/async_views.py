@@ -0,0 +1,46 @@
+"""
+Async variants of the board read endpoints, served under /api/async/.
+
+They return the same payloads as BoardListView.get and BoardDetailView.get
+but use the async ORM, so under ASGI a slow request does not hold a thread.
+"""
+
+from django.db.models import aprefetch_related_objects
+
+from core.async_views import AsyncAPIView, json_response
+from core.conditional import compute_etag, conditional_response, set_validators
+from core.db_routers import read_from_replica
+from .models import Board
+from .pagination import BoardCursorPagination
+from .permissions import get_board_access
+from .serializers import BoardListSerializer, BoardDetailSerializer
+
+
+class AsyncBoardListView(AsyncAPIView):
+    """Boards accessible to the user, like BoardListView.get."""
+    query_budget = 1
+
+    @read_from_replica
+    async def get(self, request):
+        boards = Board.objects.accessible_to(request.user).with_summary()
+        data = await BoardCursorPagination().aget_data(boards, request, BoardListSerializer, self)
+        return json_response(data)
+
+
+class AsyncBoardDetailView(AsyncAPIView):
+    """Board detail with conditional GET, like BoardDetailView.get."""
+    query_budget = 3
+
+    @read_from_replica
+    async def get(self, request, pk):
+        try: board = await Board.objects.with_access(request.user).aget(pk=pk)
+        except Board.DoesNotExist:
+            return json_response({"detail": "Board not found."}, status=404)
+        if not get_board_access(request, board).can_view:
+            return json_response({"detail": "Forbidden. Must be member or owner of the Board."}, status=403)
+        etag = compute_etag(request, board.pk, board.updated_at)
+        not_modified = conditional_response(request, etag, board.updated_at)
+        if not_modified:
+            return not_modified
+        await aprefetch_related_objects([board], *Board.objects.detail_prefetches())
+        return set_validators(json_response(BoardDetailSerializer(board).data), etag, board.updated_at)
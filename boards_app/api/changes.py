@@ -0,0 +1,84 @@
+"""
+Delta sync of a board from its change log.
+
+A client keeps the ``cursor`` of its last sync and asks for everything
+logged after it. Several changes of one object collapse into its latest
+state: objects that still exist are returned in full, all others as ids
+in ``deleted``. Comments of a deleted task are not listed separately;
+the task's tombstone covers them.
+"""
+
+from django.contrib.auth import get_user_model
+
+from task_app.api.models import Task, Comment
+from task_app.api.serializers import TaskSerializer, CommentSerializer
+from .models import BoardChange
+from .serializers import UserMiniSerializer
+
+User = get_user_model()
+
+MAX_CHANGES = 1000
+
+
+def comment_data(comment):
+    """Return the API representation of a comment together with its task id."""
+    return {**CommentSerializer(comment).data, "task_id": comment.task_id}
+
+
+def latest_cursor(board):
+    """Return the id of the board's newest change log entry, or 0."""
+    return BoardChange.objects.filter(board=board).order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def collect_changes(board, since, limit=MAX_CHANGES):
+    """
+    Return the board's changes after the ``since`` cursor.
+
+    At most ``limit`` log entries are read per call; ``has_more`` tells the
+    client to ask again with the returned cursor.
+    """
+    entries = list(
+        BoardChange.objects.filter(board=board, id__gt=since)
+        .order_by('id')
+        .values_list('id', 'kind', 'object_id', 'action')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest = {}
+    for _, kind, object_id, action in entries:
+        latest[kind, object_id] = action
+    upserted = {kind: set() for kind, _ in BoardChange.KIND_CHOICES}
+    for (kind, object_id), action in latest.items():
+        if action == BoardChange.UPSERT:
+            upserted[kind].add(object_id)
+
+    tasks = _fetch(Task.objects.with_related().filter(board=board), upserted[BoardChange.TASK])
+    comments = _fetch(Comment.objects.select_related('author').filter(task__board=board),
+                      upserted[BoardChange.COMMENT])
+    members = _fetch(board.members.all(), upserted[BoardChange.MEMBER])
+    present = {
+        BoardChange.TASK: {task.pk for task in tasks},
+        BoardChange.COMMENT: {comment.pk for comment in comments},
+        BoardChange.MEMBER: {member.pk for member in members},
+    }
+    deleted = {kind: [] for kind, _ in BoardChange.KIND_CHOICES}
+    for kind, object_id in latest:
+        if object_id not in present[kind]:
+            deleted[kind].append(object_id)
+
+    return {
+        "cursor": entries[-1][0] if entries else since,
+        "has_more": has_more,
+        "tasks": TaskSerializer(tasks, many=True).data,
+        "comments": [comment_data(comment) for comment in comments],
+        "members": UserMiniSerializer(members, many=True).data,
+        "deleted": {f'{kind}s': object_ids for kind, object_ids in deleted.items()},
+    }
+
+
+def _fetch(queryset, ids):
+    """Return the rows with the given ids, skipping the query when there are none."""
+    if not ids:
+        return []
+    return list(queryset.filter(pk__in=ids).order_by('pk'))
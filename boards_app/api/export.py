@@ -0,0 +1,85 @@
+"""
+Streaming NDJSON export of a board.
+
+Every line is one JSON object with a ``type`` of ``board``, ``member``,
+``task`` or ``comment``. Tasks and comments are read with server-side
+iterators, so memory use does not grow with the size of the board.
+
+Under ASGI, Django would read a synchronous iterator to the end before
+sending anything, so aiter_board_export hands the same lines to the
+server in chunks, each fetched in a thread.
+"""
+
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from task_app.api.models import Task, Comment
+
+from .serializers import BoardDetailSerializer
+
+EXPORT_CHUNK_SIZE = 2000
+
+_user_mini = BoardDetailSerializer._user_mini
+
+
+def _line(record):
+    return json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+
+
+def iter_board_export(board, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the board, its members, tasks and comments as NDJSON lines."""
+    yield _line({"type": "board", "id": board.id, "title": board.name, "owner_id": board.created_by_id})
+
+    for member in board.members.order_by('id').iterator(chunk_size=chunk_size):
+        yield _line({"type": "member", **_user_mini(member)})
+
+    tasks = (
+        Task.objects.filter(board=board)
+        .select_related('assigned_to', 'reviewer')
+        .order_by('id')
+    )
+    for task in tasks.iterator(chunk_size=chunk_size):
+        yield _line({
+            "type": "task",
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "status": task.status,
+            "priority": task.priority,
+            "assignee": _user_mini(task.assigned_to),
+            "reviewer": _user_mini(task.reviewer),
+            "due_date": task.due_date,
+            "created_by_id": task.created_by_id,
+            "created_at": task.created_at,
+            "updated_at": task.updated_at,
+        })
+
+    comments = (
+        Comment.objects.filter(task__board=board)
+        .select_related('author')
+        .order_by('task_id', 'id')
+    )
+    for comment in comments.iterator(chunk_size=chunk_size):
+        yield _line({
+            "type": "comment",
+            "id": comment.id,
+            "task_id": comment.task_id,
+            "author": _user_mini(comment.author),
+            "content": comment.content,
+            "created_at": comment.created_at,
+        })
+
+
+def _next_chunk(lines, size):
+    return ''.join(islice(lines, size))
+
+
+async def aiter_board_export(board, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the lines of iter_board_export joined into chunks of up to chunk_size lines."""
+    lines = iter_board_export(board, chunk_size)
+    # Thread-sensitive calls share one thread, so the server-side cursors stay on their connection.
+    while chunk := await sync_to_async(_next_chunk)(lines, chunk_size):
+        yield chunk
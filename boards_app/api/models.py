@@ -1,9 +1,80 @@
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.db import models, router, transaction
+from django.db.models.signals import m2m_changed
+from django.db.models import Count, Exists, F, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
 from django.conf import settings
+from django.utils import timezone
 
 User = settings.AUTH_USER_MODEL
 
 
+class BoardQuerySet(models.QuerySet):
+    """Query helpers for resolving board access and board summary counts."""
+
+    def accessible_to(self, user):
+        """
+        Return boards where the user is creator, member, assignee or reviewer.
+
+        Membership and task roles are resolved through id subqueries, so the
+        result needs no joins on members/tasks and no distinct().
+        """
+        Task = self.model._meta.get_field('tasks').related_model
+        member_boards = self.model.members.through.objects.filter(user_id=user.pk).values('board_id')
+        task_boards = Task.objects.filter(Q(assigned_to=user) | Q(reviewer=user)).values('board_id')
+        return self.filter(
+            Q(created_by=user) | Q(id__in=member_boards) | Q(id__in=task_boards)
+        )
+
+    def with_access(self, user):
+        """
+        Annotate is_member, is_assignee and is_reviewer for the given user.
+
+        Each flag is an EXISTS subquery on an indexed column, so the board
+        and the user's roles are loaded together in one query.
+        """
+        Task = self.model._meta.get_field('tasks').related_model
+        board_tasks = Task.objects.filter(board_id=OuterRef('pk'))
+        return self.annotate(
+            is_member=Exists(
+                self.model.members.through.objects.filter(board_id=OuterRef('pk'), user_id=user.pk)
+            ),
+            is_assignee=Exists(board_tasks.filter(assigned_to_id=user.pk)),
+            is_reviewer=Exists(board_tasks.filter(reviewer_id=user.pk)),
+        )
+
+    def with_summary(self):
+        """
+        Join the materialized BoardStats row that holds the summary counts
+        (member_count, ticket_count, tasks_to_do_count, tasks_high_prio_count).
+        """
+        return self.select_related('stats')
+
+    def with_detail(self):
+        """
+        Prefetch members and tasks for the board detail payload.
+
+        Tasks come with assignee and reviewer joined and an annotated
+        comments_count, so serializing a board costs a fixed number of queries.
+        """
+        return self.prefetch_related(*self.detail_prefetches())
+
+    def detail_prefetches(self):
+        """Return the prefetch lookups used by with_detail(), for already loaded boards."""
+        Task = self.model._meta.get_field('tasks').related_model
+        tasks = (
+            Task.objects
+            .select_related('assigned_to', 'reviewer')
+            .annotate(comments_count=Count('comments'))
+        )
+        return ['members', Prefetch('tasks', queryset=tasks)]
+
+    def touch(self):
+        """Bump updated_at of the selected boards with a single UPDATE."""
+        return self.update(updated_at=timezone.now())
+
+
 class Board(models.Model):
     """
     Represents a collaborative project board that can have multiple members and tasks.
@@ -12,6 +83,7 @@ class Board(models.Model):
         name (str): The name of the board.
         created_by (User): The user who created the board.
         members (QuerySet[User]): Users who are members of the board.
+        updated_at (datetime): Last change of the board, its members, tasks or comments.
     """
     name = models.CharField(max_length=255)
     created_by = models.ForeignKey(
@@ -20,7 +92,230 @@ class Board(models.Model):
     members = models.ManyToManyField(
         User, related_name='boards', blank=True
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BoardQuerySet.as_manager()
 
     def __str__(self):
         """Return the board’s name as string representation."""
-        return self.name
\ No newline at end of file
+        return self.name
+
+    def update_members(self, user_ids):
+        """
+        Make exactly ``user_ids`` the members of the board and return the
+        (added, removed) id sets.
+
+        Only the membership ids are read and only the difference is written,
+        so unchanged members of a large board cost nothing. The member
+        writers join the caller's transaction rather than open a savepoint.
+        """
+        wanted = set(user_ids)
+        with transaction.atomic(using=self._members_db(), savepoint=False):
+            current = self._member_ids()
+            added, removed = wanted - current, current - wanted
+            self._change_members('remove', removed)
+            self._change_members('add', added)
+        return added, removed
+
+    def add_members(self, user_ids):
+        """
+        Add the given users and return the ids that were not members yet.
+
+        The existing memberships among the ids are read in the same
+        transaction and only the rest is inserted, with a single INSERT;
+        m2m_changed is sent like members.add() does, for those ids only.
+        The ids must belong to users. Without ids nothing is read or written.
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return set()
+        with transaction.atomic(using=self._members_db(), savepoint=False):
+            added = user_ids - self._member_ids(user_ids)
+            self._change_members('add', added)
+        return added
+
+    def remove_members(self, user_ids):
+        """Remove the given members with a single DELETE and return the ids that were members."""
+        user_ids = set(user_ids)
+        if not user_ids:
+            return set()
+        with transaction.atomic(using=self._members_db(), savepoint=False):
+            removed = self._member_ids(user_ids)
+            self._change_members('remove', removed)
+        return removed
+
+    def _members_db(self):
+        return router.db_for_write(self.members.through, instance=self)
+
+    def _member_ids(self, user_ids=None):
+        """Return the member ids of the board, or those among ``user_ids``, read from the write database."""
+        memberships = self.members.through.objects.using(self._members_db()).filter(board_id=self.pk)
+        if user_ids is not None:
+            memberships = memberships.filter(user_id__in=user_ids)
+        return set(memberships.values_list('user_id', flat=True))
+
+    def _change_members(self, action, ids):
+        """Write an add or remove of ``ids``, which must all change, between the m2m_changed signals."""
+        if not ids:
+            return
+        through, db = self.members.through, self._members_db()
+        signal = dict(sender=through, instance=self, reverse=False, model=self.members.model, pk_set=ids, using=db)
+        m2m_changed.send(action=f'pre_{action}', **signal)
+        if action == 'add':
+            # A concurrent request may have added some of the ids since they were read.
+            through.objects.using(db).bulk_create(
+                [through(board_id=self.pk, user_id=user_id) for user_id in ids], ignore_conflicts=True,
+            )
+        else:
+            through.objects.using(db).filter(board_id=self.pk, user_id__in=ids).delete()
+        m2m_changed.send(action=f'post_{action}', **signal)
+
+
+def _count_per_board(queryset):
+    """Return a correlated subquery counting rows of queryset for the outer board."""
+    counts = (
+        queryset
+        .filter(board_id=OuterRef('board_id'))
+        .order_by()
+        .values('board_id')
+        .annotate(total=Count('*'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class BoardStats(models.Model):
+    """
+    Denormalized member and task counters for a board.
+
+    Kept current by the write hooks in boards_app.signals and task_app.signals:
+    single task writes add or subtract the changed counters, bulk writes and
+    membership changes recount. ``manage.py rebuild_board_stats`` recounts
+    everything, to verify the counters or repair drift.
+    """
+    STATUS_COUNTERS = {
+        'to-do': 'tasks_to_do_count',
+        'in-progress': 'tasks_in_progress_count',
+        'review': 'tasks_review_count',
+        'done': 'tasks_done_count',
+    }
+
+    board = models.OneToOneField(
+        Board, on_delete=models.CASCADE, primary_key=True, related_name='stats'
+    )
+    member_count = models.PositiveIntegerField(default=0)
+    ticket_count = models.PositiveIntegerField(default=0)
+    tasks_to_do_count = models.PositiveIntegerField(default=0)
+    tasks_in_progress_count = models.PositiveIntegerField(default=0)
+    tasks_review_count = models.PositiveIntegerField(default=0)
+    tasks_done_count = models.PositiveIntegerField(default=0)
+    tasks_high_prio_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        """Return a short description of the counted board."""
+        return f"Stats for board {self.board_id}"
+
+    @classmethod
+    def member_counters(cls):
+        """Return the expressions computing the member counter."""
+        return {'member_count': _count_per_board(Board.members.through.objects.all())}
+
+    @classmethod
+    def task_counters(cls):
+        """Return the expressions computing all task counters."""
+        Task = Board._meta.get_field('tasks').related_model
+        tasks = Task.objects.all()
+        return {
+            'ticket_count': _count_per_board(tasks),
+            **{field: _count_per_board(tasks.filter(status=status)) for status, field in cls.STATUS_COUNTERS.items()},
+            'tasks_high_prio_count': _count_per_board(tasks.filter(priority='high')),
+        }
+
+    @classmethod
+    def refresh_members(cls, board_ids):
+        """Recount members of the given boards with a single UPDATE."""
+        cls.objects.filter(board_id__in=board_ids).update(**cls.member_counters())
+
+    @classmethod
+    def refresh_tasks(cls, board_ids):
+        """Recount tasks of the given boards with a single UPDATE."""
+        cls.objects.filter(board_id__in=board_ids).update(**cls.task_counters())
+
+    @classmethod
+    def count_task_changes(cls, changes):
+        """
+        Apply task changes to the counters with one UPDATE per affected board.
+
+        ``changes`` are (before, after) pairs of (board_id, status, priority)
+        states, None for a task that did not exist before or after. Counters
+        move by F() increments, so nothing is recounted; a decrement stops
+        at zero rather than failing on counters that drifted.
+        """
+        deltas = defaultdict(Counter)
+        for before, after in changes:
+            for state, step in ((before, -1), (after, 1)):
+                if state is None:
+                    continue
+                board_id, status, priority = state
+                deltas[board_id]['ticket_count'] += step
+                if status in cls.STATUS_COUNTERS:
+                    deltas[board_id][cls.STATUS_COUNTERS[status]] += step
+                if priority == 'high':
+                    deltas[board_id]['tasks_high_prio_count'] += step
+        for board_id, delta in deltas.items():
+            updates = {
+                field: F(field) + step if step > 0 else Greatest(F(field) + step, 0)
+                for field, step in delta.items() if step
+            }
+            if updates:
+                cls.objects.filter(board_id=board_id).update(**updates)
+
+    @classmethod
+    def rebuild(cls):
+        """Create missing rows and recount every board."""
+        missing = Board.objects.filter(stats__isnull=True).values_list('id', flat=True)
+        cls.objects.bulk_create([cls(board_id=board_id) for board_id in missing], ignore_conflicts=True)
+        cls.objects.update(**cls.member_counters(), **cls.task_counters())
+
+
+class BoardChange(models.Model):
+    """
+    Append-only log of task, comment and member changes of a board.
+
+    The auto-increment id is the delta-sync cursor. Entries are written in
+    the same transaction as the board's updated_at bump, whose row lock
+    orders concurrent writers, so the ids of one board become visible in
+    increasing order.
+    """
+    TASK, COMMENT, MEMBER = 'task', 'comment', 'member'
+    KIND_CHOICES = [(TASK, 'Task'), (COMMENT, 'Comment'), (MEMBER, 'Member')]
+    UPSERT, DELETE = 'upsert', 'delete'
+    ACTION_CHOICES = [(UPSERT, 'Created or updated'), (DELETE, 'Deleted')]
+
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='changes', db_index=False)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'id'], name='boardchange_board_id_idx'),
+        ]
+
+    def __str__(self):
+        """Return a short description of the change."""
+        return f"{self.action} {self.kind} {self.object_id} on board {self.board_id}"
+
+    @classmethod
+    def record(cls, board_id, changes):
+        """Touch the board, append (kind, object_id, action) entries for it and return them."""
+        changes = list(changes)
+        with transaction.atomic(savepoint=False):
+            Board.objects.filter(pk=board_id).touch()
+            if not changes:
+                return []
+            return cls.objects.bulk_create([
+                cls(board_id=board_id, kind=kind, object_id=object_id, action=action)
+                for kind, object_id, action in changes
+            ])
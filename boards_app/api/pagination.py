@@ -0,0 +1,6 @@
+from core.pagination import KeysetPagination
+
+
+class BoardCursorPagination(KeysetPagination):
+    """Board lists in creation order."""
+    ordering = ('id',)
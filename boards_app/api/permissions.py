@@ -0,0 +1,54 @@
+"""
+Board access service.
+
+Answers which roles (owner, member, assignee, reviewer) a user holds on a
+board with at most one indexed EXISTS query, and memoizes the answer on
+the request so repeated checks within one request are free.
+"""
+
+from typing import NamedTuple
+
+from .models import Board
+
+
+class BoardAccess(NamedTuple):
+    """The roles a user holds on one board."""
+    is_owner: bool = False
+    is_member: bool = False
+    is_assignee: bool = False
+    is_reviewer: bool = False
+
+    @property
+    def can_view(self):
+        """Creator, members, assignees and reviewers may read the board."""
+        return any(self)
+
+    @property
+    def can_edit(self):
+        """Only the creator and members may change the board or its tasks."""
+        return self.is_owner or self.is_member
+
+
+ROLE_FLAGS = ('is_member', 'is_assignee', 'is_reviewer')
+
+
+def _query_access(user, board):
+    """Resolve the user's roles, reusing with_access() annotations when present."""
+    if not user.is_authenticated:
+        return BoardAccess()
+    if all(hasattr(board, flag) for flag in ROLE_FLAGS):
+        flags = {flag: getattr(board, flag) for flag in ROLE_FLAGS}
+    else:
+        flags = Board.objects.with_access(user).filter(pk=board.pk).values(*ROLE_FLAGS).first() or {}
+    return BoardAccess(is_owner=board.created_by_id == user.pk, **flags)
+
+
+def get_board_access(request, board):
+    """Return the request user's roles on the board, memoized per request."""
+    memo = getattr(request, '_board_access', None)
+    if memo is None:
+        memo = {}
+        request._board_access = memo
+    if board.pk not in memo:
+        memo[board.pk] = _query_access(request.user, board)
+    return memo[board.pk]
@@ -2,7 +2,6 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 
 from .models import Board
-from task_app.api.models import Task
 
 User = get_user_model()
 
@@ -20,43 +19,34 @@ class UserMiniSerializer(serializers.ModelSerializer):
         return f"{obj.first_name} {obj.last_name}".strip()
 
 class BoardListSerializer(serializers.ModelSerializer):
-    """Board summary with counts of members and tasks."""
+    """
+    Board summary with counts of members and tasks.
+
+    Expects boards fetched via ``Board.objects.with_summary()``,
+    which joins the materialized BoardStats counters.
+    """
     title = serializers.CharField(source='name', read_only=True)
-    owner_id = serializers.IntegerField(source='created_by.id', read_only=True)
-    member_count = serializers.SerializerMethodField()
-    ticket_count = serializers.SerializerMethodField()
-    tasks_to_do_count = serializers.SerializerMethodField()
-    tasks_high_prio_count = serializers.SerializerMethodField()
+    owner_id = serializers.IntegerField(source='created_by_id', read_only=True)
+    member_count = serializers.IntegerField(source='stats.member_count', read_only=True)
+    ticket_count = serializers.IntegerField(source='stats.ticket_count', read_only=True)
+    tasks_to_do_count = serializers.IntegerField(source='stats.tasks_to_do_count', read_only=True)
+    tasks_high_prio_count = serializers.IntegerField(source='stats.tasks_high_prio_count', read_only=True)
 
     class Meta:
         model = Board
         fields = ['id', 'title', 'owner_id', 'member_count', 'ticket_count', 
                   'tasks_to_do_count', 'tasks_high_prio_count']
-
-    def get_member_count(self, obj):
-        """Return number of members on the board."""
-        return obj.members.count()
-
-    def get_ticket_count(self, obj):
-        """Return total number of tasks on the board."""
-        return Task.objects.filter(board=obj).count()
-
-    def get_tasks_to_do_count(self, obj):
-        """Return number of tasks with status 'to-do'."""
-        return Task.objects.filter(board=obj, status='to-do').count()
-
-    def get_tasks_high_prio_count(self, obj):
-        """Return number of tasks with high priority."""
-        return Task.objects.filter(board=obj, priority='high').count()
     
     
 class BoardDetailSerializer(serializers.ModelSerializer):
     """
     Serializer for detailed Board view.
     Includes members and all related tasks.
+
+    Expects boards fetched via ``Board.objects.with_detail()``.
     """
     title = serializers.CharField(source='name', read_only=True)
-    owner_id = serializers.IntegerField(source='created_by.id', read_only=True)
+    owner_id = serializers.IntegerField(source='created_by_id', read_only=True)
     members = serializers.SerializerMethodField()
     tasks = serializers.SerializerMethodField()
 
@@ -87,12 +77,13 @@ class BoardDetailSerializer(serializers.ModelSerializer):
                 "assignee": self._user_mini(t.assigned_to),
                 "reviewer": self._user_mini(t.reviewer),
                 "due_date": t.due_date,
-                "comments_count": t.comments.count(),
+                "comments_count": t.comments_count,
             }
-            for t in Task.objects.filter(board=obj)
+            for t in obj.tasks.all()
         ]
 
-    def _user_mini(self, user):
+    @staticmethod
+    def _user_mini(user):
         """Helper to return minimal user info."""
         if not user:
             return None
@@ -1,8 +1,13 @@
 from django.urls import path
 
-from .views import BoardListView, BoardDetailView
+from .async_views import AsyncBoardListView, AsyncBoardDetailView
+from .views import BoardListView, BoardDetailView, BoardExportView, BoardChangesView
 
 urlpatterns = [
     path('boards/', BoardListView.as_view(), name='boards'),
     path('boards/<int:pk>/', BoardDetailView.as_view(), name='board_detail'),
+    path('boards/<int:pk>/export/', BoardExportView.as_view(), name='board_export'),
+    path('boards/<int:pk>/changes/', BoardChangesView.as_view(), name='board_changes'),
+    path('async/boards/', AsyncBoardListView.as_view(), name='async_boards'),
+    path('async/boards/<int:pk>/', AsyncBoardDetailView.as_view(), name='async_board_detail'),
 ]
@@ -3,15 +3,29 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
+
+from core.conditional import compute_etag, conditional_response, set_validators
+from core.db_routers import read_from_replica
 
 from .models import Board
+from .changes import collect_changes, latest_cursor
+from .export import aiter_board_export, iter_board_export
+from .pagination import BoardCursorPagination
+from .permissions import get_board_access
 from .serializers import BoardListSerializer, BoardDetailSerializer, BoardUpdateSerializer
-from task_app.api.serializers import Task
 
 User = get_user_model()
 
 
+def existing_user_ids(user_ids):
+    """Return the set of the given ids that belong to users, with one query."""
+    return set(User.objects.filter(id__in=set(user_ids)).values_list('id', flat=True))
+
+
 class BoardListView(APIView):
     """
     Handles retrieving all boards accessible to the authenticated user,
@@ -19,7 +33,9 @@ class BoardListView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    query_budget = {'get': 1, 'post': 10}
 
+    @read_from_replica
     def get(self, request):
         """
         Return a list of boards where the user is:
@@ -27,18 +43,11 @@ class BoardListView(APIView):
         - Member
         - Assigned to a task
         - Reviewer of a task
-        """
-        user = request.user
-
-        boards = Board.objects.filter(
-            Q(created_by=user) |
-            Q(members=user) |
-            Q(tasks__assigned_to=user) |
-            Q(tasks__reviewer=user)
-        ).distinct()
 
-        serializer = BoardListSerializer(boards, many=True)
-        return Response(serializer.data)
+        Paginated by cursor when ``cursor`` or ``page_size`` is given.
+        """
+        boards = Board.objects.accessible_to(request.user).with_summary()
+        return BoardCursorPagination().get_response(boards, request, BoardListSerializer, self)
 
     def post(self, request):
         """
@@ -52,10 +61,9 @@ class BoardListView(APIView):
             return Response({"detail": "Board name is required"}, status=status.HTTP_400_BAD_REQUEST)
 
         board = Board.objects.create(name=name, created_by=request.user)
+        board.add_members(existing_user_ids(member_ids))
 
-        valid_members = User.objects.filter(id__in=member_ids)
-        board.members.add(*valid_members)
-
+        board = Board.objects.with_summary().get(pk=board.pk)
         serializer = BoardListSerializer(board)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
@@ -67,37 +75,66 @@ class BoardDetailView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    query_budget = {'get': 3, 'patch': 15}
 
+    @read_from_replica
     def get(self, request, pk):
-        """Return board details or proper error."""
-        try: board = Board.objects.get(pk=pk)
+        """
+        Return board details or proper error.
+
+        The ETag and Last-Modified validators come from board.updated_at, so
+        an unchanged board is answered with 304 before members and tasks load.
+        """
+        try: board = Board.objects.with_access(request.user).get(pk=pk)
         except Board.DoesNotExist:
             return Response({"detail": "Board not found."}, status=404)
-        u = request.user
-        if u != board.created_by and u not in board.members.all() and not Task.objects.filter(board=board, assigned_to=u).exists() and not Task.objects.filter(board=board, reviewer=u).exists():
+        if not get_board_access(request, board).can_view:
             return Response({"detail": "Forbidden. Must be member or owner of the Board."}, status=403)
-        return Response(BoardDetailSerializer(board).data, status=200)
+        etag = compute_etag(request, board.pk, board.updated_at)
+        not_modified = conditional_response(request, etag, board.updated_at)
+        if not_modified:
+            return not_modified
+        prefetch_related_objects([board], *Board.objects.detail_prefetches())
+        return set_validators(Response(BoardDetailSerializer(board).data, status=200), etag, board.updated_at)
 
     def patch(self, request, pk):
         """
         Update a board's title or members.
         Only owner or members can modify.
+
+        ``members`` replaces the member list; ``members_add`` and
+        ``members_remove`` change only the given ids, so editing a large
+        board does not send or diff its whole member list.
         Returns 200, 400, 403 or 404.
         """
-        try: board = Board.objects.get(pk=pk)
+        try: board = Board.objects.with_access(request.user).get(pk=pk)
         except Board.DoesNotExist: return Response({"detail": "Board not found."}, status=404)
-        if request.user != board.created_by and request.user not in board.members.all():
+        if not get_board_access(request, board).can_edit:
             return Response({"detail": "Forbidden. Must be owner or member."}, status=403)
-        title, members = request.data.get("title") or request.data.get("name"), request.data.get("members")
-        if title: board.name = title
-        if members is not None:
-            if not isinstance(members, list) or not all(isinstance(i, int) for i in members):
+        title = request.data.get("title") or request.data.get("name")
+        members, to_add, to_remove = (request.data.get(key) for key in ("members", "members_add", "members_remove"))
+        for value in (members, to_add, to_remove):
+            if value is not None and (not isinstance(value, list) or not all(isinstance(i, int) for i in value)):
                 return Response({"detail": "Invalid members format."}, status=400)
-            valid = User.objects.filter(id__in=members)
-            if valid.count() != len(members):
-                return Response({"detail": "One or more member IDs are invalid."}, status=400)
-            board.members.set(valid)
-        board.save()
+        if members is not None and (to_add is not None or to_remove is not None):
+            return Response({"detail": "Use either members or members_add/members_remove."}, status=400)
+        to_add, to_remove = set(to_add or ()), set(to_remove or ())
+        if to_add & to_remove:
+            return Response({"detail": "A user cannot be added and removed at once."}, status=400)
+        if members is not None:
+            members = set(members)
+        new_ids = members if members is not None else to_add
+        if new_ids and existing_user_ids(new_ids) != new_ids:
+            return Response({"detail": "One or more member IDs are invalid."}, status=400)
+        if title: board.name = title
+        with transaction.atomic():
+            if members is not None:
+                board.update_members(members)
+            if to_remove:
+                board.remove_members(to_remove)
+            if to_add:
+                board.add_members(to_add)
+            board.save()
         return Response(BoardUpdateSerializer(board).data, status=200)
     
     def delete(self, request, pk):
@@ -108,7 +145,60 @@ class BoardDetailView(APIView):
         try: board = Board.objects.get(pk=pk)
         except Board.DoesNotExist:
             return Response({"detail": "Board not found."}, status=404)
-        if request.user != board.created_by:
+        if request.user.id != board.created_by_id:
             return Response({"detail": "Forbidden. Only owner can delete."}, status=403)
         board.delete()
-        return Response(status=204)
\ No newline at end of file
+        return Response(status=204)
+
+
+class BoardExportView(APIView):
+    """
+    Stream a complete board as NDJSON.
+    Access rules are the same as for reading the board detail. Under ASGI
+    the lines come from an async iterator, which Django streams instead of
+    buffering.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        """Return a streaming NDJSON export of the board, or 403/404."""
+        try: board = Board.objects.with_access(request.user).get(pk=pk)
+        except Board.DoesNotExist:
+            return Response({"detail": "Board not found."}, status=404)
+        if not get_board_access(request, board).can_view:
+            return Response({"detail": "Forbidden. Must be member or owner of the Board."}, status=403)
+        lines = aiter_board_export(board) if isinstance(request._request, ASGIRequest) else iter_board_export(board)
+        response = StreamingHttpResponse(lines, content_type='application/x-ndjson')
+        response['Content-Disposition'] = f'attachment; filename="board-{board.pk}.ndjson"'
+        return response
+
+
+
+class BoardChangesView(APIView):
+    """
+    Delta sync: return tasks, comments and members of a board changed since a cursor.
+    Access rules are the same as for reading the board detail.
+    """
+
+    permission_classes = [IsAuthenticated]
+    query_budget = 5
+
+    def get(self, request, pk):
+        """
+        Return the changes after ``?since=<cursor>`` together with the next cursor.
+
+        Without ``since`` only the current cursor is returned, to be used
+        after loading the full board detail. Returns 200, 400, 403 or 404.
+        """
+        try: board = Board.objects.with_access(request.user).get(pk=pk)
+        except Board.DoesNotExist:
+            return Response({"detail": "Board not found."}, status=404)
+        if not get_board_access(request, board).can_view:
+            return Response({"detail": "Forbidden. Must be member or owner of the Board."}, status=403)
+        since = request.query_params.get('since')
+        if since is None:
+            return Response({"cursor": latest_cursor(board)}, status=200)
+        if not since.isdigit():
+            return Response({"detail": "Invalid cursor."}, status=400)
+        return Response(collect_changes(board, int(since)), status=200)
@@ -0,0 +1,49 @@
+"""
+Rebuild or verify the materialized BoardStats counters.
+
+Usage:
+    python manage.py rebuild_board_stats          # recount every board
+    python manage.py rebuild_board_stats --check  # report drift, exit 1 if any
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from boards_app.api.models import Board, BoardStats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-board task and member counters, or check them for drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only compare stored counters with a fresh count and report mismatches.',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            self.check_counters()
+            return
+        BoardStats.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt counters for {BoardStats.objects.count()} boards."))
+
+    def check_counters(self):
+        """Report boards whose stored counters differ from a fresh count."""
+        counters = {**BoardStats.member_counters(), **BoardStats.task_counters()}
+        expected = BoardStats.objects.annotate(
+            **{f'expected_{name}': expression for name, expression in counters.items()}
+        )
+        problems = [
+            f"Board {board_id} has no counter row."
+            for board_id in Board.objects.filter(stats__isnull=True).values_list('id', flat=True)
+        ]
+        for stats in expected:
+            for name in counters:
+                stored, actual = getattr(stats, name), getattr(stats, f'expected_{name}')
+                if stored != actual:
+                    problems.append(f"Board {stats.board_id}: {name} is {stored}, expected {actual}.")
+        for problem in problems:
+            self.stdout.write(problem)
+        if problems:
+            raise CommandError(f"{len(problems)} counter mismatches found.")
+        self.stdout.write(self.style.SUCCESS("All board counters are up to date."))
@@ -0,0 +1,69 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_board_stats(apps, schema_editor):
+    """Create and fill the counter row for every existing board."""
+    Board = apps.get_model("boards_app", "Board")
+    BoardStats = apps.get_model("boards_app", "BoardStats")
+    Task = apps.get_model("task_app", "Task")
+    db = schema_editor.connection.alias
+
+    def count(queryset):
+        counts = (
+            queryset.filter(board_id=OuterRef("board_id"))
+            .order_by()
+            .values("board_id")
+            .annotate(total=Count("*"))
+            .values("total")
+        )
+        return Coalesce(Subquery(counts), 0)
+
+    BoardStats.objects.using(db).bulk_create(
+        [BoardStats(board_id=pk) for pk in Board.objects.using(db).values_list("id", flat=True)]
+    )
+    BoardStats.objects.using(db).update(
+        member_count=count(Board.members.through.objects.all()),
+        ticket_count=count(Task.objects.all()),
+        tasks_to_do_count=count(Task.objects.filter(status="to-do")),
+        tasks_in_progress_count=count(Task.objects.filter(status="in-progress")),
+        tasks_review_count=count(Task.objects.filter(status="review")),
+        tasks_done_count=count(Task.objects.filter(status="done")),
+        tasks_high_prio_count=count(Task.objects.filter(priority="high")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boards_app", "0001_initial"),
+        ("task_app", "0007_task_created_by"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BoardStats",
+            fields=[
+                (
+                    "board",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="boards_app.board",
+                    ),
+                ),
+                ("member_count", models.PositiveIntegerField(default=0)),
+                ("ticket_count", models.PositiveIntegerField(default=0)),
+                ("tasks_to_do_count", models.PositiveIntegerField(default=0)),
+                ("tasks_in_progress_count", models.PositiveIntegerField(default=0)),
+                ("tasks_review_count", models.PositiveIntegerField(default=0)),
+                ("tasks_done_count", models.PositiveIntegerField(default=0)),
+                ("tasks_high_prio_count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_board_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boards_app", "0002_boardstats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="board",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
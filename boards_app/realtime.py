@@ -0,0 +1,138 @@
+"""
+Real-time board events over WebSockets.
+
+Clients connect to ``/ws/boards/<pk>/?token=<token or JWT access>`` and
+receive one JSON message per task, comment or member change of the board,
+e.g. ``{"type": "task.updated", "board": 1, "cursor": 42, "task": {...}}``,
+and ``board.updated``/``board.deleted`` messages for the board itself.
+Access is checked again when the board changes or the user is removed
+from it; the socket closes with 4403 once access is lost and with 4404
+after the board is deleted.
+``cursor`` is the board change log id, so after a reconnect or a
+``{"type": "resync"}`` message the client catches up via
+``GET /api/boards/<pk>/changes/?since=<cursor>``.
+
+Events are published through core.broker after the write's transaction
+commits. Payloads are only built when the channel has subscribers.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+
+from auth_app.api.authentication import authenticate_raw_token
+from core.broker import get_broker
+from .api.models import Board
+from .api.permissions import get_board_access
+
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+CLOSE_NOT_FOUND = 4404
+
+
+def board_channel(board_id):
+    return f'board.{board_id}'
+
+
+def broadcast(board_id, event, build_payload, cursor=None):
+    """
+    Publish an event to the board's subscribers once the current transaction commits.
+
+    ``build_payload`` returns the event body and is only called if someone
+    listens. It may return None when the object no longer exists by then,
+    in which case a later event covers it and nothing is sent.
+    """
+    def publish():
+        broker, channel = get_broker(), board_channel(board_id)
+        if not broker.has_subscribers(channel):
+            return
+        payload = build_payload()
+        if payload is not None:
+            broker.publish(channel, {"type": event, "board": board_id, "cursor": cursor, **payload})
+    transaction.on_commit(publish)
+
+
+async def _run_db(func, *args):
+    """
+    Run a database function in the sync thread, framed like a request.
+
+    The request signals let Django close stale or broken connections, as
+    it does around every HTTP request.
+    """
+    def call():
+        request_started.send(sender=__name__)
+        try:
+            return func(*args)
+        finally:
+            request_finished.send(sender=__name__)
+    return await sync_to_async(call)()
+
+
+def _authorize(query_string, board_id):
+    """Return (user, close code); the close code is None if the user may watch the board."""
+    token = (parse_qs(query_string).get('token') or [''])[0]
+    user = authenticate_raw_token(token) if token else None
+    if user is None:
+        return None, CLOSE_UNAUTHORIZED
+    return user, _check_access(user, board_id)
+
+
+def _check_access(user, board_id):
+    board = Board.objects.with_access(user).filter(pk=board_id).first()
+    if board is None:
+        return CLOSE_NOT_FOUND
+    if not get_board_access(SimpleNamespace(user=user), board).can_view:
+        return CLOSE_FORBIDDEN
+    return None
+
+
+async def board_socket(scope, receive, send, board_id):
+    """ASGI WebSocket application streaming the events of one board."""
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    user, close_code = await _run_db(_authorize, scope.get('query_string', b'').decode(), board_id)
+    if close_code is not None:
+        await send({'type': 'websocket.close', 'code': close_code})
+        return
+    await send({'type': 'websocket.accept'})
+
+    async with get_broker().subscribe(board_channel(board_id)) as subscription:
+        forwarder = asyncio.create_task(_forward(subscription, send, user, board_id))
+        try:
+            while True:
+                message = await receive()
+                if message['type'] == 'websocket.disconnect':
+                    break
+                if message.get('text') == 'ping':
+                    await send({'type': 'websocket.send', 'text': 'pong'})
+        finally:
+            forwarder.cancel()
+
+
+def _may_revoke_access(event, user):
+    """Return True for events after which the user may no longer see the board."""
+    if event['type'] == 'member.removed':
+        return event['member']['id'] == user.pk
+    return event['type'] == 'board.updated'
+
+
+async def _forward(subscription, send, user, board_id):
+    """Send subscription messages until the board is deleted or the user loses access to it."""
+    while True:
+        event = await subscription.get()
+        await send({'type': 'websocket.send', 'text': json.dumps(event, cls=DjangoJSONEncoder)})
+        if event['type'] == 'board.deleted':
+            await send({'type': 'websocket.close', 'code': CLOSE_NOT_FOUND})
+            return
+        if _may_revoke_access(event, user):
+            close_code = await _run_db(_check_access, user, board_id)
+            if close_code is not None:
+                await send({'type': 'websocket.close', 'code': close_code})
+                return
@@ -0,0 +1,123 @@
+"""
+Write hooks for boards_app models.
+
+Creates the BoardStats row for new boards and, when board memberships
+change, refreshes the member counter, records the change in the
+board's change log (which also bumps Board.updated_at) and broadcasts it
+to the board's WebSocket subscribers. Board edits and deletions are
+broadcast, too, so open sockets can recheck access or close.
+"""
+
+import threading
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from django.contrib.auth import get_user_model
+
+from boards_app.api.models import Board, BoardChange, BoardStats
+from boards_app.api.serializers import UserMiniSerializer
+from boards_app.realtime import broadcast
+
+User = get_user_model()
+
+
+_deleting = threading.local()
+
+
+def _board_marks():
+    if not hasattr(_deleting, 'boards'):
+        _deleting.boards = {}
+    return _deleting.boards
+
+
+def is_board_deleting(board_id, origin):
+    """
+    Return True if the board is being deleted by the delete() call that
+    sent a post_delete with this ``origin``.
+
+    Marks are tied to the origin of their delete, so a mark left behind by
+    a delete that failed between pre_delete and post_delete never matches
+    the signals of later writes.
+    """
+    return origin is not None and _board_marks().get(board_id) is origin
+
+
+@receiver(pre_delete, sender=Board)
+def mark_board_deleting(sender, instance, origin=None, **kwargs):
+    """Remember boards whose deletion is in progress, so cascades skip the change log."""
+    _board_marks()[instance.pk] = origin
+
+
+@receiver(post_delete, sender=Board)
+def unmark_board_deleting(sender, instance, **kwargs):
+    _board_marks().pop(instance.pk, None)
+
+
+@receiver(post_save, sender=Board)
+def create_board_stats(sender, instance, created, raw=False, **kwargs):
+    """Create the counter row for a newly created board."""
+    if created and not raw:
+        BoardStats.objects.get_or_create(board=instance)
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def refresh_member_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """Recount members and log the change for every board touched by a membership change."""
+    if action == 'pre_clear':
+        if reverse:
+            instance._cleared_board_ids = list(instance.boards.values_list('id', flat=True))
+        else:
+            instance._cleared_member_ids = list(instance.members.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    change = BoardChange.UPSERT if action == 'post_add' else BoardChange.DELETE
+    if not reverse:
+        board_ids = [instance.pk]
+        user_ids = instance.__dict__.pop('_cleared_member_ids', []) if action == 'post_clear' else pk_set or []
+        changes = {instance.pk: [(BoardChange.MEMBER, user_id, change) for user_id in user_ids]}
+    else:
+        if action == 'post_clear':
+            board_ids = instance.__dict__.pop('_cleared_board_ids', [])
+        else:
+            board_ids = list(pk_set or [])
+        changes = {board_id: [(BoardChange.MEMBER, instance.pk, change)] for board_id in board_ids}
+    if board_ids:
+        BoardStats.refresh_members(board_ids)
+        for board_id, entries in changes.items():
+            for entry in BoardChange.record(board_id, entries):
+                broadcast_member_change(entry)
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_delete, sender=Board)
+def broadcast_board_change(sender, instance, signal, created=False, raw=False, **kwargs):
+    """Push board.updated after an edit and board.deleted after a delete; a new board has no subscribers yet."""
+    if raw or created:
+        return
+    board_id = instance.pk
+    if signal is post_delete:
+        broadcast(board_id, 'board.deleted', lambda: {'board': {'id': board_id}})
+    else:
+        broadcast(board_id, 'board.updated', lambda: board_event(board_id))
+
+
+def board_event(board_id):
+    """Return the body of a board.updated event, or None if the board is gone by commit time."""
+    board = Board.objects.filter(pk=board_id).values('id', 'name', 'created_by_id').first()
+    return board and {'board': {'id': board['id'], 'title': board['name'], 'owner_id': board['created_by_id']}}
+
+
+def broadcast_member_change(entry):
+    """Push a member.added or member.removed event for a logged membership change."""
+    event = 'member.removed' if entry.action == BoardChange.DELETE else 'member.added'
+    broadcast(entry.board_id, event, lambda: member_event(entry.object_id, entry.action), entry.pk)
+
+
+def member_event(user_id, action):
+    """Return the body of a member event, or None if the user is gone by commit time."""
+    if action == BoardChange.DELETE:
+        return {'member': {'id': user_id}}
+    user = User.objects.filter(pk=user_id).first()
+    return user and {'member': UserMiniSerializer(user).data}
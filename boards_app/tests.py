@@ -1,3 +1,671 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import warnings
+from io import StringIO
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, connections, transaction
+from django.db.models.signals import post_delete
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from auth_app.api.authentication import jwt_pair_for_user
+
+from boards_app.api.changes import collect_changes
+from boards_app.api.models import Board, BoardStats
+from boards_app.api.permissions import BoardAccess, get_board_access
+from core.asgi import application
+from core.db_routers import read_from_replica
+from task_app.api.models import Task, Comment
+
+User = get_user_model()
+
+
+class BoardListQueryTests(APITestCase):
+    """Board list must stay a single query regardless of the number of boards."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner@test.de', email='owner@test.de', password='pw')
+        self.other = User.objects.create_user(username='other@test.de', email='other@test.de', password='pw')
+        self.client.force_authenticate(self.user)
+        self.url = reverse('boards')
+
+    def create_boards(self, count):
+        """Create boards reachable through every access path."""
+        for i in range(count):
+            owned = Board.objects.create(name=f'Owned {i}', created_by=self.user)
+            owned.members.add(self.user, self.other)
+            Task.objects.create(board=owned, title='a', status='to-do', priority='high')
+            Task.objects.create(board=owned, title='b', status='done', priority='low')
+            shared = Board.objects.create(name=f'Shared {i}', created_by=self.other)
+            Task.objects.create(board=shared, title='c', assigned_to=self.user)
+            Task.objects.create(board=shared, title='d', reviewer=self.user)
+
+    def test_query_count_is_constant(self):
+        self.create_boards(1)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 2)
+
+        self.create_boards(10)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 22)
+
+    def test_counts_are_not_multiplied_by_joins(self):
+        self.create_boards(1)
+        response = self.client.get(self.url)
+        owned = next(b for b in response.data if b['title'] == 'Owned 0')
+        self.assertEqual(owned['owner_id'], self.user.id)
+        self.assertEqual(owned['member_count'], 2)
+        self.assertEqual(owned['ticket_count'], 2)
+        self.assertEqual(owned['tasks_to_do_count'], 1)
+        self.assertEqual(owned['tasks_high_prio_count'], 1)
+
+    def test_unrelated_boards_are_hidden(self):
+        Board.objects.create(name='Foreign', created_by=self.other)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data, [])
+
+
+class BoardDetailQueryTests(APITestCase):
+    """Board detail payload must cost a fixed number of queries."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@test.de', email='owner@test.de',
+                                              first_name='Olga', last_name='Owner', password='pw')
+        self.member = User.objects.create_user(username='member@test.de', email='member@test.de', password='pw')
+        self.board = Board.objects.create(name='Detail', created_by=self.owner)
+        self.board.members.add(self.owner, self.member)
+        self.client.force_authenticate(self.owner)
+        self.url = reverse('board_detail', args=[self.board.pk])
+
+    def create_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(board=self.board, title=f'Task {i}',
+                                       assigned_to=self.owner, reviewer=self.member)
+            task.comments.create(author=self.member, content='first')
+            task.comments.create(author=self.owner, content='second')
+
+    def test_query_budget_is_fixed(self):
+        self.create_tasks(1)
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+        self.create_tasks(25)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['tasks']), 26)
+
+    def test_payload_shape(self):
+        self.create_tasks(1)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'id', 'title', 'owner_id', 'members', 'tasks'})
+        self.assertEqual(response.data['owner_id'], self.owner.id)
+        self.assertEqual(len(response.data['members']), 2)
+        task = response.data['tasks'][0]
+        self.assertEqual(task['assignee'], {'id': self.owner.id, 'email': 'owner@test.de',
+                                            'fullname': 'Olga Owner'})
+        self.assertEqual(task['reviewer']['id'], self.member.id)
+        self.assertEqual(task['comments_count'], 2)
+        self.assertEqual(set(task), {'id', 'title', 'description', 'status', 'priority',
+                                     'assignee', 'reviewer', 'due_date', 'comments_count'})
+
+    def test_member_update_writes_only_the_difference(self):
+        newcomer = User.objects.create_user(username='new@test.de', email='new@test.de')
+        members = [self.owner.id, newcomer.id, newcomer.id]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {'members': members}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(self.board.members.values_list('id', flat=True)), {self.owner.id, newcomer.id})
+        writes = [q['sql'] for q in queries if 'boards_app_board_members' in q['sql'] and
+                  q['sql'].startswith(('INSERT', 'DELETE'))]
+        # One DELETE for the removed member, one INSERT for the newcomer; the owner's row stays.
+        self.assertEqual([sql.split()[0] for sql in writes], ['DELETE', 'INSERT'])
+
+        response = self.client.patch(self.url, {'members': [self.owner.id, 12345]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.board.members.count(), 2)
+
+    def test_members_add_and_remove_touch_only_given_rows(self):
+        newcomer = User.objects.create_user(username='new@test.de', email='new@test.de')
+        changes_url = reverse('board_changes', args=[self.board.pk])
+        cursor = self.client.get(changes_url).data['cursor']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {'members_add': [newcomer.id, self.owner.id],
+                                                    'members_remove': [self.member.id]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({m['id'] for m in response.data['members_data']}, {self.owner.id, newcomer.id})
+        sql = [q['sql'] for q in queries]
+        writes = [s.split()[0] for s in sql
+                  if s.startswith(('INSERT', 'DELETE')) and '"boards_app_board_members"' in s.split('(')[0]]
+        self.assertEqual(writes, ['DELETE', 'INSERT'])
+        reads = [s for s in sql if s.startswith('SELECT "boards_app_board_members"."user_id"')]
+        self.assertTrue(reads and all('"user_id" IN (' in s for s in reads))
+        self.assertEqual(BoardStats.objects.get(board=self.board).member_count, 2)
+        changes = self.client.get(changes_url, {'since': cursor}).data
+        self.assertEqual(changes['deleted']['members'], [self.member.id])
+        self.assertEqual([m['id'] for m in changes['members']], [newcomer.id])
+
+    def test_member_operations_without_effect_write_nothing(self):
+        stranger = User.objects.create_user(username='x@test.de', email='x@test.de')
+        cursor = self.client.get(reverse('board_changes', args=[self.board.pk])).data['cursor']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {'members_add': [self.owner.id],
+                                                    'members_remove': [stranger.id]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries if q['sql'].startswith(('INSERT', 'DELETE'))])
+        self.assertEqual(self.client.get(reverse('board_changes', args=[self.board.pk])).data['cursor'], cursor)
+
+    def test_patch_runs_member_writes_in_its_own_transaction(self):
+        newcomer = User.objects.create_user(username='new@test.de', email='new@test.de')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(self.url, {'title': 'Renamed'}, format='json')
+        member_reads = [q for q in queries if q['sql'].startswith('SELECT "boards_app_board_members"."user_id"')]
+        self.assertFalse(member_reads)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {'members_add': [newcomer.id]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        sql = [q['sql'] for q in queries]
+        # Only the view's atomic block; inside the test case it is itself a savepoint.
+        self.assertEqual(len([s for s in sql if s.startswith('SAVEPOINT')]), 1)
+        self.assertEqual(len([s for s in sql if s.startswith('SELECT "boards_app_board_members"."user_id"')]), 1)
+
+    def test_member_operations_are_validated(self):
+        invalid = [
+            {'members': [self.owner.id], 'members_add': [self.member.id]},
+            {'members_add': [self.member.id], 'members_remove': [self.member.id]},
+            {'members_add': [12345]},
+            {'members_remove': 'all'},
+        ]
+        for payload in invalid:
+            self.assertEqual(self.client.patch(self.url, payload, format='json').status_code, 400, payload)
+        self.assertEqual(self.board.members.count(), 2)
+
+
+class BoardStatsTests(APITestCase):
+    """Materialized counters follow task and membership writes."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@test.de', email='owner@test.de', password='pw')
+        self.member = User.objects.create_user(username='member@test.de', email='member@test.de', password='pw')
+        self.board = Board.objects.create(name='Stats', created_by=self.owner)
+
+    def stats(self):
+        return BoardStats.objects.get(board=self.board)
+
+    def test_task_writes_update_counters(self):
+        task = Task.objects.create(board=self.board, title='a', priority='high')
+        Task.objects.create(board=self.board, title='b', status='review')
+        stats = self.stats()
+        self.assertEqual((stats.ticket_count, stats.tasks_to_do_count, stats.tasks_review_count,
+                          stats.tasks_high_prio_count), (2, 1, 1, 1))
+
+        task.status = 'done'
+        task.save()
+        self.assertEqual((self.stats().tasks_to_do_count, self.stats().tasks_done_count), (0, 1))
+
+        task.delete()
+        self.assertEqual((self.stats().ticket_count, self.stats().tasks_high_prio_count), (1, 0))
+
+    def test_single_task_writes_move_counters_without_recounting(self):
+        task = Task.objects.create(board=self.board, title='a', priority='high')
+        task = Task.objects.get(pk=task.pk)
+        other = Board.objects.create(name='Other', created_by=self.owner)
+        with CaptureQueriesContext(connection) as queries:
+            task.title = 'renamed'
+            task.save()
+            task.status, task.board = 'done', other
+            task.save()
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "boards_app_boardstats"')]
+        self.assertEqual(len(updates), 2)
+        self.assertFalse([sql for sql in updates if 'COUNT(' in sql])
+        stats = self.stats()
+        self.assertEqual((stats.ticket_count, stats.tasks_to_do_count, stats.tasks_high_prio_count), (0, 0, 0))
+        other_stats = BoardStats.objects.get(board=other)
+        self.assertEqual((other_stats.ticket_count, other_stats.tasks_done_count,
+                          other_stats.tasks_high_prio_count), (1, 1, 1))
+
+        # Drifted counters stop at zero, and a rebuild recounts them.
+        BoardStats.objects.filter(board=other).update(ticket_count=0, tasks_done_count=0)
+        task.delete()
+        Task.objects.create(board=other, title='b')
+        self.assertEqual(BoardStats.objects.get(board=other).ticket_count, 1)
+        BoardStats.objects.filter(board=other).update(ticket_count=7)
+        call_command('rebuild_board_stats', stdout=StringIO())
+        self.assertEqual(BoardStats.objects.get(board=other).ticket_count, 1)
+
+    def test_stale_instances_move_counters_from_the_stored_row(self):
+        task = Task.objects.create(board=self.board, title='a')
+        # Two requests load the same row before either writes it.
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+        first.status = 'done'
+        first.save()
+        second.status = 'review'
+        second.save()
+        stats = self.stats()
+        self.assertEqual((stats.tasks_to_do_count, stats.tasks_done_count, stats.tasks_review_count), (0, 0, 1))
+
+        first.delete()
+        second.delete()
+        stats = self.stats()
+        self.assertEqual((stats.ticket_count, stats.tasks_review_count, stats.tasks_to_do_count), (0, 0, 0))
+
+    def test_membership_changes_update_counters(self):
+        self.board.members.add(self.owner, self.member)
+        self.assertEqual(self.stats().member_count, 2)
+        self.board.members.remove(self.member)
+        self.assertEqual(self.stats().member_count, 1)
+        self.member.boards.add(self.board)
+        self.assertEqual(self.stats().member_count, 2)
+        self.member.boards.clear()
+        self.assertEqual(self.stats().member_count, 1)
+
+    def test_command_repairs_drift(self):
+        Task.objects.create(board=self.board, title='a')
+        BoardStats.objects.filter(board=self.board).update(ticket_count=7)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_board_stats', '--check', stdout=StringIO())
+        call_command('rebuild_board_stats', stdout=StringIO())
+        call_command('rebuild_board_stats', '--check', stdout=StringIO())
+        self.assertEqual(self.stats().ticket_count, 1)
+
+
+class BoardExportTests(APITestCase):
+    """Board export streams NDJSON records with the detail access rules."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@test.de', email='owner@test.de', password='pw')
+        self.reviewer = User.objects.create_user(username='rev@test.de', email='rev@test.de', password='pw')
+        self.stranger = User.objects.create_user(username='x@test.de', email='x@test.de', password='pw')
+        self.board = Board.objects.create(name='Export', created_by=self.owner)
+        self.board.members.add(self.owner)
+        task = Task.objects.create(board=self.board, title='Task', reviewer=self.reviewer)
+        task.comments.create(author=self.owner, content='Looks good')
+        self.url = reverse('board_export', args=[self.board.pk])
+
+    def test_streams_all_records(self):
+        self.client.force_authenticate(self.reviewer)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        records = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([r['type'] for r in records], ['board', 'member', 'task', 'comment'])
+        self.assertEqual(records[2]['reviewer']['id'], self.reviewer.id)
+        self.assertEqual(records[3]['content'], 'Looks good')
+
+    def test_forbidden_for_strangers(self):
+        self.client.force_authenticate(self.stranger)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class BoardExportASGITests(APITransactionTestCase):
+    """Under ASGI the export reaches the client without being buffered first."""
+
+    def setUp(self):
+        owner = User.objects.create_user(username='owner@test.de', email='owner@test.de', password='pw')
+        self.board = Board.objects.create(name='Export', created_by=owner)
+        self.board.members.add(owner)
+        Task.objects.create(board=self.board, title='Task').comments.create(author=owner, content='hi')
+        self.token = Token.objects.create(user=owner)
+        self.url = reverse('board_export', args=[self.board.pk])
+
+    async def test_streams_under_asgi(self):
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': self.url, 'query_string': b'',
+            'headers': [(b'host', b'testserver'), (b'authorization', f'Token {self.token.key}'.encode())],
+        }
+        request = ApplicationCommunicator(application, scope)
+        await request.send_input({'type': 'http.request'})
+        with warnings.catch_warnings():
+            # Django warns when it has to buffer a synchronous iterator.
+            warnings.filterwarnings('error', message='StreamingHttpResponse must consume')
+            start = await request.receive_output(1)
+            body = b''
+            while True:
+                message = await request.receive_output(1)
+                body += message.get('body', b'')
+                if not message.get('more_body'):
+                    break
+        self.assertEqual(start['status'], 200)
+        self.assertEqual([json.loads(line)['type'] for line in body.splitlines()], ['board', 'member', 'task', 'comment'])
+
+
+class BoardAccessTests(APITestCase):
+    """Board access is resolved with at most one query and memoized per request."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@test.de', email='owner@test.de', password='pw')
+        self.member = User.objects.create_user(username='member@test.de', email='member@test.de', password='pw')
+        self.assignee = User.objects.create_user(username='a@test.de', email='a@test.de', password='pw')
+        self.reviewer = User.objects.create_user(username='r@test.de', email='r@test.de', password='pw')
+        self.stranger = User.objects.create_user(username='x@test.de', email='x@test.de', password='pw')
+        self.board = Board.objects.create(name='Access', created_by=self.owner)
+        self.board.members.add(*[self.member] + [User.objects.create_user(username=f'm{i}') for i in range(20)])
+        Task.objects.create(board=self.board, title='t', assigned_to=self.assignee, reviewer=self.reviewer)
+
+    def request_for(self, user):
+        return SimpleNamespace(user=user)
+
+    def test_single_query_and_memoized(self):
+        request = self.request_for(self.member)
+        with self.assertNumQueries(1):
+            access = get_board_access(request, self.board)
+        with self.assertNumQueries(0):
+            self.assertIs(get_board_access(request, self.board), access)
+        self.assertTrue(access.can_edit)
+
+    def test_annotated_board_needs_no_query(self):
+        board = Board.objects.with_access(self.reviewer).get(pk=self.board.pk)
+        with self.assertNumQueries(0):
+            access = get_board_access(self.request_for(self.reviewer), board)
+        self.assertEqual(access, BoardAccess(is_reviewer=True))
+
+    def test_roles(self):
+        expectations = {
+            self.owner: (True, True),
+            self.member: (True, True),
+            self.assignee: (True, False),
+            self.reviewer: (True, False),
+            self.stranger: (False, False),
+        }
+        for user, (can_view, can_edit) in expectations.items():
+            access = get_board_access(self.request_for(user), self.board)
+            self.assertEqual((access.can_view, access.can_edit), (can_view, can_edit), user.username)
+
+    def test_task_create_checks_access_in_board_query(self):
+        self.client.force_authenticate(self.member)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('task_create'), {'board': self.board.pk, 'title': 'new'})
+        self.assertEqual(response.status_code, 201)
+        board_queries = [q['sql'] for q in queries if 'boards_app_board_members' in q['sql']]
+        self.assertEqual(len(board_queries), 1)
+        self.assertIn('EXISTS', board_queries[0])
+
+
+class ConditionalGetTests(APITestCase):
+    """Board endpoints answer 304 until the board, its members, tasks or comments change."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@test.de', email='owner@test.de', password='pw')
+        self.member = User.objects.create_user(username='member@test.de', email='member@test.de', password='pw')
+        self.board = Board.objects.create(name='Etag', created_by=self.owner)
+        self.task = Task.objects.create(board=self.board, title='Task')
+        self.client.force_authenticate(self.owner)
+        self.url = reverse('board_detail', args=[self.board.pk])
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_board_is_not_modified(self):
+        first = self.client.get(self.url)
+        self.assertIn('Last-Modified', first)
+        with self.assertNumQueries(1):
+            second = self.revalidate(self.url, first)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_related_writes_change_the_etag(self):
+        writes = [
+            lambda: self.board.members.add(self.member),
+            lambda: self.task.comments.create(author=self.owner, content='new'),
+            lambda: Task.objects.create(board=self.board, title='Another'),
+            lambda: self.task.delete(),
+        ]
+        for write in writes:
+            before = self.client.get(self.url)
+            write()
+            self.assertEqual(self.revalidate(self.url, before).status_code, 200)
+
+    def test_board_task_list(self):
+        url = reverse('board_tasks', args=[self.board.pk])
+        first = self.client.get(url)
+        self.assertEqual(self.revalidate(url, first).status_code, 304)
+        paged = self.client.get(f'{url}?page_size=1')
+        self.assertNotEqual(paged['ETag'], first['ETag'])
+        self.task.comments.create(author=self.owner, content='new')
+        self.assertEqual(self.revalidate(url, first).status_code, 200)
+
+
+class BoardChangesTests(APITestCase):
+    """Delta sync returns what changed after a cursor, with tombstones for deletions."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@test.de', email='owner@test.de', password='pw')
+        self.member = User.objects.create_user(username='member@test.de', email='member@test.de', password='pw')
+        self.board = Board.objects.create(name='Sync', created_by=self.owner)
+        self.board.members.add(self.owner, self.member)
+        self.task = Task.objects.create(board=self.board, title='Existing')
+        self.comment = self.task.comments.create(author=self.owner, content='old')
+        self.client.force_authenticate(self.owner)
+        self.url = reverse('board_changes', args=[self.board.pk])
+        self.cursor = self.client.get(self.url).data['cursor']
+
+    def changes(self, cursor=None):
+        response = self.client.get(self.url, {'since': self.cursor if cursor is None else cursor})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_nothing_changed(self):
+        with self.assertNumQueries(2):
+            data = self.changes()
+        self.assertEqual(data['cursor'], self.cursor)
+        self.assertEqual((data['tasks'], data['deleted']), ([], {'tasks': [], 'comments': [], 'members': []}))
+
+    def test_upserts_and_tombstones_from_the_api(self):
+        new = Task.objects.create(board=self.board, title='New')
+        new.title = 'Renamed'
+        new.save()
+        comment = new.comments.create(author=self.member, content='hi')
+        self.client.delete(reverse('task_detail', args=[self.task.pk]))
+        self.client.patch(reverse('board_detail', args=[self.board.pk]), {'members': [self.owner.id]}, format='json')
+
+        with self.assertNumQueries(4):
+            data = self.changes()
+        self.assertEqual([t['title'] for t in data['tasks']], ['Renamed'])
+        self.assertEqual([(c['id'], c['task_id']) for c in data['comments']], [(comment.id, new.id)])
+        self.assertEqual(data['deleted'], {'tasks': [self.task.id], 'comments': [], 'members': [self.member.id]})
+        self.assertEqual(self.changes(data['cursor'])['tasks'], [])
+
+    def test_comment_delete_tombstone(self):
+        self.client.delete(reverse('comment_delete', args=[self.task.pk, self.comment.pk]))
+        self.assertEqual(self.changes()['deleted']['comments'], [self.comment.id])
+
+    def test_has_more(self):
+        for i in range(3):
+            Task.objects.create(board=self.board, title=f'T{i}')
+        data = collect_changes(self.board, self.cursor, limit=2)
+        self.assertTrue(data['has_more'])
+        self.assertEqual(len(data['tasks']), 2)
+
+    def test_deleting_board_or_user_cascades_cleanly(self):
+        self.owner.delete()
+        self.assertFalse(Board.objects.filter(pk=self.board.pk).exists())
+
+    def test_board_delete_cost_does_not_grow_with_its_tasks(self):
+        def delete_queries(task_count):
+            board = Board.objects.create(name='Doomed', created_by=self.owner)
+            for i in range(task_count):
+                Task.objects.create(board=board, title=f'T{i}').comments.create(author=self.owner, content='c')
+            with CaptureQueriesContext(connection) as queries:
+                board.delete()
+            return len(queries)
+
+        self.assertEqual(delete_queries(2), delete_queries(10))
+
+    def test_failed_board_delete_keeps_logging_changes(self):
+        def fail(**kwargs):
+            raise RuntimeError('delete failed')
+
+        post_delete.connect(fail, sender=Comment, dispatch_uid='fail_comment_delete')
+        try:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self.board.delete()
+        finally:
+            post_delete.disconnect(sender=Comment, dispatch_uid='fail_comment_delete')
+        task_id = self.task.id
+        self.task.title = 'Still here'
+        self.task.save()
+        self.task.delete()
+        self.assertEqual(self.changes()['deleted']['tasks'], [task_id])
+
+    def test_invalid_cursor_and_strangers(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'abc'}).status_code, 400)
+        stranger = User.objects.create_user(username='x@test.de', email='x@test.de', password='pw')
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get(self.url, {'since': 0}).status_code, 403)
+
+
+class BoardSocketTests(APITestCase):
+    """Board sockets authenticate, check access and push committed task and comment events."""
+
+    def setUp(self):
+        # JWT revocations of users deleted by earlier tests must not hit reused user ids.
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner@test.de', email='owner@test.de', password='pw')
+        self.stranger = User.objects.create_user(username='x@test.de', email='x@test.de', password='pw')
+        self.board = Board.objects.create(name='Live', created_by=self.owner)
+        self.token = Token.objects.create(user=self.owner)
+
+    def connect(self, token, board_id=None):
+        scope = {
+            'type': 'websocket',
+            'path': f'/ws/boards/{board_id or self.board.pk}/',
+            'query_string': f'token={token}'.encode(),
+        }
+        return ApplicationCommunicator(application, scope)
+
+    async def open(self, token, board_id=None):
+        socket = self.connect(token, board_id)
+        await socket.send_input({'type': 'websocket.connect'})
+        return socket, await socket.receive_output(1)
+
+    async def test_rejects_bad_token_and_strangers(self):
+        _, message = await self.open('nope')
+        self.assertEqual(message, {'type': 'websocket.close', 'code': 4401})
+        stranger_token = await sync_to_async(Token.objects.create)(user=self.stranger)
+        _, message = await self.open(stranger_token.key)
+        self.assertEqual(message['code'], 4403)
+        _, message = await self.open(self.token.key, board_id=999)
+        self.assertEqual(message['code'], 4404)
+
+    async def test_pushes_task_and_comment_events(self):
+        socket, message = await self.open(jwt_pair_for_user(self.owner)['access'])
+        self.assertEqual(message['type'], 'websocket.accept')
+
+        def write():
+            with self.captureOnCommitCallbacks(execute=True):
+                task = Task.objects.create(board=self.board, title='Live task')
+                task.comments.create(author=self.owner, content='hi')
+            with self.captureOnCommitCallbacks(execute=True):
+                task.delete()
+        await sync_to_async(write)()
+
+        events = [json.loads((await socket.receive_output(1))['text']) for _ in range(3)]
+        self.assertEqual([e['type'] for e in events], ['task.created', 'comment.created', 'task.deleted'])
+        self.assertEqual(events[0]['task']['title'], 'Live task')
+        self.assertEqual(events[1]['comment']['content'], 'hi')
+        self.assertLess(events[0]['cursor'], events[2]['cursor'])
+        await socket.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await socket.wait(1)
+
+
+    async def test_board_changes_recheck_access_and_deletion_closes(self):
+        member = await sync_to_async(User.objects.create_user)(username='m@test.de', email='m@test.de', password='pw')
+        await sync_to_async(self.board.members.add)(member)
+        member_token = await sync_to_async(Token.objects.create)(user=member)
+        owner_socket, message = await self.open(self.token.key)
+        self.assertEqual(message['type'], 'websocket.accept')
+        member_socket, message = await self.open(member_token.key)
+        self.assertEqual(message['type'], 'websocket.accept')
+
+        def hand_over():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.board.created_by = member
+                self.board.save()
+        await sync_to_async(hand_over)()
+        for socket in (owner_socket, member_socket):
+            event = json.loads((await socket.receive_output(1))['text'])
+            self.assertEqual((event['type'], event['board']['owner_id']), ('board.updated', member.pk))
+        # The previous owner is no member and loses access; the new owner keeps watching.
+        self.assertEqual(await owner_socket.receive_output(1), {'type': 'websocket.close', 'code': 4403})
+
+        def delete():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.board.delete()
+        await sync_to_async(delete)()
+        self.assertEqual(json.loads((await member_socket.receive_output(1))['text'])['type'], 'board.deleted')
+        self.assertEqual(await member_socket.receive_output(1), {'type': 'websocket.close', 'code': 4404})
+        await member_socket.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await member_socket.wait(1)
+        await owner_socket.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await owner_socket.wait(1)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(APITestCase):
+    """Read endpoints use the replica file until the request writes; everything else uses the primary."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Registered after the test databases are set up, so the replica keeps
+        # its own file instead of becoming a test copy of the primary.
+        cls.databases = cls.databases | {'replica'}
+        cls.replica_dir = tempfile.TemporaryDirectory()
+        connections.settings['replica'] = {
+            **connections.settings['default'],
+            'NAME': os.path.join(cls.replica_dir.name, 'replica.sqlite3'),
+        }
+        call_command('migrate', database='replica', verbosity=0)
+        # The replica lags behind: it holds the same user but only an older board.
+        User.objects.using('replica').bulk_create([User(pk=cls.user.pk, username='owner@test.de')])
+        Board.objects.using('replica').bulk_create([Board(name='Replica', created_by_id=cls.user.pk)])
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        cls.databases = cls.databases - {'replica'}
+        cls.replica_dir.cleanup()
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='owner@test.de', email='owner@test.de', password='pw')
+        cls.board = Board.objects.create(name='Primary', created_by=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_board_list_reads_from_replica(self):
+        response = self.client.get(reverse('boards'))
+        self.assertEqual([board['title'] for board in response.data], ['Replica'])
+
+    def test_without_replicas_reads_use_primary(self):
+        with override_settings(DATABASE_REPLICAS=[]):
+            response = self.client.get(reverse('boards'))
+        self.assertEqual([board['title'] for board in response.data], ['Primary'])
+
+    def test_write_pins_the_rest_of_the_request_to_primary(self):
+        @read_from_replica
+        def handler():
+            before = list(Board.objects.values_list('name', flat=True))
+            Task.objects.create(board_id=self.board.pk, title='Write')
+            after = list(Board.objects.values_list('name', flat=True))
+            return before, after
+
+        self.assertEqual(handler(), (['Replica'], ['Primary']))
+        self.assertEqual(Task.objects.using('replica').count(), 0)
 
-# Create your tests here.
@@ -2,15 +2,37 @@
 ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests go to Django; WebSocket connections are routed by path to the
+applications in ``websocket_routes``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 
 import os
+import re
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from boards_app.realtime import board_socket  # noqa: E402  (needs the app registry)
+
+websocket_routes = [
+    (re.compile(r'^/ws/boards/(?P<board_id>\d+)/$'), board_socket),
+]
+
+
+async def application(scope, receive, send):
+    """Dispatch WebSocket connections by path and everything else to Django."""
+    if scope['type'] != 'websocket':
+        return await django_application(scope, receive, send)
+    for pattern, socket_application in websocket_routes:
+        match = pattern.match(scope['path'])
+        if match:
+            kwargs = {name: int(value) for name, value in match.groupdict().items()}
+            return await socket_application(scope, receive, send, **kwargs)
+    await receive()
+    await send({'type': 'websocket.close', 'code': 4404})
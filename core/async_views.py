@@ -0,0 +1,56 @@
+"""
+Async base view for read-only API endpoints.
+
+DRF's APIView dispatches synchronously, so under ASGI every request would
+hold a thread for its whole duration. AsyncAPIView keeps the parts of DRF
+the read endpoints rely on -- the configured authentication classes,
+IsAuthenticated semantics, APIException handling and the JSON renderer --
+and lets handlers await the async ORM instead.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+def json_response(data, status=200):
+    """Render data exactly like DRF's JSON responses, with the first configured renderer."""
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+
+
+class AsyncAPIView(View):
+    """
+    Base class for async GET endpoints that require an authenticated user.
+
+    Handlers receive a DRF Request (``query_params``, ``user``) and return
+    a Django HttpResponse, usually built with json_response().
+    """
+    http_method_names = ['get', 'head', 'options']
+
+    def get_authenticators(self):
+        return [authentication() for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, authenticators=self.get_authenticators())
+        try:
+            # Authentication classes may query the database, so they run in a thread.
+            user = await sync_to_async(lambda: request.user)()
+            if not user.is_authenticated:
+                raise NotAuthenticated()
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            return self.handle_exception(request, exc)
+
+    def handle_exception(self, request, exc):
+        """Turn an APIException into the same JSON error DRF would send."""
+        detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = json_response(detail, status=exc.status_code)
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            authenticators = request.authenticators
+            if authenticators:
+                response['WWW-Authenticate'] = authenticators[0].authenticate_header(request)
+        return response
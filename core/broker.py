@@ -0,0 +1,113 @@
+"""
+Publish/subscribe broker for pushing events to WebSocket clients.
+
+The backend is chosen by REALTIME['BROKER']. InMemoryBroker fans events out
+inside one process, which is enough when a single ASGI process serves all
+sockets. Deployments with several processes plug in a backend with the
+same interface on top of a shared message bus.
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the configured broker, creating it on first use."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.REALTIME['BROKER'])()
+        return _broker
+
+
+def reset_broker():
+    """Forget the current broker, so the next get_broker() builds a new one from settings."""
+    global _broker
+    with _broker_lock:
+        _broker = None
+
+
+class BaseBroker:
+    """Interface of a broker backend."""
+
+    def publish(self, channel, message):
+        """Deliver a JSON-serializable message to every subscriber of the channel. Callable from any thread."""
+        raise NotImplementedError
+
+    def has_subscribers(self, channel):
+        """Return False only if nobody listens, so publishers can skip building the message."""
+        return True
+
+    def subscribe(self, channel):
+        """Return an async context manager yielding a Subscription for the channel."""
+        raise NotImplementedError
+
+
+class Subscription:
+    """
+    Bounded queue of messages for one subscriber, bound to its event loop.
+
+    A subscriber that falls ``maxsize`` messages behind loses the backlog
+    and receives a single ``{"type": "resync"}`` message instead.
+    """
+    RESYNC = {"type": "resync"}
+
+    def __init__(self, maxsize=None):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize or settings.REALTIME['QUEUE_SIZE'])
+
+    def put(self, message):
+        """Enqueue a message from any thread."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            pass  # The subscriber's loop is closed.
+
+    def _put(self, message):
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = self.RESYNC
+        self.queue.put_nowait(message)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class InMemoryBroker(BaseBroker):
+    """Process-local broker; publishers and subscribers must share the process."""
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    def has_subscribers(self, channel):
+        with self._lock:
+            return bool(self._subscriptions.get(channel))
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        subscription = Subscription()
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscriptions[channel].discard(subscription)
+                if not self._subscriptions[channel]:
+                    del self._subscriptions[channel]
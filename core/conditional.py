@@ -0,0 +1,42 @@
+"""
+HTTP conditional GET helpers (ETag / Last-Modified).
+
+Views compute a version of their payload from cheap aggregates before
+serializing anything, answer ``304 Not Modified`` when the client already
+holds that version, and attach the validators to full responses otherwise.
+"""
+
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def compute_etag(request, *parts):
+    """
+    Return a weak ETag for the request's URL and the given version parts.
+
+    The full path is included so every page and filter of a list endpoint
+    gets its own validator.
+    """
+    payload = repr((request.get_full_path(), *parts)).encode()
+    return f'W/"{hashlib.md5(payload, usedforsecurity=False).hexdigest()}"'
+
+
+def conditional_response(request, etag, last_modified=None):
+    """Return a 304 response if the client's copy is current, otherwise None."""
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified and int(last_modified.timestamp())
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    """Attach ETag, Last-Modified and a revalidate-always Cache-Control to the response."""
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
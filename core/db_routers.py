@@ -0,0 +1,84 @@
+"""
+Read-replica routing.
+
+Views opt in with the ``read_from_replica`` decorator. While a decorated
+handler runs, ORM reads go to one of the DATABASE_REPLICAS aliases, picked
+per request. The first write inside the handler pins the rest of it to the
+primary, so the handler always reads what it just wrote, including
+``select_for_update()`` reads. Everything outside a decorated handler,
+including authentication, uses the primary.
+
+Without replicas configured the router has no effect.
+"""
+
+import contextvars
+import functools
+import inspect
+import random
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_scope = contextvars.ContextVar('replica_scope', default=None)
+
+
+class ReplicaScope:
+    """The replica chosen for one handler call and whether a write has pinned it to the primary."""
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.pinned = False
+
+
+def _enter():
+    replicas = settings.DATABASE_REPLICAS
+    return _scope.set(ReplicaScope(random.choice(replicas) if replicas else None))
+
+
+def read_from_replica(handler):
+    """Route the ORM reads of a (sync or async) view handler to a replica."""
+    if inspect.iscoroutinefunction(handler):
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            token = _enter()
+            try:
+                return await handler(*args, **kwargs)
+            finally:
+                _scope.reset(token)
+    else:
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            token = _enter()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                _scope.reset(token)
+    return wrapper
+
+
+def current_read_alias():
+    """Return the alias reads go to right now, or None for the primary."""
+    scope = _scope.get()
+    if scope is None or scope.pinned:
+        return None
+    return scope.alias
+
+
+class ReplicaRouter:
+    """Send reads inside ``read_from_replica`` handlers to a replica and all writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return current_read_alias()
+
+    def db_for_write(self, model, **hints):
+        scope = _scope.get()
+        if scope is not None:
+            scope.pinned = True
+        # Objects read from a replica remember it; their saves still go to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
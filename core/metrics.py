@@ -0,0 +1,259 @@
+"""
+Per-endpoint request metrics.
+
+QueryMetricsMiddleware counts the SQL queries of every request and times
+them, the serializer work, the rendering of the response and the whole
+request. The numbers go out as a ``Server-Timing`` header and are
+aggregated per URL name into histograms that /api/metrics/ serves. Views
+may declare a ``query_budget``; requests that exceed it are counted and
+logged. Transaction control (BEGIN, COMMIT, SAVEPOINT, ...) is timed with
+the SQL but not counted as a query: backends issue it differently, and
+it says nothing about the work a view asks of the database.
+
+Serializer time is spent in ``serializer.data`` of DRF serializers,
+nested ones included, wherever the view evaluates it; render time is only
+the encoding of the finished data. To see the former, the enabled
+middleware wraps the ``data`` properties of Serializer and ListSerializer.
+
+Enabled with REQUEST_METRICS['ENABLED']. Every worker process aggregates
+its own requests.
+"""
+
+import bisect
+import contextvars
+import logging
+import re
+import threading
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets; values above the last one land in "+Inf".
+BUCKETS = {
+    'queries': (1, 2, 5, 10, 20, 50, 100),
+    'db_ms': (1, 5, 10, 25, 50, 100, 250, 1000),
+    'serialize_ms': (1, 5, 10, 25, 50, 100, 250, 1000),
+    'render_ms': (1, 5, 10, 25, 50, 100, 250, 1000),
+    'total_ms': (5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+    'size_bytes': (1024, 4096, 16384, 65536, 262144, 1048576),
+}
+
+TRANSACTION_CONTROL = re.compile(r'\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b', re.IGNORECASE)
+
+
+def is_transaction_control(sql):
+    """Return True for statements that only open, close or mark transactions."""
+    return TRANSACTION_CONTROL.match(sql) is not None
+
+
+def get_query_budget(view_class, method):
+    """
+    Return the number of queries a view may issue for ``method``, or None.
+
+    ``query_budget`` is either one number for all methods or a mapping of
+    lower-case method names to numbers.
+    """
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        return budget.get(method.lower())
+    return budget
+
+
+class Histogram:
+    """Counts of observed values per bucket, plus their count, sum and maximum."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def as_dict(self):
+        labels = [str(bound) for bound in self.bounds] + ['+Inf']
+        return {
+            'buckets': dict(zip(labels, self.counts)),
+            'count': self.count,
+            'sum': round(self.sum, 3),
+            'max': round(self.max, 3),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe per-endpoint histograms of the request measurements."""
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, over_budget=False, **values):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {
+                    'requests': 0,
+                    'over_budget': 0,
+                    'histograms': {name: Histogram(bounds) for name, bounds in BUCKETS.items()},
+                }
+            stats['requests'] += 1
+            stats['over_budget'] += over_budget
+            for name, value in values.items():
+                if value is not None:
+                    stats['histograms'][name].observe(value)
+
+    def snapshot(self):
+        """Return all endpoints' counters and histograms as plain data."""
+        with self._lock:
+            return {
+                endpoint: {
+                    'requests': stats['requests'],
+                    'over_budget': stats['over_budget'],
+                    **{name: histogram.as_dict() for name, histogram in stats['histograms'].items()},
+                }
+                for endpoint, stats in sorted(self._endpoints.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+registry = MetricsRegistry()
+
+_current_measurement = contextvars.ContextVar('request_measurement', default=None)
+
+
+def _timed_data(prop):
+    """Wrap a serializer ``data`` property so it adds its time to the current request."""
+    def data(serializer):
+        measurement = _current_measurement.get()
+        if measurement is None or measurement.serializing:
+            return prop.fget(serializer)
+        measurement.serializing = True
+        start = time.perf_counter()
+        try:
+            return prop.fget(serializer)
+        finally:
+            measurement.serializing = False
+            measurement.serialize_seconds = (measurement.serialize_seconds or 0.0) + time.perf_counter() - start
+    data.timed = True
+    return property(data, doc=prop.__doc__)
+
+
+def instrument_serializers():
+    """Time serializer.data of DRF serializers; safe to call more than once."""
+    for serializer_class in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(serializer_class.data.fget, 'timed', False):
+            serializer_class.data = _timed_data(serializer_class.data)
+
+
+class RequestMeasurement:
+    """Query count and timings of one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = None
+        self.serializing = False
+        self.render_started = None
+        self.render_seconds = None
+        self._stack = ExitStack()
+
+    def __enter__(self):
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self.execute))
+        self._stack.callback(_current_measurement.reset, _current_measurement.set(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def execute(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += not is_transaction_control(sql)
+            self.db_seconds += time.perf_counter() - start
+
+    def render_finished(self, response):
+        self.render_seconds = time.perf_counter() - self.render_started
+
+
+class QueryMetricsMiddleware:
+    """Measure each request, add a Server-Timing header and record it in the registry."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrument_serializers()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with RequestMeasurement() as measurement:
+            request._metrics = measurement
+            response = self.get_response(request)
+        return self.finish(request, response, measurement)
+
+    async def __acall__(self, request):
+        with RequestMeasurement() as measurement:
+            request._metrics = measurement
+            response = await self.get_response(request)
+        return self.finish(request, response, measurement)
+
+    def process_template_response(self, request, response):
+        """Time the rendering of DRF responses, which happens after the view returns."""
+        measurement = request._metrics
+        measurement.render_started = time.perf_counter()
+        response.add_post_render_callback(measurement.render_finished)
+        return response
+
+    def finish(self, request, response, measurement):
+        total_ms = (time.perf_counter() - measurement.started) * 1000
+        db_ms = measurement.db_seconds * 1000
+        serialize_ms = measurement.serialize_seconds * 1000 if measurement.serialize_seconds is not None else None
+        render_ms = measurement.render_seconds * 1000 if measurement.render_seconds is not None else None
+        size = None if response.streaming else len(response.content)
+
+        timings = [f'db;dur={db_ms:.2f};desc="{measurement.queries} queries"']
+        if serialize_ms is not None:
+            timings.append(f'serialize;dur={serialize_ms:.2f}')
+        if render_ms is not None:
+            timings.append(f'render;dur={render_ms:.2f}')
+        timings.append(f'total;dur={total_ms:.2f}')
+        response['Server-Timing'] = ', '.join(timings)
+
+        match = request.resolver_match
+        if match is None or not match.url_name:
+            return response
+        budget = get_query_budget(getattr(match.func, 'view_class', None), request.method)
+        over_budget = budget is not None and measurement.queries > budget
+        if over_budget:
+            logger.warning("%s %s ran %d queries, budget is %d",
+                           request.method, match.url_name, measurement.queries, budget)
+        registry.record(
+            match.url_name, over_budget=over_budget, queries=measurement.queries, db_ms=db_ms,
+            serialize_ms=serialize_ms, render_ms=render_ms, total_ms=total_ms, size_bytes=size,
+        )
+        return response
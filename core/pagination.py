@@ -0,0 +1,139 @@
+"""
+Opt-in keyset (cursor) pagination for the list endpoints.
+
+Pages are selected with a lexicographic ``WHERE (a, b) > (x, y)`` condition
+on a fixed, unique ordering instead of OFFSET, so every page costs the same
+and cursors stay stable while rows are inserted or deleted.
+"""
+
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over ``ordering``, whose last field must be unique.
+
+    Pagination is opt-in: only requests that send ``cursor`` or ``page_size``
+    are paginated, all others get the complete, unwrapped list as before.
+    """
+    ordering = ('-id',)
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def is_requested(self, request):
+        """Return True if the client asked for a paginated response."""
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the rows of the requested page, or None if pagination was not requested."""
+        if not self.is_requested(request):
+            return None
+        return self.finish_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async variant of paginate_queryset() using the async ORM."""
+        if not self.is_requested(request):
+            return None
+        return self.finish_page([row async for row in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        """Return the unevaluated queryset of the requested page plus one look-ahead row."""
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+        return queryset[:self.page_size_value + 1]
+
+    def finish_page(self, rows):
+        """Drop the look-ahead row and remember where the next page starts."""
+        self.has_next = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+        self.next_position = self.get_position(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {'next': self.get_next_link(), 'results': data}
+
+    def get_response(self, queryset, request, serializer_class, view=None):
+        """Serialize a page if pagination was requested, otherwise the whole queryset."""
+        page = self.paginate_queryset(queryset, request, view)
+        if page is None:
+            return Response(serializer_class(queryset, many=True).data)
+        return self.get_paginated_response(serializer_class(page, many=True).data)
+
+    async def aget_data(self, queryset, request, serializer_class, view=None):
+        """Async variant of get_response() returning the response data instead of a Response."""
+        page = await self.apaginate_queryset(queryset, request, view)
+        if page is None:
+            return serializer_class([row async for row in queryset], many=True).data
+        return self.get_paginated_data(serializer_class(page, many=True).data)
+
+    def get_page_size(self, request):
+        """Return the requested page size, clamped to 1..max_page_size."""
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size_value)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_fields(self):
+        """Return (field name, descending) pairs of the ordering."""
+        return [(field.lstrip('-'), field.startswith('-')) for field in self.ordering]
+
+    def get_position(self, row):
+        return [getattr(row, name) for name, _ in self.get_fields()]
+
+    def after(self, position):
+        """Build the condition selecting rows that sort after the given position."""
+        condition, equal = Q(), {}
+        for (name, descending), value in zip(self.get_fields(), position):
+            lookup = 'lt' if descending else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def encode_cursor(self, position):
+        payload = json.dumps([str(value) for value in position]).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, request, model):
+        """Return the position encoded in the cursor parameter, or None for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            fields = self.get_fields()
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return [
+                model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(fields, values)
+            ]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
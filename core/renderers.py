@@ -0,0 +1,48 @@
+"""
+JSON renderer backed by orjson, with a stdlib fallback.
+
+orjson encodes dicts, lists, strings, numbers, dates, datetimes and UUIDs
+in native code, so large payloads such as a board with thousands of tasks
+spend a fraction of the time in encoding that json.dumps with DRF's
+encoder needs. For the values the API produces the output matches DRF's
+compact JSON: UTF-8, UTC datetimes ending in "Z", U+2028/U+2029 escaped.
+Values orjson does not know are handed to DRF's encoder, and payloads
+orjson refuses (e.g. integers beyond 64 bits) are rendered by JSONRenderer.
+
+One difference remains: orjson writes NaN and Infinity as null, where
+JSONRenderer raises ValueError. Finding them beforehand would mean walking
+the whole payload in Python, which costs more than the encoding itself.
+
+Without orjson installed, or when an indent is requested (e.g. by the
+browsable API), FastJSONRenderer renders exactly like JSONRenderer.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when it is installed."""
+
+    _default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self._default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Like JSONRenderer, keep the output a strict JavaScript subset.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -5,6 +5,7 @@ Django settings for core project.
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 # Load environment variables
 load_dotenv()
@@ -47,6 +48,7 @@ INSTALLED_APPS = [
 # ========================
 
 MIDDLEWARE = [
+    "core.metrics.QueryMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
 
@@ -72,11 +74,49 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'auth_app.api.authentication.CachedTokenAuthentication',
+        'auth_app.api.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ),
+    # JSON is encoded and decoded with orjson when it is installed (core.renderers, core.parsers).
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Token-bucket rates (core.throttling) for views with a throttle_scope.
+    'DEFAULT_THROTTLE_RATES': {
+        'email_check': os.environ.get('EMAIL_CHECK_RATE', '30/min'),
+        'email_check_batch': os.environ.get('EMAIL_CHECK_BATCH_RATE', '10/min'),
+    },
+}
+
+# Token -> user lookups are cached per process for TTL seconds.
+# Set TOKEN_AUTH_SHARED_CACHE to a CACHES alias to share them between workers.
+TOKEN_AUTH_CACHE = {
+    'TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', '30')),
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_SIZE', '10000')),
+    'SHARED_CACHE': os.environ.get('TOKEN_AUTH_SHARED_CACHE') or None,
+}
+
+# Email check results, including misses, are cached per process for TTL seconds.
+EMAIL_LOOKUP_CACHE = {
+    'TTL': int(os.environ.get('EMAIL_LOOKUP_CACHE_TTL', '10')),
+    'MAX_SIZE': int(os.environ.get('EMAIL_LOOKUP_CACHE_SIZE', '10000')),
+}
+
+# "Bearer" JWTs are checked against this cache's revocation list only,
+# never against the database. The default LocMemCache is per process: a logout
+# handled by one worker is not seen by the others. Deployments with several
+# workers must set JWT_REVOCATION_CACHE to a shared (e.g. Redis) CACHES alias.
+JWT_REVOCATION = {
+    'CACHE': os.environ.get('JWT_REVOCATION_CACHE', 'default'),
 }
 
 # ========================
@@ -109,13 +149,154 @@ TEMPLATES = [
 # DATABASE
 # ========================
 
-DATABASES = {
+# DB_ENGINE selects the profile: "sqlite" (default) or "postgres".
+#
+# PostgreSQL uses psycopg's connection pool (DB_POOL, on by default), which
+# also works under ASGI. With DB_POOL=False connections persist for
+# DB_CONN_MAX_AGE seconds instead; only do that under WSGI.
+#
+# SQLite runs in WAL mode with a busy timeout and opens write transactions
+# with BEGIN IMMEDIATE, so concurrent writers from several workers wait for
+# the lock instead of failing with "database is locked".
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgres':
+    DB_POOL = os.environ.get('DB_POOL', 'True') == 'True'
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get('DB_NAME', 'kanmind'),
+            "USER": os.environ.get('DB_USER', 'kanmind'),
+            "PASSWORD": os.environ.get('DB_PASSWORD', ''),
+            "HOST": os.environ.get('DB_HOST', 'localhost'),
+            "PORT": os.environ.get('DB_PORT', '5432'),
+            "CONN_MAX_AGE": 0 if DB_POOL else int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+            "CONN_HEALTH_CHECKS": not DB_POOL,
+            "OPTIONS": {
+                "pool": {
+                    "min_size": int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+                    "max_size": int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+                    "timeout": int(os.environ.get('DB_POOL_TIMEOUT', '10')),
+                },
+            } if DB_POOL else {},
+        }
+    }
+elif DB_ENGINE == 'sqlite':
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', '-20000')),  # negative = KiB
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', str(128 * 1024 * 1024))),
+        'temp_store': 'MEMORY',
+    }
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get('DB_NAME', BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": int(os.environ.get('DB_CONN_MAX_AGE', '0')),
+            "OPTIONS": {
+                "transaction_mode": "IMMEDIATE",
+                "init_command": ";".join(f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()),
+            },
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"Unknown DB_ENGINE {DB_ENGINE!r}; use 'sqlite' or 'postgres'.")
+
+# DB_REPLICAS lists read replicas, comma-separated: hosts for PostgreSQL,
+# database files for SQLite. Each becomes an alias replica1, replica2, ...
+# with the primary's settings otherwise. The board, task list and dashboard
+# reads are routed to them by core.db_routers; everything else, and any
+# read after a write in the same request, uses the primary.
+DATABASE_REPLICAS = []
+for _number, _target in enumerate(filter(None, os.environ.get('DB_REPLICAS', '').split(',')), start=1):
+    _alias = f'replica{_number}'
+    DATABASES[_alias] = {
+        **DATABASES['default'],
+        'HOST' if DB_ENGINE == 'postgres' else 'NAME': _target.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(_alias)
+
+DATABASE_ROUTERS = ['core.db_routers.ReplicaRouter']
+
+# ========================
+# CACHE
+# ========================
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     }
 }
 
+# CACHES alias for dashboard payloads and their version token. Writes
+# delete the cached dashboards of the affected users, which the per-process
+# LocMemCache only does for its own worker: with several workers, set
+# DASHBOARD_CACHE to a shared (e.g. Redis) alias, or other workers serve
+# stale dashboards for up to DASHBOARD_CACHE_TIMEOUT seconds.
+DASHBOARD_CACHE = os.environ.get('DASHBOARD_CACHE', 'default')
+
+# Seconds a computed dashboard payload is served from the cache.
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('DASHBOARD_CACHE_TIMEOUT', '30'))
+
+# ========================
+# REAL-TIME EVENTS
+# ========================
+
+# The in-memory broker only reaches sockets served by the same process;
+# run a single ASGI process or point REALTIME_BROKER at a shared backend.
+REALTIME = {
+    'BROKER': os.environ.get('REALTIME_BROKER', 'core.broker.InMemoryBroker'),
+    'QUEUE_SIZE': int(os.environ.get('REALTIME_QUEUE_SIZE', '100')),
+}
+
+# ========================
+# REQUEST METRICS
+# ========================
+
+# Per-endpoint query counts and timings as Server-Timing headers and
+# histograms at /api/metrics/ (see core.metrics). Off by default: every
+# request then pays for timing its SQL.
+REQUEST_METRICS = {
+    'ENABLED': os.environ.get('REQUEST_METRICS', 'False') == 'True',
+}
+
+# ========================
+# PASSWORD HASHING
+# ========================
+
+# PASSWORD_HASHER selects the hasher for new and rehashed passwords
+# (pbkdf2, bcrypt or argon2; argon2 needs argon2-cffi). The others stay
+# listed so existing hashes verify and are rehashed on the next login.
+PASSWORD_HASHING = {
+    'POLICY': os.environ.get('PASSWORD_HASHER', 'pbkdf2'),
+    'PBKDF2_ITERATIONS': int(os.environ.get('PBKDF2_ITERATIONS', '1000000')),
+    'BCRYPT_ROUNDS': int(os.environ.get('BCRYPT_ROUNDS', '12')),
+    'ARGON2_TIME_COST': int(os.environ.get('ARGON2_TIME_COST', '2')),
+    'ARGON2_MEMORY_COST': int(os.environ.get('ARGON2_MEMORY_COST', '102400')),
+    'ARGON2_PARALLELISM': int(os.environ.get('ARGON2_PARALLELISM', '8')),
+}
+
+PASSWORD_HASHER_POLICIES = {
+    'pbkdf2': 'auth_app.hashers.TunedPBKDF2PasswordHasher',
+    'bcrypt': 'auth_app.hashers.TunedBCryptSHA256PasswordHasher',
+    'argon2': 'auth_app.hashers.TunedArgon2PasswordHasher',
+}
+
+if PASSWORD_HASHING['POLICY'] not in PASSWORD_HASHER_POLICIES:
+    raise ImproperlyConfigured(
+        f"Unknown PASSWORD_HASHER {PASSWORD_HASHING['POLICY']!r}; use one of {', '.join(PASSWORD_HASHER_POLICIES)}."
+    )
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_POLICIES[PASSWORD_HASHING['POLICY']]] + [
+    hasher for policy, hasher in PASSWORD_HASHER_POLICIES.items()
+    if policy != PASSWORD_HASHING['POLICY']
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
 # ========================
 # PASSWORD VALIDATION
 # ========================
@@ -0,0 +1,35 @@
+"""
+Test helpers shared by the apps' test suites.
+"""
+
+from urllib.parse import urlsplit
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from .metrics import get_query_budget, is_transaction_control
+
+
+class QueryBudgetMixin:
+    """Assertions against the ``query_budget`` that views declare."""
+
+    def assertWithinQueryBudget(self, method, url, *args, **kwargs):
+        """
+        Send a request with ``self.client`` and fail if it ran more queries
+        than the resolved view's budget for that method. Like the metrics
+        middleware, transaction control statements are not counted, while
+        the on-commit callbacks of the request are run and counted.
+        Returns the response.
+        """
+        view_class = getattr(resolve(urlsplit(url).path).func, 'view_class', None)
+        budget = get_query_budget(view_class, method)
+        if budget is None:
+            self.fail(f"{view_class.__name__} declares no query budget for {method}")
+        with CaptureQueriesContext(connection) as context, self.captureOnCommitCallbacks(execute=True):
+            response = getattr(self.client, method.lower())(url, *args, **kwargs)
+        captured = [query['sql'] for query in context.captured_queries if not is_transaction_control(query['sql'])]
+        if len(captured) > budget:
+            queries = '\n'.join(f"{i}. {sql}" for i, sql in enumerate(captured, start=1))
+            self.fail(f"{method} {url} ran {len(captured)} queries, budget is {budget}:\n{queries}")
+        return response
@@ -0,0 +1,46 @@
+"""
+Token-bucket request throttling.
+
+DRF's rate throttles keep the timestamps of every request in the window per
+client. A token bucket keeps two numbers instead: each client may send a
+burst of up to the rate's request count, and the bucket refills steadily
+at the rate, so a client that pauses briefly can continue without waiting
+for a whole window to pass.
+"""
+
+from rest_framework.throttling import ScopedRateThrottle
+
+
+class TokenBucketThrottle(ScopedRateThrottle):
+    """
+    Throttle requests to views with a ``throttle_scope`` by the rate set for
+    that scope in DEFAULT_THROTTLE_RATES. '30/min' allows bursts of 30 and
+    one more request every two seconds. Clients are told by user id, or by
+    IP address when anonymous.
+    """
+
+    cache_format = 'throttle_bucket_%(scope)s_%(ident)s'
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        tokens, updated = self.cache.get(self.key, (self.num_requests, now))
+        self.tokens = min(self.num_requests, tokens + (now - updated) * self.num_requests / self.duration)
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        # A bucket left alone for `duration` seconds is full again, so it can expire then.
+        self.cache.set(self.key, (self.tokens, now), self.duration)
+        return True
+
+    def wait(self):
+        """Seconds until the next token is available."""
+        return (1 - self.tokens) * self.duration / self.num_requests
@@ -17,10 +17,13 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework_simplejwt.views import TokenRefreshView
+
+from auth_app.api.views import TokenRefreshView
+from core.views import RequestMetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/metrics/', RequestMetricsView.as_view(), name='request_metrics'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/', include('auth_app.api.urls')),
     path('api/', include('boards_app.api.urls')),
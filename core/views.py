@@ -0,0 +1,26 @@
+"""
+Project-level API views.
+"""
+
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .metrics import registry
+
+
+class RequestMetricsView(APIView):
+    """
+    Per-endpoint query counts, timings and response sizes of this worker
+    process, as histograms (see core.metrics). Staff only.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({'endpoints': registry.snapshot()})
+
+    def delete(self, request):
+        """Start a new measurement window."""
+        registry.reset()
+        return Response(status=204)
@@ -0,0 +1,62 @@
+"""
+Async variants of the task read endpoints and the dashboard, served under /api/async/.
+
+They return the same payloads and headers as their sync counterparts but
+use the async ORM and async cache API, so under ASGI a slow request does
+not hold a thread.
+"""
+
+from django.conf import settings
+
+from core.async_views import AsyncAPIView, json_response
+from core.conditional import compute_etag, conditional_response, set_validators
+from core.db_routers import read_from_replica
+from .cache import adashboard_cache_key, get_dashboard_cache
+from .dashboard import abuild_dashboard
+from .models import Task
+from .pagination import TaskCursorPagination
+from .serializers import TaskSerializer
+from .views import UserTaskListView
+
+
+class AsyncUserTaskListView(AsyncAPIView):
+    """Tasks of the user with conditional GET, like UserTaskListView.get."""
+    user_field = None
+    query_budget = 2
+
+    @read_from_replica
+    async def get(self, request):
+        tasks = Task.objects.filter(**{self.user_field: request.user})
+        state = await tasks.aaggregate(**UserTaskListView.list_state_aggregates())
+        etag = compute_etag(request, *sorted(state.items()))
+        response = conditional_response(request, etag)
+        if response is None:
+            data = await TaskCursorPagination().aget_data(tasks.with_related(), request, TaskSerializer, self)
+            response = set_validators(json_response(data), etag)
+        response['X-Tasks-Done-Recently'] = state['done_recently']
+        return response
+
+
+class AsyncAssignedTasksView(AsyncUserTaskListView):
+    """Tasks assigned to the user."""
+    user_field = 'assigned_to'
+
+
+class AsyncReviewingTasksView(AsyncUserTaskListView):
+    """Tasks the user reviews."""
+    user_field = 'reviewer'
+
+
+class AsyncDashboardView(AsyncAPIView):
+    """Cached dashboard statistics, like DashboardView.get."""
+    query_budget = 4
+
+    @read_from_replica
+    async def get(self, request):
+        key = await adashboard_cache_key(request.user.pk)
+        cache = get_dashboard_cache()
+        data = await cache.aget(key)
+        if data is None:
+            data = await abuild_dashboard(request.user)
+            await cache.aset(key, data, settings.DASHBOARD_CACHE_TIMEOUT)
+        return json_response(data)
@@ -0,0 +1,68 @@
+"""
+Cache keys for cached task_app payloads.
+
+Dashboards are cached per user. A Task or Comment write drops the cached
+dashboards of the users of its board once the transaction commits (see
+task_app.signals); the statistics over all boards that the payload also
+carries may lag for other users until DASHBOARD_CACHE_TIMEOUT expires.
+Cached entries are versioned, so swapping the version token makes all of
+them unreachable at once, e.g. after seeding.
+
+Payloads and the version token live in the cache named by
+settings.DASHBOARD_CACHE. Only a cache shared by all worker processes
+makes a write in one worker invalidate the dashboards of the others.
+"""
+
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+
+DASHBOARD_VERSION_KEY = 'dashboard:version'
+
+
+def get_dashboard_cache():
+    """Return the cache holding dashboards and their version token."""
+    return caches[settings.DASHBOARD_CACHE]
+
+
+def dashboard_cache_key(user_id):
+    """Return the cache key of the user's dashboard for the current version."""
+    return _versioned_key(_dashboard_version(), user_id)
+
+
+def _dashboard_version():
+    cache = get_dashboard_cache()
+    version = cache.get(DASHBOARD_VERSION_KEY)
+    if version is None:
+        version = uuid4().hex
+        cache.add(DASHBOARD_VERSION_KEY, version, None)
+        version = cache.get(DASHBOARD_VERSION_KEY, version)
+    return version
+
+
+def _versioned_key(version, user_id):
+    return f'dashboard:{version}:{user_id}'
+
+
+async def adashboard_cache_key(user_id):
+    """Async variant of dashboard_cache_key()."""
+    cache = get_dashboard_cache()
+    version = await cache.aget(DASHBOARD_VERSION_KEY)
+    if version is None:
+        version = uuid4().hex
+        await cache.aadd(DASHBOARD_VERSION_KEY, version, None)
+        version = await cache.aget(DASHBOARD_VERSION_KEY, version)
+    return _versioned_key(version, user_id)
+
+
+def invalidate_dashboards(user_ids):
+    """Drop the cached dashboards of the given users."""
+    if user_ids:
+        version = _dashboard_version()
+        get_dashboard_cache().delete_many([_versioned_key(version, user_id) for user_id in user_ids])
+
+
+def invalidate_dashboard_cache():
+    """Invalidate every cached dashboard."""
+    get_dashboard_cache().set(DASHBOARD_VERSION_KEY, uuid4().hex, None)
@@ -0,0 +1,97 @@
+"""
+Dashboard payload, shared by the sync and async dashboard views.
+
+The queries are defined once; build_dashboard() evaluates them with the
+regular ORM and abuild_dashboard() with the async ORM. Either way the
+payload costs at most four queries.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Min, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from boards_app.api.models import BoardStats
+from .models import Task
+from .serializers import TaskSerializer
+
+
+def statistics_aggregates(user):
+    """Return the aggregates computing all task counters in one pass over the task table."""
+    two_weeks_ago = timezone.now() - timedelta(days=14)
+    urgent = Q(status='to-do', due_date__isnull=False)
+    return {
+        'tasks_done_recently': Count('id', filter=Q(status='done', updated_at__gte=two_weeks_ago)),
+        'urgent_count': Count('id', filter=urgent),
+        'next_due_date': Min('due_date', filter=urgent),
+        'assigned_to_you': Count('id', filter=Q(assigned_to=user)),
+        'to_review': Count('id', filter=Q(reviewer=user)),
+    }
+
+
+def distribution_aggregates():
+    """Return the aggregates summing the task count per status from the board counters."""
+    return {
+        'to_do': Coalesce(Sum('tasks_to_do_count'), 0),
+        'in_progress': Coalesce(Sum('tasks_in_progress_count'), 0),
+        'review': Coalesce(Sum('tasks_review_count'), 0),
+        'done': Coalesce(Sum('tasks_done_count'), 0),
+    }
+
+
+def next_deadline_query(stats):
+    """Return the query for the first urgent 'to-do' task, or None if there is none."""
+    if stats['next_due_date'] is None:
+        return None
+    return (
+        Task.objects
+        .filter(status='to-do', due_date=stats['next_due_date'])
+        .order_by('id')
+        .values('id', 'title', 'due_date')
+    )
+
+
+def recent_tasks_query(user):
+    """Return the query for the 5 most recently updated tasks assigned to the user."""
+    return Task.objects.with_related().filter(assigned_to=user).order_by('-updated_at')[:5]
+
+
+def compose_dashboard(stats, distribution, next_deadline, recent_tasks):
+    return {
+        "tasks_done_recently": stats['tasks_done_recently'],
+        "tickets_distribution": distribution,
+        "urgent_to_do": {
+            "count": stats['urgent_count'],
+            "next_deadline": next_deadline,
+        },
+        "your_tasks": TaskSerializer(recent_tasks, many=True).data,
+        "tasks_insights": {
+            "assigned_to_you": stats['assigned_to_you'],
+            "to_review": stats['to_review'],
+        },
+    }
+
+
+def build_dashboard(user):
+    """Compute the dashboard payload for the user."""
+    stats = Task.objects.aggregate(**statistics_aggregates(user))
+    deadline = next_deadline_query(stats)
+    return compose_dashboard(
+        stats,
+        BoardStats.objects.aggregate(**distribution_aggregates()),
+        deadline.first() if deadline is not None else None,
+        list(recent_tasks_query(user)),
+    )
+
+
+async def abuild_dashboard(user):
+    """Async variant of build_dashboard()."""
+    stats = await Task.objects.aaggregate(**statistics_aggregates(user))
+    deadline = next_deadline_query(stats)
+    return compose_dashboard(
+        stats,
+        await BoardStats.objects.aaggregate(**distribution_aggregates()),
+        await deadline.afirst() if deadline is not None else None,
+        [task async for task in recent_tasks_query(user)],
+    )
@@ -1,10 +1,21 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.contrib.auth import get_user_model
 
 from boards_app.api.models import Board
 
 User = get_user_model()
 
+
+class TaskQuerySet(models.QuerySet):
+    """Query helpers for serializing tasks without per-row queries."""
+
+    def with_related(self):
+        """Join assignee and reviewer and annotate comments_count."""
+        return self.select_related('assigned_to', 'reviewer').annotate(
+            comments_count=models.Count('comments')
+        )
+
+
 class Task(models.Model):
     """Represents a task in a board, with assignment, status, priority, and deadlines."""
 
@@ -33,9 +44,72 @@ class Task(models.Model):
         related_name='tasks_created'
     )
 
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['assigned_to', 'status', 'updated_at'], name='task_assignee_status_idx'),
+            models.Index(fields=['reviewer', 'status', 'updated_at'], name='task_reviewer_status_idx'),
+            models.Index(fields=['board', 'status'], name='task_board_status_idx'),
+            models.Index(fields=['board', 'priority'], name='task_board_priority_idx'),
+            models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+            models.Index(
+                fields=['due_date'], name='task_urgent_due_idx',
+                condition=models.Q(status='to-do', due_date__isnull=False),
+            ),
+            models.Index(
+                fields=['updated_at'], name='task_done_updated_idx',
+                condition=models.Q(status='done'),
+            ),
+        ]
+
     def __str__(self):
         """Return the title of the task as its string representation."""
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember how the loaded task is counted, so a queryset delete can adjust the board counters by the difference."""
+        task = super().from_db(db, field_names, values)
+        task._counted_as = task.counted_as()
+        return task
+
+    def save(self, *args, **kwargs):
+        """
+        Save the task in one transaction with its write hooks.
+
+        An update first reads the stored row under a lock, so the board
+        counters move from the state the row has, not from the one this
+        instance was loaded with before another request changed it.
+        """
+        using = kwargs.get('using') or router.db_for_write(Task, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            if not self._state.adding:
+                self._counted_as = self._stored_counted_as(using)
+            super().save(*args, **kwargs)
+
+    def delete(self, using=None, keep_parents=False):
+        """Delete the task like save() updates it: from the locked stored row, in one transaction."""
+        using = using or router.db_for_write(Task, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            self._counted_as = self._stored_counted_as(using)
+            return super().delete(using=using, keep_parents=keep_parents)
+
+    def _stored_counted_as(self, using):
+        """Return counted_as() of the stored row, locked until the transaction ends, or None if it is gone."""
+        rows = Task.objects.using(using).select_for_update().filter(pk=self.pk)
+        return rows.values_list('board_id', 'status', 'priority').first()
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._counted_as = self.counted_as()
+
+    def counted_as(self):
+        """Return the (board_id, status, priority) the board counters see, or None if one of them is deferred."""
+        values = self.__dict__
+        if not all(name in values for name in ('board_id', 'status', 'priority')):
+            return None
+        return values['board_id'], values['status'], values['priority']
     
 class Comment(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='comments')
@@ -43,6 +117,11 @@ class Comment(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', 'created_at'], name='comment_task_created_idx'),
+        ]
+
     def __str__(self):
         """Return a short representation of the comment (author and first 30 chars)."""
         return f"{self.author} - {self.content[:30]}"
\ No newline at end of file
@@ -0,0 +1,11 @@
+from core.pagination import KeysetPagination
+
+
+class TaskCursorPagination(KeysetPagination):
+    """Task lists, most recently updated first."""
+    ordering = ('-updated_at', '-id')
+
+
+class CommentCursorPagination(KeysetPagination):
+    """Comment lists in chronological order."""
+    ordering = ('created_at', 'id')
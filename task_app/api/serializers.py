@@ -67,7 +67,10 @@ class TaskSerializer(serializers.ModelSerializer):
         ]
 
     def get_comments_count(self, obj):
-        """Return number of comments on this task."""
+        """Return number of comments on this task, preferring an annotated count."""
+        annotated = getattr(obj, 'comments_count', None)
+        if annotated is not None:
+            return annotated
         return getattr(obj, 'comments', []).count() if hasattr(obj, 'comments') else 0
     
 class TaskUpdateSerializer(serializers.ModelSerializer):
@@ -94,6 +97,20 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'description', 'status', 'priority', 
                   'assignee', 'reviewer', 'assignee_id', 'reviewer_id', 'due_date']
 
+class TaskBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Validates a single item of a bulk task request.
+
+    User references are plain integers here; the bulk view checks
+    all of them with one query instead of one lookup per field.
+    """
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
+    reviewer_id = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Task
+        fields = ['title', 'description', 'status', 'priority', 'assignee_id', 'reviewer_id', 'due_date']
+
 class CommentSerializer(serializers.ModelSerializer):
     """
     Serializer for Comment model.
@@ -1,88 +1,131 @@
 from datetime import timedelta
 
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Max, Q
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.authentication import TokenAuthentication
 from rest_framework import generics, status, permissions
+from rest_framework.utils.urls import replace_query_param
 
+from .cache import dashboard_cache_key, get_dashboard_cache
+from .dashboard import build_dashboard
 from .models import Task, Comment
-from .serializers import TaskSerializer, CommentSerializer, TaskUpdateSerializer
+from .pagination import TaskCursorPagination, CommentCursorPagination
+from .serializers import TaskSerializer, CommentSerializer, TaskUpdateSerializer, TaskBulkItemSerializer
 from boards_app.api.models import Board
-
-class AssignedTasksView(APIView):
-    """Handles retrieval of all tasks assigned to the authenticated user."""
+from boards_app.api.permissions import get_board_access
+from core.conditional import compute_etag, conditional_response, set_validators
+from core.db_routers import read_from_replica
+from task_app import search
+from task_app.signals import bulk_write, tasks_bulk_changed
+
+User = get_user_model()
+
+class UserTaskListView(APIView):
+    """
+    Base for the task lists of the authenticated user.
+
+    One aggregate over the user's tasks yields both the ETag and the
+    X-Tasks-Done-Recently header, so an unchanged list is answered with
+    304 before any task is serialized.
+    """
     permission_classes = [IsAuthenticated]
+    query_budget = 2
+    user_field = None
 
+    @read_from_replica
     def get(self, request):
-        """Return tasks assigned to the user with recent stats."""
-        user = request.user
-        tasks = Task.objects.filter(assigned_to=user)
-        serializer = TaskSerializer(tasks, many=True)
-        
-        response = Response(serializer.data, status=status.HTTP_200_OK)
-        response['X-Tasks-Done-Recently'] = self.get_tasks_done_recently(tasks)
+        """
+        Return the user's tasks with recent stats.
+
+        Paginated by cursor when ``cursor`` or ``page_size`` is given.
+        """
+        tasks = Task.objects.filter(**{self.user_field: request.user})
+        state = self.get_list_state(tasks)
+        etag = compute_etag(request, *sorted(state.items()))
+        response = conditional_response(request, etag)
+        if response is None:
+            response = TaskCursorPagination().get_response(tasks.with_related(), request, TaskSerializer, self)
+            set_validators(response, etag)
+        response['X-Tasks-Done-Recently'] = state['done_recently']
         return response
 
-    def get_tasks_done_recently(self, tasks):
-        """Return count of tasks done in the last 14 days."""
+    def get_list_state(self, tasks):
+        """Return the version of the task list, see list_state_aggregates()."""
+        return tasks.aggregate(**self.list_state_aggregates())
+
+    @staticmethod
+    def list_state_aggregates():
+        """
+        Return the aggregates for row count, latest updated_at, comment count and
+        latest comment id of the tasks, plus the count of tasks done in the last 14 days.
+        """
         two_weeks_ago = timezone.now() - timedelta(days=14)
-        return tasks.filter(status='done', updated_at__gte=two_weeks_ago).count()
+        return {
+            'task_count': Count('id', distinct=True),
+            'last_updated': Max('updated_at'),
+            'comment_count': Count('comments'),
+            'last_comment': Max('comments__id'),
+            'done_recently': Count('id', distinct=True, filter=Q(status='done', updated_at__gte=two_weeks_ago)),
+        }
 
 
-class ReviewingTasksView(APIView):
-    """Handles retrieval of all tasks where the user is assigned as reviewer."""
-    permission_classes = [IsAuthenticated]
+class AssignedTasksView(UserTaskListView):
+    """Handles retrieval of all tasks assigned to the authenticated user."""
+    user_field = 'assigned_to'
 
-    def get(self, request):
-        """Return tasks where user is reviewer with recent stats."""
-        user = request.user
-        tasks = Task.objects.filter(reviewer=user)
-        serializer = TaskSerializer(tasks, many=True)
-        
-        response = Response(serializer.data, status=status.HTTP_200_OK)
-        response['X-Tasks-Done-Recently'] = self.get_tasks_done_recently(tasks)
-        return response
 
-    def get_tasks_done_recently(self, tasks):
-        """Return count of tasks done in the last 14 days."""
-        two_weeks_ago = timezone.now() - timedelta(days=14)
-        return tasks.filter(status='done', updated_at__gte=two_weeks_ago).count()
+class ReviewingTasksView(UserTaskListView):
+    """Handles retrieval of all tasks where the user is assigned as reviewer."""
+    user_field = 'reviewer'
     
     
 class BoardTaskListView(APIView):
     """Lists all tasks for a specific board."""
     permission_classes = [IsAuthenticated]
+    query_budget = 2
 
+    @read_from_replica
     def get(self, request, board_id):
         """
         Return all tasks for the board with the given ID.
 
         If the board does not exist, returns 404.
+        Paginated by cursor when ``cursor`` or ``page_size`` is given.
+        Validators come from board.updated_at, which every task and
+        comment write bumps, so an unchanged list is answered with 304.
         """
         try:
-            board = Board.objects.get(id=board_id)
+            board = Board.objects.only('id', 'updated_at').get(id=board_id)
         except Board.DoesNotExist:
             return Response({"detail": "Board not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        tasks = Task.objects.filter(board=board).select_related('assigned_to', 'reviewer')
-        serializer = TaskSerializer(tasks, many=True)
-        return Response(serializer.data)
+        etag = compute_etag(request, board.pk, board.updated_at)
+        not_modified = conditional_response(request, etag, board.updated_at)
+        if not_modified:
+            return not_modified
+        tasks = Task.objects.with_related().filter(board=board)
+        response = TaskCursorPagination().get_response(tasks, request, TaskSerializer, self)
+        return set_validators(response, etag, board.updated_at)
     
     
 class TaskCreateView(APIView):
     """Handles creation of new tasks."""
     permission_classes = [IsAuthenticated]
+    query_budget = 11
 
     def post(self, request):
         """Validate data, check board membership, and create a task."""
         data = request.data.copy()
         try:
-            board = Board.objects.get(id=data.get("board"))
+            board = Board.objects.with_access(request.user).get(id=data.get("board"))
         except Board.DoesNotExist:
             return Response({"detail": "Board not found."}, status=404)
-        if request.user != board.created_by and request.user not in board.members.all():
+        if not get_board_access(request, board).can_edit:
             return Response({"detail": "Not allowed. Must be a board member."}, status=403)
         serializer = TaskSerializer(data=data, context={'request': request})
         if serializer.is_valid():
@@ -91,10 +134,150 @@ class TaskCreateView(APIView):
         return Response(serializer.errors, status=400)
     
     
+class TaskBulkView(APIView):
+    """
+    Create, update and delete many tasks of one board in a single request.
+
+    Body: {"board": id, "create": [...], "update": [{"id": ..., ...}], "delete": [ids]}.
+    The batch is checked against one membership lookup and written in one
+    transaction. If any item is invalid, nothing is written and the errors
+    are reported per item.
+    """
+    permission_classes = [IsAuthenticated]
+    query_budget = 17
+    max_items = 500
+    user_fields = {'assignee_id': 'assigned_to', 'reviewer_id': 'reviewer'}
+
+    def post(self, request):
+        """Validate and apply a batch of task operations. Returns 200, 400, 403 or 404."""
+        if not isinstance(request.data, dict):
+            return Response({"detail": "Expected an object."}, status=400)
+        creates, updates, deletes = (request.data.get(key, []) for key in ('create', 'update', 'delete'))
+        if not all(isinstance(items, list) for items in (creates, updates, deletes)):
+            return Response({"detail": "create, update and delete must be lists."}, status=400)
+        if len(creates) + len(updates) + len(deletes) > self.max_items:
+            return Response({"detail": f"At most {self.max_items} items per request."}, status=400)
+        user = request.user
+        try:
+            board = Board.objects.with_access(user).get(id=request.data.get("board"))
+        except (Board.DoesNotExist, ValueError, TypeError):
+            return Response({"detail": "Board not found."}, status=404)
+        if not get_board_access(request, board).can_edit:
+            return Response({"detail": "Not allowed. Must be a board member."}, status=403)
+
+        errors = []
+        tasks = self.get_tasks(board, updates, deletes)
+        items = self.validate_items('create', creates, errors) + self.validate_items('update', updates, errors, tasks)
+        delete_ids = self.validate_deletes(deletes, tasks, user, board, errors)
+        users = self.resolve_users(items, errors)
+        if errors:
+            return Response({"errors": errors}, status=400)
+
+        with transaction.atomic(), bulk_write():
+            created = self.create_tasks(board, [i for i in items if i[0] == 'create'], users, user)
+            updated = self.update_tasks([i for i in items if i[0] == 'update'], users)
+            Task.objects.filter(id__in=delete_ids).delete()
+        tasks_bulk_changed.send(sender=Task, board=board, created=created, updated=updated, deleted=delete_ids)
+        return Response({
+            "created": TaskSerializer(created, many=True).data,
+            "updated": TaskUpdateSerializer(updated, many=True).data,
+            "deleted": delete_ids,
+        }, status=200)
+
+    def item_error(self, operation, index, detail):
+        return {"operation": operation, "index": index, "errors": detail}
+
+    def get_tasks(self, board, updates, deletes):
+        """Load every referenced task of the board with one query."""
+        ids = [item.get('id') for item in updates if isinstance(item, dict)] + deletes
+        return (
+            Task.objects.filter(board=board)
+            .select_related('assigned_to', 'reviewer')
+            .in_bulk([task_id for task_id in ids if isinstance(task_id, int)])
+        )
+
+    def validate_items(self, operation, items, errors, tasks=None):
+        """Validate create or update items; return (operation, index, task, data) tuples."""
+        valid = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append(self.item_error(operation, index, "Expected an object."))
+                continue
+            task = None
+            if tasks is not None:
+                task_id = item.get('id')
+                task = tasks.get(task_id) if isinstance(task_id, int) else None
+                if task is None:
+                    errors.append(self.item_error(operation, index, "Task not found on this board."))
+                    continue
+            serializer = TaskBulkItemSerializer(task, data=item, partial=task is not None)
+            if serializer.is_valid():
+                valid.append((operation, index, task, serializer.validated_data))
+            else:
+                errors.append(self.item_error(operation, index, serializer.errors))
+        return valid
+
+    def validate_deletes(self, task_ids, tasks, user, board, errors):
+        """Return the deletable task ids (creator or board owner only)."""
+        valid = []
+        for index, task_id in enumerate(task_ids):
+            task = tasks.get(task_id) if isinstance(task_id, int) else None
+            if task is None:
+                errors.append(self.item_error('delete', index, "Task not found on this board."))
+            elif user.id not in (task.created_by_id, board.created_by_id):
+                errors.append(self.item_error('delete', index, "Forbidden. Only creator or board owner can delete."))
+            else:
+                valid.append(task_id)
+        return valid
+
+    def resolve_users(self, items, errors):
+        """Fetch all referenced assignees and reviewers with one query."""
+        wanted = {
+            data[field] for *_, data in items for field in self.user_fields if data.get(field) is not None
+        }
+        users = User.objects.in_bulk(wanted)
+        for operation, index, _, data in items:
+            missing = {
+                field: ["Invalid pk - object does not exist."]
+                for field in self.user_fields if data.get(field) is not None and data[field] not in users
+            }
+            if missing:
+                errors.append(self.item_error(operation, index, missing))
+        return users
+
+    def apply(self, task, data, users):
+        """Copy validated data onto a task instance."""
+        for field, value in data.items():
+            if field in self.user_fields:
+                setattr(task, self.user_fields[field], users.get(value))
+            else:
+                setattr(task, field, value)
+        return task
+
+    def create_tasks(self, board, items, users, creator):
+        tasks = [self.apply(Task(board=board, created_by=creator), data, users) for *_, data in items]
+        Task.objects.bulk_create(tasks)
+        for task in tasks:
+            task.comments_count = 0
+        return tasks
+
+    def update_tasks(self, items, users):
+        tasks, fields, now = {}, {'updated_at'}, timezone.now()
+        for _, _, task, data in items:
+            self.apply(task, data, users)
+            task.updated_at = now
+            fields.update(self.user_fields.get(field, field) for field in data)
+            tasks[task.pk] = task
+        if tasks:
+            Task.objects.bulk_update(tasks.values(), sorted(fields))
+        return list(tasks.values())
+
+
 class TaskDetailView(APIView):
     """Retrieve, update, or delete a specific task."""
 
     permission_classes = [IsAuthenticated]
+    query_budget = {'get': 4, 'patch': 11, 'delete': 9}
 
     def get(self, request, pk):
         """Return details of a specific task by its ID."""
@@ -109,12 +292,11 @@ class TaskDetailView(APIView):
     def patch(self, request, pk):
         """Update a task; only board members allowed. Board & comments_count not shown."""
         try:
-            task = Task.objects.get(pk=pk)
+            task = Task.objects.select_related('board').get(pk=pk)
         except Task.DoesNotExist:
             return Response({"detail": "Task not found. This Task-ID doesnt exist."}, status=404)
         
-        board = task.board
-        if request.user != board.created_by and request.user not in board.members.all():
+        if not get_board_access(request, task.board).can_edit:
             return Response({"detail": "Not allowed. Must be a board member."}, status=403)
 
         serializer = TaskUpdateSerializer(task, data=request.data, partial=True)
@@ -125,11 +307,10 @@ class TaskDetailView(APIView):
 
     def delete(self, request, pk):
         """Delete a task (creator or board owner only)."""
-        try: task = Task.objects.get(pk=pk)
+        try: task = Task.objects.select_related('board').get(pk=pk)
         except Task.DoesNotExist:
             return Response({"detail": "Task not found."}, status=404)
-        board = task.board
-        if request.user != task.created_by and request.user != board.created_by:
+        if request.user.id not in (task.created_by_id, task.board.created_by_id):
             return Response({"detail": "Forbidden. Only creator or board owner can delete."}, status=403)
         try:
             task.delete()
@@ -141,29 +322,32 @@ class TaskDetailView(APIView):
 class CommentListCreateView(APIView):
     """List or create comments for a specific task with proper status codes."""
     permission_classes = [IsAuthenticated]
+    query_budget = {'get': 3, 'post': 7}
 
     def get(self, request, task_id):
-        """Return all comments for a task. 403 if not board member, 404 if task missing."""
+        """
+        Return all comments for a task. 403 if not board member, 404 if task missing.
+        Paginated by cursor when ``cursor`` or ``page_size`` is given.
+        """
         try:
-            task = Task.objects.get(pk=task_id)
+            task = Task.objects.select_related('board').get(pk=task_id)
         except Task.DoesNotExist:
             return Response({"detail": "Task not found. This Task-ID doesnt exist."}, status=404)
 
-        if request.user != task.board.created_by and request.user not in task.board.members.all():
+        if not get_board_access(request, task.board).can_edit:
             return Response({"detail": "Not allowed. Must be a board member."}, status=403)
 
-        comments = task.comments.order_by('created_at')
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data, status=200)
+        comments = task.comments.select_related('author').order_by('created_at')
+        return CommentCursorPagination().get_response(comments, request, CommentSerializer, self)
 
     def post(self, request, task_id):
         """Create a comment for a task. 201 on success, 400 on invalid data, 403/404 as above."""
         try:
-            task = Task.objects.get(pk=task_id)
+            task = Task.objects.select_related('board').get(pk=task_id)
         except Task.DoesNotExist:
             return Response({"detail": "Task not found. This Task-ID doesnt exist."}, status=404)
 
-        if request.user != task.board.created_by and request.user not in task.board.members.all():
+        if not get_board_access(request, task.board).can_edit:
             return Response({"detail": "Not allowed. Must be a board member."}, status=403)
 
         serializer = CommentSerializer(data=request.data)
@@ -177,6 +361,7 @@ class CommentDeleteView(APIView):
     """Delete a comment if the logged-in user is the author."""
 
     permission_classes = [IsAuthenticated]
+    query_budget = 8
 
     def delete(self, request, task_id, pk):
         """Delete a specific comment by ID if the user is the author."""
@@ -193,62 +378,75 @@ class CommentDeleteView(APIView):
     
 
 class DashboardView(APIView):
-    """Provides dashboard statistics for the logged-in user."""
+    """
+    Provides dashboard statistics for the logged-in user.
+
+    The payload is cached per user for DASHBOARD_CACHE_TIMEOUT seconds;
+    Task and Comment writes invalidate the dashboards of the board's users.
+    """
 
-    authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
+    query_budget = 4
 
+    @read_from_replica
     def get(self, request):
         """Returns all dashboard-related statistics for the logged-in user."""
-        user = request.user
-
-        data = {
-            "tasks_done_recently": self.get_tasks_done_recently(),
-            "tickets_distribution": self.get_tickets_distribution(),
-            "urgent_to_do": self.get_urgent_tasks(),
-            "your_tasks": self.get_recent_user_tasks(user),
-            "tasks_insights": self.get_task_insights(user),
-        }
+        key = dashboard_cache_key(request.user.pk)
+        cache = get_dashboard_cache()
+        data = cache.get(key)
+        if data is None:
+            data = build_dashboard(request.user)
+            cache.set(key, data, settings.DASHBOARD_CACHE_TIMEOUT)
         return Response(data, status=status.HTTP_200_OK)
 
-    def get_tasks_done_recently(self):
-        """Count tasks marked as done within the last 14 days."""
-        two_weeks_ago = timezone.now() - timedelta(days=14)
-        return Task.objects.filter(status='done', updated_at__gte=two_weeks_ago).count()
 
-    def get_tickets_distribution(self):
-        """Return the count of tasks per status."""
-        return {
-            'to_do': Task.objects.filter(status='to-do').count(),
-            'in_progress': Task.objects.filter(status='in-progress').count(),
-            'review': Task.objects.filter(status='review').count(),
-            'done': Task.objects.filter(status='done').count(),
-        }
+class SearchView(APIView):
+    """
+    Full-text search over task titles, descriptions and comments on every
+    board the user can access, best matches first (see task_app.search).
 
-    def get_urgent_tasks(self):
-        """Return count and next deadline for urgent 'to-do' tasks."""
-        urgent_tasks = Task.objects.filter(status='to-do', due_date__isnull=False).order_by('due_date')
-        next_deadline = None
-        if urgent_tasks.exists():
-            next_task = urgent_tasks.first()
-            next_deadline = {
-                "id": next_task.id,
-                "title": next_task.title,
-                "due_date": next_task.due_date
-            }
-        return {
-            "count": urgent_tasks.count(),
-            "next_deadline": next_deadline
-        }
+    Ranked results have no stable keyset, so pages are selected with
+    ``page`` (1-based) and ``page_size``.
+    """
 
-    def get_recent_user_tasks(self, user):
-        """Return the 5 most recently updated tasks assigned to the user."""
-        tasks = Task.objects.filter(assigned_to=user).order_by('-updated_at')[:5]
-        return TaskSerializer(tasks, many=True).data
+    permission_classes = [IsAuthenticated]
+    query_budget = 2
+    page_size = 20
+    max_page_size = 50
 
-    def get_task_insights(self, user):
-        """Return counts of user's assigned and review tasks."""
-        return {
-            "assigned_to_you": Task.objects.filter(assigned_to=user).count(),
-            "to_review": Task.objects.filter(reviewer=user).count(),
-        }
\ No newline at end of file
+    @read_from_replica
+    def get(self, request):
+        """Return {"next", "results"}; each result names the matching task or comment and a snippet."""
+        text = request.query_params.get('q', '')
+        if not search.parse_terms(text):
+            return Response({"detail": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        page, page_size = self.get_page(request)
+        tasks = Task.objects.filter(board__in=Board.objects.accessible_to(request.user))
+        hits = search.search(tasks, text, limit=page_size + 1, offset=(page - 1) * page_size)
+        has_next, hits = len(hits) > page_size, hits[:page_size]
+
+        tasks_by_id = {}
+        if hits:
+            found = Task.objects.filter(id__in={hit.task_id for hit in hits})
+            tasks_by_id = {task['id']: task for task in found.values('id', 'title', 'status', 'priority', 'board_id')}
+        results = [
+            {'type': hit.kind, 'id': hit.object_id, 'task': tasks_by_id[hit.task_id],
+             'snippet': hit.snippet, 'score': round(hit.score, 6)}
+            for hit in hits if hit.task_id in tasks_by_id
+        ]
+        next_url = None
+        if has_next:
+            next_url = replace_query_param(request.build_absolute_uri(), 'page', page + 1)
+        return Response({'next': next_url, 'results': results}, status=status.HTTP_200_OK)
+
+    def get_page(self, request):
+        """Return the requested page number and page size, clamped to valid values."""
+        try:
+            page = int(request.query_params.get('page', 1))
+        except ValueError:
+            page = 1
+        try:
+            size = int(request.query_params.get('page_size', self.page_size))
+        except ValueError:
+            size = self.page_size
+        return max(1, page), max(1, min(size, self.max_page_size))
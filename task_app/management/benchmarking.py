@@ -0,0 +1,26 @@
+"""
+Helpers shared by the benchmark commands.
+
+The benchmarks seed their data and measure inside rolled_back(): one
+transaction that is rolled back at the end, so the database is left
+untouched.
+"""
+
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+class Rollback(Exception):
+    """Raised to roll back the benchmark transaction."""
+
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is always rolled back."""
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
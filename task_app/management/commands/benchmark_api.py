@@ -0,0 +1,316 @@
+"""
+Benchmark every API route against a seeded dataset and compare with a baseline.
+
+Seeds a skewed dataset (see task_app.seeding) and drives each route of
+auth_app, boards_app and task_app through Django's test client as the most
+active seeded user, on that user's busiest board and most commented task.
+Records the query count, median wall time and peak Python memory of each
+request, all in one rolled-back transaction (see
+task_app.management.benchmarking).
+
+The results can be written as a JSON baseline; later runs are compared with
+it and fail if an endpoint needs more queries, or got slower or hungrier by
+more than the tolerance. Caches are cleared before every request, so the
+numbers are for cold caches.
+
+Usage:
+    python manage.py benchmark_api --write-baseline
+    python manage.py benchmark_api --baseline benchmarks/api_baseline.json --tolerance 0.3
+"""
+
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+from rest_framework.authtoken.models import Token
+
+from auth_app.api.authentication import get_local_cache
+from auth_app.api.emails import get_email_cache
+from boards_app.api.models import Board
+from task_app.api.models import Task, Comment
+from task_app.management.benchmarking import rolled_back
+from task_app.seeding import seed_dataset
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'api_baseline.json'
+URLCONFS = ['auth_app.api.urls', 'boards_app.api.urls', 'task_app.api.urls']
+PASSWORD = 'benchmark-password'
+
+# Differences below these are noise, whatever the tolerance says.
+MIN_TIME_DIFF_MS = 1.0
+MIN_MEMORY_DIFF_KIB = 64
+
+
+class Call(NamedTuple):
+    """One request: where to send it, its JSON body and extra headers."""
+    url: str
+    data: dict = None
+    headers: dict = {}
+
+
+class Scenario(NamedTuple):
+    """A named request against one route; ``prepare`` sets up fresh objects and returns the Call."""
+    name: str
+    url_name: str
+    method: str
+    prepare: Callable[[], Call]
+
+
+class Command(BaseCommand):
+    help = "Measure queries, time and memory of every API route on seeded data and compare with a baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--boards', type=int, default=50)
+        parser.add_argument('--tasks', type=int, default=20000)
+        parser.add_argument('--comments', type=int, default=40000)
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the synthetic data.')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per endpoint; the median is reported.')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON file.')
+        parser.add_argument('--write-baseline', action='store_true', help='Store the results as the new baseline.')
+        parser.add_argument('--tolerance', type=float, default=0.5,
+                            help='Allowed relative increase of time and memory before flagging a regression.')
+
+    def handle(self, *args, **options):
+        baseline_path = Path(options['baseline'])
+        baseline = None
+        if not options['write_baseline']:
+            if not baseline_path.exists():
+                raise CommandError(f"No baseline at {baseline_path}; run with --write-baseline first.")
+            baseline = json.loads(baseline_path.read_text())
+
+        try:
+            with rolled_back():
+                self.setup(options)
+                scenarios = self.get_scenarios()
+                self.check_coverage(scenarios)
+                results = {scenario.name: self.measure(scenario, options['repeat']) for scenario in scenarios}
+        finally:
+            cache.clear()
+            get_local_cache().clear()
+            get_email_cache().clear()
+
+        report = {'meta': self.describe(options), 'endpoints': results}
+        if options['write_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(report, indent=2, sort_keys=True) + '\n')
+            self.print_results(results, {})
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {baseline_path}"))
+            return
+
+        regressions = self.compare(results, baseline, options['tolerance'])
+        self.print_results(results, regressions)
+        if baseline['meta'] != report['meta']:
+            self.stdout.write(self.style.WARNING(
+                "The baseline was recorded with different volumes, seed or software versions; "
+                "compare with care."
+            ))
+        if regressions:
+            raise CommandError(f"{len(regressions)} endpoint(s) regressed against {baseline_path}.")
+        self.stdout.write(self.style.SUCCESS("No regressions."))
+
+    def describe(self, options):
+        """Return what the numbers depend on, stored with the baseline."""
+        return {
+            **{key: options[key] for key in ('users', 'boards', 'tasks', 'comments', 'seed')},
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        }
+
+    def setup(self, options):
+        """Seed the dataset and pick the user, board, task and client the scenarios use."""
+        data = seed_dataset(
+            users=options['users'], boards=options['boards'], tasks=options['tasks'],
+            comments=options['comments'], seed=options['seed'], prefix=f'bench-{uuid.uuid4().hex[:8]}',
+            password=PASSWORD,
+        )
+        self.user, self.other = data.users[0], data.users[1]
+        self.collaborators = [user.email.upper() for user in data.users[:40]] + ['nobody@kanmind.test']
+        self.board = (
+            Board.objects.filter(members=self.user).annotate(task_count=Count('tasks'))
+            .order_by('-task_count', 'id').first()
+        )
+        self.task = (
+            Task.objects.filter(board=self.board).annotate(comment_count=Count('comments'))
+            .order_by('-comment_count', 'id').first()
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = Client(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def new_task(self, **fields):
+        return Task.objects.create(board=self.board, title='Benchmark task', created_by=self.user, **fields)
+
+    def get_scenarios(self):
+        """Return one scenario per route and method."""
+        board, task, user = self.board, self.task, self.user
+
+        def fresh_token():
+            other_token, _ = Token.objects.get_or_create(user=self.other)
+            return Call(reverse('logout'), headers={'HTTP_AUTHORIZATION': f'Token {other_token.key}'})
+
+        def fresh_board():
+            doomed = Board.objects.create(name='Benchmark board', created_by=user)
+            doomed.members.add(user, self.other)
+            for i in range(20):
+                Task.objects.create(board=doomed, title=f'Benchmark task {i}', assigned_to=user)
+            return Call(reverse('board_detail', args=[doomed.pk]))
+
+        def fresh_comment():
+            comment = Comment.objects.create(task=task, author=user, content='Benchmark comment')
+            return Call(reverse('comment_delete', args=[task.pk, comment.pk]))
+
+        def bulk_payload():
+            updates = list(Task.objects.filter(board=board).values_list('id', flat=True)[:10])
+            deletes = [self.new_task().pk for _ in range(10)]
+            return Call(reverse('task_bulk'), {
+                'board': board.pk,
+                'create': [{'title': f'Bulk {i}', 'assignee_id': user.pk} for i in range(50)],
+                'update': [{'id': pk, 'status': 'review'} for pk in updates],
+                'delete': deletes,
+            })
+
+        def registration():
+            email = f'bench-{uuid.uuid4().hex[:12]}@kanmind.test'
+            return Call(reverse('registration'), {
+                'fullname': 'Bench Mark', 'email': email, 'password': PASSWORD, 'repeated_password': PASSWORD,
+            })
+
+        return [
+            Scenario('registration', 'registration', 'POST', registration),
+            Scenario('login', 'login', 'POST', lambda: Call(reverse('login'), {'email': user.email, 'password': PASSWORD})),
+            Scenario('logout', 'logout', 'POST', fresh_token),
+            Scenario('email_check', 'email-check', 'GET', lambda: Call(f"{reverse('email-check')}?email={user.email}")),
+            Scenario('email_check_batch', 'email-check-batch', 'POST',
+                     lambda: Call(reverse('email-check-batch'), {'emails': self.collaborators})),
+
+            Scenario('boards', 'boards', 'GET', lambda: Call(reverse('boards'))),
+            Scenario('boards_page', 'boards', 'GET', lambda: Call(f"{reverse('boards')}?page_size=20")),
+            Scenario('board_create', 'boards', 'POST', lambda: Call(reverse('boards'), {
+                'title': 'Benchmark board', 'members': [user.pk, self.other.pk]})),
+            Scenario('board_detail', 'board_detail', 'GET', lambda: Call(reverse('board_detail', args=[board.pk]))),
+            Scenario('board_update', 'board_detail', 'PATCH', lambda: Call(reverse('board_detail', args=[board.pk]), {
+                'title': board.name, 'members': list(board.members.values_list('id', flat=True))})),
+            Scenario('board_members_delta', 'board_detail', 'PATCH', lambda: Call(
+                reverse('board_detail', args=[board.pk]), {'members_add': [self.other.pk], 'members_remove': []})),
+            Scenario('board_delete', 'board_detail', 'DELETE', fresh_board),
+            Scenario('board_export', 'board_export', 'GET', lambda: Call(reverse('board_export', args=[board.pk]))),
+            Scenario('board_changes', 'board_changes', 'GET',
+                     lambda: Call(f"{reverse('board_changes', args=[board.pk])}?since=0")),
+            Scenario('async_boards', 'async_boards', 'GET', lambda: Call(reverse('async_boards'))),
+            Scenario('async_board_detail', 'async_board_detail', 'GET',
+                     lambda: Call(reverse('async_board_detail', args=[board.pk]))),
+
+            Scenario('tasks_assigned', 'tasks_assigned', 'GET', lambda: Call(reverse('tasks_assigned'))),
+            Scenario('tasks_assigned_page', 'tasks_assigned', 'GET',
+                     lambda: Call(f"{reverse('tasks_assigned')}?page_size=50")),
+            Scenario('tasks_reviewing', 'tasks_reviewing', 'GET', lambda: Call(reverse('tasks_reviewing'))),
+            Scenario('board_tasks', 'board_tasks', 'GET', lambda: Call(reverse('board_tasks', args=[board.pk]))),
+            Scenario('task_create', 'task_create', 'POST', lambda: Call(reverse('task_create'), {
+                'board': board.pk, 'title': 'Benchmark task', 'assignee_id': user.pk, 'reviewer_id': self.other.pk})),
+            Scenario('task_bulk', 'task_bulk', 'POST', bulk_payload),
+            Scenario('task_detail', 'task_detail', 'GET', lambda: Call(reverse('task_detail', args=[task.pk]))),
+            Scenario('task_update', 'task_detail', 'PATCH',
+                     lambda: Call(reverse('task_detail', args=[self.new_task().pk]), {'status': 'done'})),
+            Scenario('task_delete', 'task_detail', 'DELETE',
+                     lambda: Call(reverse('task_detail', args=[self.new_task().pk]))),
+            Scenario('task_comments', 'task_comments', 'GET', lambda: Call(reverse('task_comments', args=[task.pk]))),
+            Scenario('comment_create', 'task_comments', 'POST',
+                     lambda: Call(reverse('task_comments', args=[task.pk]), {'content': 'Benchmark comment'})),
+            Scenario('comment_delete', 'comment_delete', 'DELETE', fresh_comment),
+            Scenario('dashboard', 'dashboard', 'GET', lambda: Call(reverse('dashboard'))),
+            Scenario('async_tasks_assigned', 'async_tasks_assigned', 'GET', lambda: Call(reverse('async_tasks_assigned'))),
+            Scenario('async_tasks_reviewing', 'async_tasks_reviewing', 'GET',
+                     lambda: Call(reverse('async_tasks_reviewing'))),
+            Scenario('async_dashboard', 'async_dashboard', 'GET', lambda: Call(reverse('async_dashboard'))),
+            Scenario('search', 'search', 'GET', lambda: Call(f"{reverse('search')}?q=login")),
+            Scenario('search_prefix', 'search', 'GET', lambda: Call(f"{reverse('search')}?q=dashboard+exp")),
+        ]
+
+    def check_coverage(self, scenarios):
+        """Warn about routes of the benchmarked URLconfs that no scenario drives."""
+        covered = {scenario.url_name for scenario in scenarios}
+        names = {
+            pattern.name for urlconf in URLCONFS for pattern in get_resolver(urlconf).url_patterns if pattern.name
+        }
+        for name in sorted(names - covered):
+            self.stdout.write(self.style.WARNING(f"Route {name!r} has no benchmark scenario."))
+
+    def request(self, scenario):
+        """Prepare and send one request; return (response, queries, milliseconds)."""
+        call = scenario.prepare()
+        cache.clear()
+        get_email_cache().clear()
+        send = getattr(self.client, scenario.method.lower())
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = send(call.url, call.data, content_type='application/json', **call.headers) \
+                if call.data is not None else send(call.url, **call.headers)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = (time.perf_counter() - start) * 1000
+        return response, len(queries), elapsed
+
+    def measure(self, scenario, repeat):
+        """Run a scenario ``repeat`` times plus once under tracemalloc; return its numbers."""
+        runs = [self.request(scenario) for _ in range(max(1, repeat))]
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            self.request(scenario)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        response, queries, _ = runs[-1]
+        return {
+            'status': response.status_code,
+            'queries': queries,
+            'median_ms': round(statistics.median(elapsed for _, _, elapsed in runs), 3),
+            'peak_kib': round(peak / 1024, 1),
+        }
+
+    def compare(self, results, baseline, tolerance):
+        """Return {endpoint: [reasons]} for every endpoint that got worse than the baseline."""
+        regressions = {}
+        for name, current in results.items():
+            previous = baseline['endpoints'].get(name)
+            if previous is None:
+                continue
+            reasons = []
+            if current['status'] != previous['status']:
+                reasons.append(f"status {previous['status']} -> {current['status']}")
+            if current['queries'] > previous['queries']:
+                reasons.append(f"queries {previous['queries']} -> {current['queries']}")
+            if (current['median_ms'] > previous['median_ms'] * (1 + tolerance)
+                    and current['median_ms'] - previous['median_ms'] > MIN_TIME_DIFF_MS):
+                reasons.append(f"time {previous['median_ms']:.1f} -> {current['median_ms']:.1f} ms")
+            if (current['peak_kib'] > previous['peak_kib'] * (1 + tolerance)
+                    and current['peak_kib'] - previous['peak_kib'] > MIN_MEMORY_DIFF_KIB):
+                reasons.append(f"memory {previous['peak_kib']:.0f} -> {current['peak_kib']:.0f} KiB")
+            if reasons:
+                regressions[name] = reasons
+        return regressions
+
+    def print_results(self, results, regressions):
+        self.stdout.write(f"{'endpoint':24} {'status':>6} {'queries':>7} {'median ms':>10} {'peak KiB':>9}")
+        for name, result in results.items():
+            line = (
+                f"{name:24} {result['status']:6} {result['queries']:7} "
+                f"{result['median_ms']:10.2f} {result['peak_kib']:9.1f}"
+            )
+            if name in regressions:
+                line = self.style.ERROR(f"{line}  REGRESSION: {', '.join(regressions[name])}")
+            self.stdout.write(line)
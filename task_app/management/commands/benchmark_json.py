@@ -0,0 +1,85 @@
+"""
+Compare JSON encode and decode time of DRF's stdlib classes and the orjson ones.
+
+Seeds one board with many tasks (see task_app.seeding), serializes it the
+way BoardDetailView and BoardTaskListView do, and times rendering the
+payloads with JSONRenderer and FastJSONRenderer, and parsing a bulk task
+request with JSONParser and FastJSONParser. The board is seeded in a
+rolled-back transaction (see task_app.management.benchmarking).
+Serialization itself is not timed; it is the same either way.
+
+Usage:
+    python manage.py benchmark_json --tasks 10000
+"""
+
+import io
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from boards_app.api.models import Board
+from boards_app.api.serializers import BoardDetailSerializer
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer, orjson
+from task_app.api.models import Task
+from task_app.api.serializers import TaskSerializer
+from task_app.management.benchmarking import rolled_back
+from task_app.seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    help = "Time JSON rendering and parsing of large task payloads with the stdlib and orjson classes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10000, help='Tasks on the benchmarked board.')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement; the median is reported.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the synthetic data.')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; the fast classes fall back to the stdlib."))
+        with rolled_back():
+            payloads = self.build_payloads(options)
+
+        self.stdout.write(f"{'payload':28} {'KiB':>8} {'stdlib ms':>10} {'orjson ms':>10} {'speedup':>8}")
+        for name, data in payloads.items():
+            expected = JSONRenderer().render(data)
+            rendered = FastJSONRenderer().render(data)
+            if json.loads(rendered) != json.loads(expected):
+                self.stdout.write(self.style.ERROR(f"{name}: FastJSONRenderer output differs from JSONRenderer"))
+            self.print_row(f"render {name}", len(expected),
+                           self.time(lambda: JSONRenderer().render(data), options['repeat']),
+                           self.time(lambda: FastJSONRenderer().render(data), options['repeat']))
+
+        body = json.dumps({'create': [{'title': f'Task {i}', 'description': 'x' * 80, 'priority': 'high',
+                                       'due_date': '2030-01-01'} for i in range(options['tasks'])]}).encode()
+        self.print_row('parse bulk request', len(body),
+                       self.time(lambda: JSONParser().parse(io.BytesIO(body)), options['repeat']),
+                       self.time(lambda: FastJSONParser().parse(io.BytesIO(body)), options['repeat']))
+
+    def build_payloads(self, options):
+        """Seed one board and return the board detail and task list payloads."""
+        data = seed_dataset(users=20, boards=1, members=10, tasks=options['tasks'], comments=options['tasks'],
+                            seed=options['seed'], prefix='json')
+        board = Board.objects.with_detail().get(pk=data.boards[0].pk)
+        tasks = Task.objects.with_related().filter(board=board)
+        return {
+            'board_detail': BoardDetailSerializer(board).data,
+            'board_tasks': TaskSerializer(tasks, many=True).data,
+        }
+
+    def time(self, func, repeat):
+        runs = []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            func()
+            runs.append((time.perf_counter() - start) * 1000)
+        return statistics.median(runs)
+
+    def print_row(self, name, size, stdlib_ms, fast_ms):
+        speedup = stdlib_ms / fast_ms if fast_ms else float('inf')
+        self.stdout.write(f"{name:28} {size / 1024:8.0f} {stdlib_ms:10.2f} {fast_ms:10.2f} {speedup:7.1f}x")
@@ -0,0 +1,121 @@
+"""
+Benchmark the hot API queries with and without the Task/Comment indexes.
+
+Seeds a skewed synthetic dataset (see task_app.seeding), drops the
+indexes declared in Task.Meta and Comment.Meta, measures every query,
+recreates the indexes and measures again, all in one rolled-back
+transaction (see task_app.management.benchmarking).
+
+Usage:
+    python manage.py benchmark_queries --tasks 50000 --comments 100000
+"""
+
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from task_app.api.models import Task, Comment
+from task_app.management.benchmarking import rolled_back
+from task_app.seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    help = "Seed synthetic data and print EXPLAIN plans and timings for the API queries before and after indexing."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--boards', type=int, default=50)
+        parser.add_argument('--tasks', type=int, default=20000)
+        parser.add_argument('--comments', type=int, default=40000)
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per query; the median is reported.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the synthetic data.')
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            user, board, task = self.seed(options)
+            queries = self.get_queries(user, board, task)
+            self.stdout.write(self.style.MIGRATE_HEADING("Without indexes"))
+            self.drop_indexes()
+            before = self.measure(queries, options['repeat'])
+            self.stdout.write(self.style.MIGRATE_HEADING("With indexes"))
+            self.create_indexes()
+            after = self.measure(queries, options['repeat'])
+            self.print_summary(before, after)
+
+    def seed(self, options):
+        """Seed a skewed dataset; return its most active user, board and task."""
+        data = seed_dataset(
+            users=options['users'], boards=options['boards'], tasks=options['tasks'],
+            comments=options['comments'], seed=options['seed'], prefix='bench',
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(
+            f"Seeded {len(data.users)} users, {len(data.boards)} boards, {len(data.tasks)} tasks, {data.comments} comments."
+        )
+        return data.users[0], data.boards[0], data.tasks[0]
+
+    def get_queries(self, user, board, task):
+        """Return the querysets issued by the API endpoints, keyed by name."""
+        two_weeks_ago = timezone.now() - timedelta(days=14)
+        return {
+            'tasks_assigned': Task.objects.filter(assigned_to=user).order_by('-updated_at'),
+            'tasks_assigned_done_recently': Task.objects.filter(
+                assigned_to=user, status='done', updated_at__gte=two_weeks_ago),
+            'tasks_reviewing': Task.objects.filter(reviewer=user).order_by('-updated_at'),
+            'board_tasks_to_do': Task.objects.filter(board=board, status='to-do'),
+            'board_tasks_high_prio': Task.objects.filter(board=board, priority='high'),
+            'dashboard_done_recently': Task.objects.filter(status='done', updated_at__gte=two_weeks_ago),
+            'dashboard_urgent': Task.objects.filter(
+                status='to-do', due_date__isnull=False).order_by('due_date')[:1],
+            'task_comments': Comment.objects.filter(task=task).order_by('created_at'),
+        }
+
+    def get_indexes(self):
+        """Return (model, index) pairs for every index declared in Meta."""
+        return [(model, index) for model in (Task, Comment) for index in model._meta.indexes]
+
+    def drop_indexes(self):
+        """Drop the Meta indexes inside the open transaction."""
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model, index in self.get_indexes():
+                cursor.execute(editor.sql_delete_index % {
+                    'table': editor.quote_name(model._meta.db_table),
+                    'name': editor.quote_name(index.name),
+                })
+
+    def create_indexes(self):
+        """Recreate the Meta indexes and refresh planner statistics."""
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model, index in self.get_indexes():
+                cursor.execute(str(index.create_sql(model, editor)))
+            cursor.execute('ANALYZE')
+
+    def measure(self, queries, repeat):
+        """Print the plan of each query and return its median runtime in milliseconds."""
+        timings = {}
+        for name, queryset in queries.items():
+            runs = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                # all() clones the queryset, so every run hits the database.
+                list(queryset.all())
+                runs.append((time.perf_counter() - start) * 1000)
+            timings[name] = statistics.median(runs)
+            self.stdout.write(f"\n{name}  ({timings[name]:.2f} ms)")
+            self.stdout.write(queryset.explain())
+        return timings
+
+    def print_summary(self, before, after):
+        """Print a before/after comparison table."""
+        self.stdout.write(self.style.MIGRATE_HEADING("\nSummary (median ms)"))
+        self.stdout.write(f"{'query':32} {'before':>10} {'after':>10} {'speedup':>8}")
+        for name in before:
+            speedup = before[name] / after[name] if after[name] else float('inf')
+            self.stdout.write(f"{name:32} {before[name]:10.2f} {after[name]:10.2f} {speedup:7.1f}x")
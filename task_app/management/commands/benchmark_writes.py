@@ -0,0 +1,111 @@
+"""
+Benchmark concurrent writes through the task endpoints.
+
+Forks worker processes that each create tasks with POST /api/tasks/ and
+update them with PATCH /api/tasks/<id>/ through Django's test client, so
+every request runs the full view, signal and database path against the
+configured database. Reports throughput, latency percentiles and how many
+requests failed, e.g. with "database is locked" on a badly tuned SQLite.
+
+The benchmark board and user are deleted again at the end.
+
+Usage:
+    python manage.py benchmark_writes --processes 8 --requests 200
+"""
+
+import multiprocessing
+import statistics
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+from django.test import Client
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from boards_app.api.models import Board
+
+User = get_user_model()
+
+
+def run_worker(args):
+    """Send ``requests`` alternating create/update requests; return (latencies ms, errors by kind)."""
+    token, board_id, requests = args
+    client = Client(HTTP_AUTHORIZATION=f'Token {token}', raise_request_exception=True)
+    latencies, errors, task_id = [], {}, None
+    for i in range(requests):
+        start = time.perf_counter()
+        try:
+            if task_id is None or i % 2 == 0:
+                response = client.post(reverse('task_create'), {'board': board_id, 'title': f'Write {i}'},
+                                       content_type='application/json')
+                task_id = response.json().get('id') if response.status_code == 201 else None
+            else:
+                response = client.patch(reverse('task_detail', args=[task_id]), {'status': 'in-progress'},
+                                        content_type='application/json')
+            if response.status_code >= 400:
+                errors[f'HTTP {response.status_code}'] = errors.get(f'HTTP {response.status_code}', 0) + 1
+        except OperationalError as exc:
+            errors[str(exc)] = errors.get(str(exc), 0) + 1
+        latencies.append((time.perf_counter() - start) * 1000)
+    connections.close_all()
+    return latencies, errors
+
+
+class Command(BaseCommand):
+    help = "Run parallel task create/update requests against the configured database and report latencies."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=8, help='Parallel writer processes.')
+        parser.add_argument('--requests', type=int, default=100, help='Requests per process.')
+
+    def handle(self, *args, **options):
+        self.describe_profile()
+        email = f'bench-writes-{uuid.uuid4().hex[:8]}@kanmind.test'
+        user = User.objects.create_user(username=email, email=email)
+        board = Board.objects.create(name='Write benchmark', created_by=user)
+        board.members.add(user)
+        token = Token.objects.create(user=user)
+        try:
+            # Forked workers must not share the parent's connection.
+            connections.close_all()
+            jobs = [(token.key, board.pk, options['requests'])] * options['processes']
+            start = time.perf_counter()
+            with multiprocessing.get_context('fork').Pool(options['processes']) as pool:
+                results = pool.map(run_worker, jobs)
+            elapsed = time.perf_counter() - start
+        finally:
+            board.delete()
+            user.delete()
+        self.print_results(results, elapsed)
+
+    def describe_profile(self):
+        db = settings.DATABASES['default']
+        details = [db['ENGINE'].rsplit('.', 1)[-1], f"CONN_MAX_AGE={db.get('CONN_MAX_AGE', 0)}"]
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                details.append(f"journal_mode={cursor.fetchone()[0]}")
+                cursor.execute('PRAGMA busy_timeout')
+                details.append(f"busy_timeout={cursor.fetchone()[0]}")
+        if db.get('OPTIONS', {}).get('pool'):
+            details.append(f"pool={db['OPTIONS']['pool']}")
+        self.stdout.write(self.style.MIGRATE_HEADING("Database profile: " + ", ".join(details)))
+
+    def print_results(self, results, elapsed):
+        latencies = [latency for worker_latencies, _ in results for latency in worker_latencies]
+        errors = {}
+        for _, worker_errors in results:
+            for kind, count in worker_errors.items():
+                errors[kind] = errors.get(kind, 0) + count
+        percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        self.stdout.write(f"requests   {len(latencies)}")
+        self.stdout.write(f"throughput {len(latencies) / elapsed:.1f} req/s")
+        self.stdout.write(f"p50        {statistics.median(latencies):.1f} ms")
+        self.stdout.write(f"p99        {percentiles[98]:.1f} ms")
+        self.stdout.write(f"errors     {sum(errors.values())}")
+        for kind, count in sorted(errors.items(), key=lambda item: -item[1]):
+            self.stdout.write(f"  {count:6}  {kind}")
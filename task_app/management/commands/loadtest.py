@@ -0,0 +1,168 @@
+"""
+Compare the sync (WSGI) and async (ASGI) read endpoints under concurrent load.
+
+Starts gunicorn serving core.wsgi and uvicorn serving core.asgi (or uses
+servers given with --wsgi-url / --asgi-url), fires GET requests at the sync
+endpoints on the WSGI server and at their /api/async/ twins on the ASGI
+server over keep-alive connections, and prints throughput and p50/p99
+latency side by side.
+
+The servers use the configured database, so load it with realistic data
+first. Requests authenticate with a token of the user given by --user.
+
+Usage:
+    python manage.py loadtest --user alice@example.com --concurrency 200 --requests 5000
+"""
+
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+
+from boards_app.api.models import Board
+
+User = get_user_model()
+
+ENDPOINTS = [
+    ('boards', '/api/boards/', '/api/async/boards/'),
+    ('board_detail', '/api/boards/{board}/', '/api/async/boards/{board}/'),
+    ('tasks_assigned', '/api/tasks/assigned-to-me/', '/api/async/tasks/assigned-to-me/'),
+    ('tasks_reviewing', '/api/tasks/reviewing/', '/api/async/tasks/reviewing/'),
+    ('dashboard', '/api/dashboard/', '/api/async/dashboard/'),
+]
+
+
+class Command(BaseCommand):
+    help = "Load-test the sync views under WSGI against the async views under ASGI."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help='Email of the user to authenticate as.')
+        parser.add_argument('--concurrency', type=int, default=100, help='Open connections per run.')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per endpoint and server.')
+        parser.add_argument('--workers', type=int, default=1, help='Worker processes per started server.')
+        parser.add_argument('--threads', type=int, default=8, help='Threads per gunicorn worker.')
+        parser.add_argument('--wsgi-url', help='Use this running WSGI server instead of starting gunicorn.')
+        parser.add_argument('--asgi-url', help='Use this running ASGI server instead of starting uvicorn.')
+        parser.add_argument('--endpoint', action='append', choices=[name for name, _, _ in ENDPOINTS],
+                            help='Endpoint to test; repeat for several. Defaults to all.')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['user']}")
+        token, _ = Token.objects.get_or_create(user=user)
+        headers = {'Authorization': f'Token {token.key}'}
+        board = Board.objects.accessible_to(user).values_list('id', flat=True).first()
+        endpoints = [e for e in ENDPOINTS if not options['endpoint'] or e[0] in options['endpoint']]
+        if board is None:
+            endpoints = [e for e in endpoints if '{board}' not in e[1]]
+
+        servers = []
+        try:
+            wsgi_url = options['wsgi_url'] or self.start(servers, [
+                'gunicorn', 'core.wsgi:application', '--workers', str(options['workers']),
+                '--threads', str(options['threads']), '--log-level', 'warning', '--bind',
+            ])
+            asgi_url = options['asgi_url'] or self.start(servers, [
+                'uvicorn', 'core.asgi:application', '--workers', str(options['workers']),
+                '--log-level', 'warning', '--no-access-log', '--port',
+            ])
+            self.stdout.write(f"{'endpoint':16} {'server':5} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+            for name, sync_path, async_path in endpoints:
+                for server, url, path in (('wsgi', wsgi_url, sync_path), ('asgi', asgi_url, async_path)):
+                    result = asyncio.run(self.run_load(
+                        url, path.format(board=board), headers, options['concurrency'], options['requests'],
+                    ))
+                    self.stdout.write(
+                        f"{name:16} {server:5} {result['rate']:9.1f} {result['p50']:9.1f} "
+                        f"{result['p99']:9.1f} {result['errors']:7}"
+                    )
+        finally:
+            for process in servers:
+                process.terminate()
+                process.wait(timeout=10)
+
+    def start(self, servers, command):
+        """Start a server on a free local port, wait until it accepts connections and return its URL."""
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        bind = f'127.0.0.1:{port}' if command[0] == 'gunicorn' else str(port)
+        process = subprocess.Popen([sys.executable, '-m', *command, bind])
+        servers.append(process)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"{command[0]} exited with code {process.returncode}")
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+                return f'http://127.0.0.1:{port}'
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"{command[0]} did not start within 30 seconds")
+
+    async def run_load(self, url, path, headers, concurrency, total):
+        """Send ``total`` GETs over ``concurrency`` keep-alive connections and summarize latencies."""
+        parts = urlsplit(url)
+        latencies, errors = [], 0
+        remaining = total
+
+        async def connection():
+            nonlocal remaining, errors
+            reader = writer = None
+            while remaining > 0:
+                remaining -= 1
+                try:
+                    if writer is None:
+                        reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+                    start = time.perf_counter()
+                    status, keep_alive = await self.get(reader, writer, parts.netloc, path, headers)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    if status != 200:
+                        errors += 1
+                    if not keep_alive:
+                        writer.close()
+                        writer = None
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    errors += 1
+                    writer = None
+            if writer is not None:
+                writer.close()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(connection() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        if len(latencies) < 2:
+            latencies = (latencies or [0.0]) * 2
+        return {
+            'rate': total / elapsed,
+            'p50': statistics.median(latencies),
+            'p99': statistics.quantiles(latencies, n=100)[98],
+            'errors': errors,
+        }
+
+    async def get(self, reader, writer, host, path, headers):
+        """Send one HTTP/1.1 GET and read the full response; return (status, keep-alive)."""
+        lines = [f'GET {path} HTTP/1.1', f'Host: {host}', *[f'{k}: {v}' for k, v in headers.items()]]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode())
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        response_headers = {}
+        while (line := await reader.readline()) not in (b'\r\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip().lower()
+        if response_headers.get('transfer-encoding') == 'chunked':
+            while size := int((await reader.readline()).strip(), 16):
+                await reader.readexactly(size + 2)
+            await reader.readline()
+        else:
+            await reader.readexactly(int(response_headers.get('content-length', 0)))
+        return status, response_headers.get('connection') != 'close'
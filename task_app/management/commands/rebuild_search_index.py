@@ -0,0 +1,29 @@
+"""
+Rebuild the full-text search index from all tasks and comments.
+
+Needed after writes that bypass the model hooks, e.g. loaddata or raw SQL.
+
+Usage:
+    python manage.py rebuild_search_index
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from task_app import search
+from task_app.api.models import Task, Comment
+
+
+class Command(BaseCommand):
+    help = "Refill the task and comment search index."
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        with transaction.atomic():
+            search.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {Task.objects.count()} tasks and {Comment.objects.count()} comments "
+            f"in {time.perf_counter() - start:.1f}s."
+        ))
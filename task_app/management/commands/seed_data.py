@@ -0,0 +1,49 @@
+"""
+Fill the database with a skewed synthetic dataset (see task_app.seeding).
+
+Usage:
+    python manage.py seed_data --users 1000 --boards 300 --tasks 100000 --comments 300000
+    python manage.py seed_data --prefix demo --password demo1234 --skew 0
+"""
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_app.seeding import EMAIL_DOMAIN, seed_dataset
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Seed users, boards, members, tasks and comments with realistic skew."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--boards', type=int, default=50)
+        parser.add_argument('--members', type=int, default=8, help='Average members per board.')
+        parser.add_argument('--tasks', type=int, default=20000)
+        parser.add_argument('--comments', type=int, default=40000)
+        parser.add_argument('--skew', type=float, default=1.1, help='Zipf exponent of user, board and task activity; 0 is uniform.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed gives the same dataset.')
+        parser.add_argument('--prefix', default='seed', help='Seeded users are <prefix>-<n>@kanmind.test.')
+        parser.add_argument('--password', help='Password of the seeded users; unusable if omitted.')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if User.objects.filter(email=f'{prefix}-0@{EMAIL_DOMAIN}').exists():
+            raise CommandError(f"Users with prefix {prefix!r} already exist; choose another --prefix.")
+        start = time.perf_counter()
+        with transaction.atomic():
+            data = seed_dataset(
+                users=options['users'], boards=options['boards'], members=options['members'],
+                tasks=options['tasks'], comments=options['comments'], skew=options['skew'],
+                seed=options['seed'], prefix=prefix, password=options['password'],
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(data.users)} users, {len(data.boards)} boards, {len(data.tasks)} tasks and "
+            f"{data.comments} comments in {time.perf_counter() - start:.1f}s."
+        ))
+        self.stdout.write(f"Most active user: {data.users[0].email}" if data.users else "No users seeded.")
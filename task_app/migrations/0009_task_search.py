@@ -0,0 +1,61 @@
+from django.db import migrations
+
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE task_search USING fts5(
+    title, body, kind UNINDEXED, object_id UNINDEXED, task_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+)
+"""
+
+POSTGRES_CREATE = [
+    """
+    CREATE TABLE task_search (
+        id bigint PRIMARY KEY,
+        kind varchar(10) NOT NULL,
+        object_id bigint NOT NULL,
+        task_id bigint NOT NULL,
+        title text NOT NULL,
+        body text NOT NULL,
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX task_search_document_idx ON task_search USING GIN (document)",
+    "CREATE INDEX task_search_task_idx ON task_search (task_id)",
+]
+
+BACKFILL = """
+INSERT INTO task_search ({key}, kind, object_id, task_id, title, body)
+SELECT id * 2, 'task', id, id, title, description FROM task_app_task
+UNION ALL
+SELECT id * 2 + 1, 'comment', id, task_id, '', content FROM task_app_comment
+"""
+
+
+def create_search_index(apps, schema_editor):
+    """Create the full-text index for the database in use and fill it."""
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_CREATE)
+        schema_editor.execute(BACKFILL.format(key="rowid"))
+    elif vendor == "postgresql":
+        for statement in POSTGRES_CREATE:
+            schema_editor.execute(statement)
+        schema_editor.execute(BACKFILL.format(key="id"))
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE task_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_app", "0008_task_comment_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
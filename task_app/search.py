@@ -0,0 +1,221 @@
+"""
+Full-text search over task titles, descriptions and comments.
+
+Every task and comment has one document in the ``task_search`` table, keyed
+by ``object_id * 2`` (tasks) or ``object_id * 2 + 1`` (comments):
+
+- SQLite: an FTS5 virtual table, ranked with bm25().
+- PostgreSQL: a table with a generated, weighted ``tsvector`` column under a
+  GIN index, ranked with ts_rank_cd().
+
+Either way a query reads the posting lists of its terms instead of scanning
+the corpus, so its cost grows with the number of matches, not with the
+number of tasks. The table is created by migration 0009_task_search and
+kept in sync by the save/delete hooks in task_app.signals. Task writes
+run them in one transaction with the row (see Task.save); a comment's
+document is written right after the comment, so a failure in between can
+leave it stale until ``rebuild_search_index`` refills the table.
+"""
+
+import html
+import re
+from typing import NamedTuple
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, router
+
+from .api.models import Task, Comment
+
+TABLE = 'task_search'
+TASK, COMMENT = 'task', 'comment'
+MAX_TERMS = 10
+BATCH_SIZE = 500
+
+# Snippet markers that cannot occur in user text; replaced after escaping.
+_START, _STOP = '\x02', '\x03'
+_TERM = re.compile(r'\w+')
+
+
+class SearchHit(NamedTuple):
+    """One matching document; higher scores are better matches."""
+    kind: str
+    object_id: int
+    task_id: int
+    score: float
+    snippet: str
+
+
+def document_id(kind, object_id):
+    return object_id * 2 + (kind == COMMENT)
+
+
+def task_document(task):
+    return (document_id(TASK, task.pk), TASK, task.pk, task.pk, task.title, task.description or '')
+
+
+def comment_document(comment):
+    return (document_id(COMMENT, comment.pk), COMMENT, comment.pk, comment.task_id, '', comment.content)
+
+
+def parse_terms(text):
+    """Return the searchable words of a query; the last one matches as a prefix."""
+    return _TERM.findall(text.lower())[:MAX_TERMS]
+
+
+def render_snippet(snippet):
+    """Escape a snippet and turn the match markers into <mark> tags."""
+    return html.escape(snippet or '').replace(_START, '<mark>').replace(_STOP, '</mark>')
+
+
+class SQLiteBackend:
+    """FTS5 virtual table."""
+
+    key = 'rowid'
+    upsert_sql = (
+        f'INSERT OR REPLACE INTO {TABLE} (rowid, kind, object_id, task_id, title, body) '
+        f'VALUES (%s, %s, %s, %s, %s, %s)'
+    )
+    delete_sql = f'DELETE FROM {TABLE} WHERE rowid = %s'
+    # The FTS table has no index on task_id; only bulk deletes need this.
+    delete_task_comments_sql = f"DELETE FROM {TABLE} WHERE kind = 'comment' AND task_id IN ({{}})"
+
+    @staticmethod
+    def match_query(terms):
+        return ' AND '.join(f'"{term}"' for term in terms) + '*'
+
+    def search_sql(self, task_filter):
+        return (
+            f"SELECT kind, object_id, task_id, -bm25({TABLE}, 4.0, 1.0) AS score, "
+            f"snippet({TABLE}, -1, char(2), char(3), '…', 16) "
+            f"FROM {TABLE} WHERE {TABLE} MATCH %s AND task_id IN ({task_filter}) "
+            f"ORDER BY score DESC, rowid LIMIT %s OFFSET %s"
+        )
+
+
+class PostgreSQLBackend:
+    """Table with a weighted tsvector column and a GIN index."""
+
+    key = 'id'
+    upsert_sql = (
+        f'INSERT INTO {TABLE} (id, kind, object_id, task_id, title, body) VALUES (%s, %s, %s, %s, %s, %s) '
+        f'ON CONFLICT (id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body, task_id = EXCLUDED.task_id'
+    )
+    delete_sql = f'DELETE FROM {TABLE} WHERE id = %s'
+    delete_task_comments_sql = f"DELETE FROM {TABLE} WHERE kind = 'comment' AND task_id IN ({{}})"
+
+    @staticmethod
+    def match_query(terms):
+        return ' & '.join(terms) + ':*'
+
+    def search_sql(self, task_filter):
+        # Headlines are only built for the rows of the requested page.
+        return (
+            f"SELECT kind, object_id, task_id, score, "
+            f"ts_headline('simple', concat_ws(' ', title, body), query, "
+            f"'StartSel=\x02, StopSel=\x03, MaxWords=24, MinWords=8') "
+            f"FROM (SELECT id, kind, object_id, task_id, title, body, query, "
+            f"ts_rank_cd(document, query) AS score "
+            f"FROM {TABLE}, to_tsquery('simple', %s) AS query "
+            f"WHERE document @@ query AND task_id IN ({task_filter}) "
+            f"ORDER BY score DESC, id LIMIT %s OFFSET %s) AS page "
+            f"ORDER BY score DESC, id"
+        )
+
+
+BACKENDS = {'sqlite': SQLiteBackend(), 'postgresql': PostgreSQLBackend()}
+
+
+def get_backend(connection):
+    try:
+        return BACKENDS[connection.vendor]
+    except KeyError:
+        raise ImproperlyConfigured(f"Full-text search does not support {connection.vendor}.")
+
+
+def _write_connection():
+    return connections[router.db_for_write(Task)]
+
+
+def index_documents(documents):
+    """Insert or replace the given (id, kind, object_id, task_id, title, body) rows."""
+    if not documents:
+        return
+    connection = _write_connection()
+    with connection.cursor() as cursor:
+        cursor.executemany(get_backend(connection).upsert_sql, documents)
+
+
+def index_tasks(tasks):
+    index_documents([task_document(task) for task in tasks])
+
+
+def index_comments(comments):
+    index_documents([comment_document(comment) for comment in comments])
+
+
+def remove(kind, object_ids):
+    if not object_ids:
+        return
+    connection = _write_connection()
+    with connection.cursor() as cursor:
+        cursor.executemany(get_backend(connection).delete_sql, [(document_id(kind, pk),) for pk in object_ids])
+
+
+def remove_tasks_with_comments(task_ids):
+    """Remove tasks and the comments that were deleted with them, e.g. after a bulk delete."""
+    if not task_ids:
+        return
+    remove(TASK, task_ids)
+    connection = _write_connection()
+    with connection.cursor() as cursor:
+        sql = get_backend(connection).delete_task_comments_sql.format(', '.join(['%s'] * len(task_ids)))
+        cursor.execute(sql, list(task_ids))
+
+
+def remove_board(board_id):
+    """Remove the documents of a board's tasks and comments, e.g. right before the board is deleted."""
+    connection = _write_connection()
+    tasks, comments = Task._meta.db_table, Comment._meta.db_table
+    # Documents are found by key through the indexed board and task columns, not by scanning the index.
+    sql = (
+        f"DELETE FROM {TABLE} WHERE {get_backend(connection).key} IN ("
+        f"SELECT id * 2 FROM {tasks} WHERE board_id = %s UNION ALL "
+        f"SELECT c.id * 2 + 1 FROM {comments} c JOIN {tasks} t ON t.id = c.task_id WHERE t.board_id = %s)"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [board_id, board_id])
+
+
+def rebuild():
+    """Empty the index and add every task and comment again."""
+    connection = _write_connection()
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE}')
+    for model, to_document in ((Task, task_document), (Comment, comment_document)):
+        batch = []
+        for obj in model.objects.order_by('pk').iterator(chunk_size=BATCH_SIZE):
+            batch.append(to_document(obj))
+            if len(batch) == BATCH_SIZE:
+                index_documents(batch)
+                batch = []
+        index_documents(batch)
+
+
+def search(tasks, text, limit, offset=0):
+    """
+    Return up to ``limit`` SearchHits for ``text``, best first, among the
+    documents of the given Task queryset (usually the tasks of the boards a
+    user can access), skipping the first ``offset``.
+    """
+    terms = parse_terms(text)
+    if not terms:
+        return []
+    db = router.db_for_read(Task)
+    connection = connections[db]
+    backend = get_backend(connection)
+    task_sql, task_params = tasks.order_by().values('id').query.get_compiler(using=db).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(backend.search_sql(task_sql), [backend.match_query(terms), *task_params, limit, offset])
+        rows = cursor.fetchall()
+    return [SearchHit(kind, object_id, task_id, score, render_snippet(snippet))
+            for kind, object_id, task_id, score, snippet in rows]
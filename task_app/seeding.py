@@ -0,0 +1,157 @@
+"""
+Synthetic data for benchmarks and local load tests.
+
+Activity is skewed the way it is in a real deployment: popularity follows a
+Zipf-like distribution, so a few users own and belong to most boards and
+get most assignments, a few boards hold most tasks and a few tasks collect
+most comments. The same seed always produces the same dataset.
+
+Titles, descriptions and comments are built from a small vocabulary whose
+words are Zipf-distributed too, so full-text search sees common and rare
+terms. Rows are bulk inserted, so the per-row hooks do not run; the board
+counters are rebuilt, the rows added to the search index and cached
+dashboards dropped at the end instead.
+"""
+
+import random
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from boards_app.api.models import Board, BoardStats
+from . import search
+from .api.cache import invalidate_dashboard_cache
+from .api.models import Task, Comment
+
+User = get_user_model()
+
+EMAIL_DOMAIN = 'kanmind.test'
+FIRST_NAMES = ['Anna', 'Ben', 'Clara', 'David', 'Emma', 'Felix', 'Greta', 'Hannes', 'Ida', 'Jonas', 'Lena', 'Max']
+LAST_NAMES = ['Becker', 'Fischer', 'Hoffmann', 'Koch', 'Meyer', 'Richter', 'Schmidt', 'Wagner', 'Weber', 'Wolf']
+VERBS = ['Fix', 'Add', 'Update', 'Remove', 'Refactor', 'Document', 'Test', 'Review', 'Design', 'Migrate']
+WORDS = [
+    'login', 'dashboard', 'board', 'export', 'search', 'api', 'button', 'layout', 'cache', 'database',
+    'email', 'password', 'token', 'upload', 'mobile', 'invoice', 'report', 'filter', 'deadline', 'comment',
+    'notification', 'permission', 'timeout', 'migration', 'sidebar', 'avatar', 'checkout', 'payment',
+    'translation', 'onboarding', 'webhook', 'sync', 'backup', 'latency', 'tooltip', 'calendar',
+]
+STATUS_WEIGHTS = {'to-do': 35, 'in-progress': 20, 'review': 10, 'done': 35}
+PRIORITY_WEIGHTS = {'low': 30, 'medium': 50, 'high': 20}
+BATCH_SIZE = 1000
+
+
+class SeededData(NamedTuple):
+    """The created users, boards and tasks, most active first, and the number of comments."""
+    users: list
+    boards: list
+    tasks: list
+    comments: int
+
+
+class Popularity:
+    """Weighted choice over items whose weight falls off as 1 / rank ** skew."""
+
+    def __init__(self, rng, items, skew):
+        self.rng = rng
+        self.items = items
+        total, self.cum_weights = 0.0, []
+        for rank in range(1, len(items) + 1):
+            total += 1 / rank ** skew
+            self.cum_weights.append(total)
+
+    def pick(self):
+        return self.rng.choices(self.items, cum_weights=self.cum_weights)[0]
+
+    def sample(self, count):
+        """Return up to ``count`` distinct items, popular ones more likely."""
+        picked = {}
+        for _ in range(count * 4):
+            item = self.pick()
+            picked[id(item)] = item
+            if len(picked) == count:
+                break
+        return list(picked.values())
+
+
+def seed_dataset(users=200, boards=50, members=8, tasks=20000, comments=40000,
+                 skew=1.1, seed=42, prefix='seed', password=None):
+    """
+    Bulk insert a skewed dataset and return it as SeededData.
+
+    ``members`` is the average board size, ``skew`` the Zipf exponent (0 is
+    uniform). Users get ``<prefix>-<n>@kanmind.test`` addresses and the
+    given password, or an unusable one.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    password_hash = make_password(password)
+
+    user_objs = User.objects.bulk_create([
+        User(
+            username=f'{prefix}-{i}@{EMAIL_DOMAIN}', email=f'{prefix}-{i}@{EMAIL_DOMAIN}', password=password_hash,
+            first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+        )
+        for i in range(users)
+    ], batch_size=BATCH_SIZE)
+    popular_users = Popularity(rng, user_objs, skew)
+
+    board_objs = Board.objects.bulk_create([
+        Board(name=f'{prefix.title()} board {i}', created_by=popular_users.pick()) for i in range(boards)
+    ], batch_size=BATCH_SIZE)
+    board_members = {}
+    for board in board_objs:
+        sampled = popular_users.sample(rng.randint(1, max(1, 2 * members - 1)))
+        board_members[board.id] = [board.created_by] + [u for u in sampled if u.id != board.created_by_id]
+    Board.members.through.objects.bulk_create([
+        Board.members.through(board_id=board_id, user_id=user.id)
+        for board_id, member_list in board_members.items() for user in member_list
+    ], batch_size=BATCH_SIZE)
+
+    common_words = Popularity(rng, WORDS, skew)
+
+    def text(words):
+        return ' '.join(common_words.pick() for _ in range(words))
+
+    popular_boards = Popularity(rng, board_objs, skew)
+    statuses, status_weights = zip(*STATUS_WEIGHTS.items())
+    priorities, priority_weights = zip(*PRIORITY_WEIGHTS.items())
+    task_objs = []
+    for _ in range(tasks):
+        board = popular_boards.pick()
+        member_list = board_members[board.id]
+        task_objs.append(Task(
+            title=f'{rng.choice(VERBS)} {text(2)}', description=text(rng.randint(0, 20)),
+            board=board, created_by=rng.choice(member_list),
+            assigned_to=rng.choice(member_list) if rng.random() < 0.8 else None,
+            reviewer=rng.choice(member_list) if rng.random() < 0.4 else None,
+            status=rng.choices(statuses, status_weights)[0],
+            priority=rng.choices(priorities, priority_weights)[0],
+            due_date=(now + timedelta(days=rng.randint(-30, 90))).date() if rng.random() < 0.6 else None,
+        ))
+    task_objs = Task.objects.bulk_create(task_objs, batch_size=BATCH_SIZE)
+
+    # Spread the last activity over two months so "done recently" is a real filter.
+    by_age = {}
+    for task in task_objs:
+        by_age.setdefault(rng.randint(0, 60), []).append(task.id)
+    for days, ids in by_age.items():
+        for start in range(0, len(ids), BATCH_SIZE):
+            Task.objects.filter(id__in=ids[start:start + BATCH_SIZE]).update(updated_at=now - timedelta(days=days))
+
+    hot_tasks = Popularity(rng, rng.sample(task_objs, len(task_objs)), skew) if task_objs else None
+    comment_objs = []
+    for _ in range(comments if hot_tasks else 0):
+        task = hot_tasks.pick()
+        comment_objs.append(Comment(task=task, author=rng.choice(board_members[task.board_id]),
+                                    content=text(rng.randint(3, 30))))
+    comment_objs = Comment.objects.bulk_create(comment_objs, batch_size=BATCH_SIZE)
+
+    BoardStats.rebuild()
+    for start in range(0, max(len(task_objs), len(comment_objs)), BATCH_SIZE):
+        search.index_tasks(task_objs[start:start + BATCH_SIZE])
+        search.index_comments(comment_objs[start:start + BATCH_SIZE])
+    invalidate_dashboard_cache()
+    return SeededData(user_objs, board_objs, hot_tasks.items if hot_tasks else [], len(comment_objs))
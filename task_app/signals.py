@@ -0,0 +1,250 @@
+"""
+Write hooks for task_app models.
+
+Keeps the materialized BoardStats task counters and the full-text search
+index current, records task and comment changes in the board change log
+(which also bumps Board.updated_at) and, once the write commits, drops
+the cached dashboards of the users of the changed board.
+
+Every logged change is also broadcast to the board's WebSocket
+subscribers (see boards_app.realtime) after the transaction commits.
+
+Bulk writes run inside ``bulk_write()``, which suspends the per-row
+hooks, and announce their changes once via ``tasks_bulk_changed``.
+Likewise, tasks and comments deleted together with their board skip the
+per-row hooks; the board's search documents are dropped and its users'
+dashboards invalidated once per board instead, and its counters go with it.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from boards_app.api.changes import comment_data
+from boards_app.api.models import Board, BoardChange, BoardStats
+from boards_app.realtime import broadcast
+from boards_app.signals import is_board_deleting
+from . import search
+from .api.cache import invalidate_dashboards
+from .api.models import Task, Comment
+from .api.serializers import TaskSerializer
+
+# Sent with sender=Task, board, created (tasks), updated (tasks) and deleted (task ids).
+tasks_bulk_changed = Signal()
+
+_bulk_state = threading.local()
+_deleting_tasks = threading.local()
+
+
+@contextmanager
+def bulk_write():
+    """Suspend the per-row task and comment hooks for the current thread."""
+    _bulk_state.depth = getattr(_bulk_state, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _bulk_state.depth -= 1
+
+
+def in_bulk_write():
+    """Return True while the current thread runs inside bulk_write()."""
+    return getattr(_bulk_state, 'depth', 0) > 0
+
+
+def _task_marks():
+    if not hasattr(_deleting_tasks, 'tasks'):
+        _deleting_tasks.tasks = {}
+    return _deleting_tasks.tasks
+
+
+@receiver(pre_delete, sender=Task)
+def mark_task_deleting(sender, instance, origin=None, **kwargs):
+    """Remember the board of every task a delete() is about to remove, for the comment hooks."""
+    _task_marks()[instance.pk] = (origin, instance.board_id)
+
+
+@receiver(post_delete, sender=Task)
+def unmark_task_deleting(sender, instance, **kwargs):
+    _task_marks().pop(instance.pk, None)
+
+
+def deleting_task_board(task_id, origin):
+    """Return the board id of a task the delete() with this origin removes, or None."""
+    mark = _task_marks().get(task_id)
+    return mark[1] if origin is not None and mark is not None and mark[0] is origin else None
+
+
+def deleted_with_board(instance, kwargs):
+    """Return True if the task or comment is deleted by a cascade that also deletes its board."""
+    origin = kwargs.get('origin')
+    board_id = instance.board_id if isinstance(instance, Task) else deleting_task_board(instance.task_id, origin)
+    return board_id is not None and is_board_deleting(board_id, origin)
+
+
+@receiver(pre_delete, sender=Board)
+def drop_board_search_documents(sender, instance, **kwargs):
+    """Drop the search documents of the board's tasks and comments once, before the cascade deletes them."""
+    search.remove_board(instance.pk)
+
+
+def board_user_ids(board_id):
+    """Return the ids of the board's owner and members."""
+    rows = Board.objects.filter(pk=board_id).values_list('created_by_id', 'members__id')
+    return {user_id for row in rows for user_id in row if user_id is not None}
+
+
+def invalidate_dashboards_on_commit(board_id=None, user_ids=()):
+    """
+    Drop the cached dashboards of the board's owner and members and of
+    ``user_ids`` once the transaction commits. The board's users are read
+    at commit time, so a board deleted by then only counts ``user_ids``.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    transaction.on_commit(lambda: invalidate_dashboards(
+        user_ids if board_id is None else user_ids | board_user_ids(board_id)
+    ))
+
+
+@receiver(pre_delete, sender=Board)
+def invalidate_dashboards_of_deleted_board(sender, instance, **kwargs):
+    """Drop the dashboards of the board's users and of its tasks' assignees and reviewers after the delete."""
+    people = instance.tasks.values_list('assigned_to_id', 'reviewer_id')
+    user_ids = board_user_ids(instance.pk) | {user_id for row in people for user_id in row}
+    invalidate_dashboards_on_commit(user_ids=user_ids)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def refresh_task_counts(sender, instance, signal, raw=False, created=False, **kwargs):
+    """
+    Move the task counters of the task's board by what the write changed.
+
+    The previous state is the stored row, which Task.save() and
+    Task.delete() read under a lock (queryset deletes use the rows they just
+    loaded). Without it, e.g. for a task that was already gone, the board is
+    recounted instead.
+    """
+    if raw or in_bulk_write() or deleted_with_board(instance, kwargs):
+        return
+    before = None if created else getattr(instance, '_counted_as', None)
+    after = instance.counted_as() if signal is post_save else None
+    if (before is None and not created) or (after is None and signal is post_save):
+        BoardStats.refresh_tasks([instance.board_id])
+    else:
+        BoardStats.count_task_changes([(before, after)])
+    instance._counted_as = after
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Comment)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    """Add or refresh the search document of the task or comment."""
+    if raw or in_bulk_write():
+        return
+    if sender is Task:
+        search.index_tasks([instance])
+    else:
+        search.index_comments([instance])
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Comment)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Drop the search document; comments deleted with a task send their own signal."""
+    if not in_bulk_write() and not deleted_with_board(instance, kwargs):
+        search.remove(search.TASK if sender is Task else search.COMMENT, [instance.pk])
+
+
+def change_action(signal):
+    return BoardChange.DELETE if signal is post_delete else BoardChange.UPSERT
+
+
+def event_type(kind, signal, created):
+    """Return the realtime event name, e.g. task.created, for a model signal."""
+    if signal is post_delete:
+        return f'{kind}.deleted'
+    return f'{kind}.created' if created else f'{kind}.updated'
+
+
+def task_event(task_id, action):
+    """Return the body of a task event, or None if the task is gone by commit time."""
+    if action == BoardChange.DELETE:
+        return {'task': {'id': task_id}}
+    task = Task.objects.with_related().filter(pk=task_id).first()
+    return task and {'task': TaskSerializer(task).data}
+
+
+def comment_event(comment_id, task_id, action):
+    """Return the body of a comment event, or None if the comment is gone by commit time."""
+    if action == BoardChange.DELETE:
+        return {'comment': {'id': comment_id, 'task_id': task_id}}
+    comment = Comment.objects.select_related('author').filter(pk=comment_id).first()
+    return comment and {'comment': comment_data(comment)}
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def record_task_change(sender, instance, signal, raw=False, created=False, **kwargs):
+    """Log and broadcast the task write; deletions with the board need no tombstone."""
+    if raw or in_bulk_write() or deleted_with_board(instance, kwargs):
+        return
+    action, task_id = change_action(signal), instance.pk
+    [entry] = BoardChange.record(instance.board_id, [(BoardChange.TASK, task_id, action)])
+    broadcast(instance.board_id, event_type('task', signal, created), lambda: task_event(task_id, action), entry.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def record_comment_change(sender, instance, signal, raw=False, created=False, **kwargs):
+    """Log and broadcast the comment write; the task tombstone covers comments deleted with it."""
+    if raw or in_bulk_write() or deleting_task_board(instance.task_id, kwargs.get('origin')) is not None:
+        return
+    board_id = instance.task.board_id
+    action, comment_id, task_id = change_action(signal), instance.pk, instance.task_id
+    [entry] = BoardChange.record(board_id, [(BoardChange.COMMENT, comment_id, action)])
+    broadcast(board_id, event_type('comment', signal, created),
+              lambda: comment_event(comment_id, task_id, action), entry.pk)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_dashboards(sender, instance, raw=False, **kwargs):
+    """Drop the cached dashboards of the task's board users, assignee and reviewer after the write commits."""
+    if raw or in_bulk_write() or deleted_with_board(instance, kwargs):
+        return
+    invalidate_dashboards_on_commit(instance.board_id, [instance.assigned_to_id, instance.reviewer_id])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_dashboards(sender, instance, raw=False, **kwargs):
+    """Like invalidate_task_dashboards(), for the comment's task; the task covers comments deleted with it."""
+    if raw or in_bulk_write() or deleting_task_board(instance.task_id, kwargs.get('origin')) is not None:
+        return
+    task = instance.task
+    invalidate_dashboards_on_commit(task.board_id, [task.assigned_to_id, task.reviewer_id])
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def handle_bulk_change(sender, board, created=(), updated=(), deleted=(), **kwargs):
+    """Recount, reindex, log and broadcast the batch and drop the affected dashboards once after a bulk write."""
+    BoardStats.refresh_tasks([board.pk])
+    search.index_tasks([*created, *updated])
+    search.remove_tasks_with_comments(list(deleted))
+    upserted = [task.pk for task in [*created, *updated]]
+    entries = BoardChange.record(board.pk, [
+        *[(BoardChange.TASK, task_id, BoardChange.UPSERT) for task_id in upserted],
+        *[(BoardChange.TASK, task_id, BoardChange.DELETE) for task_id in deleted],
+    ])
+    invalidate_dashboards_on_commit(board.pk, [
+        user_id for task in [*created, *updated] for user_id in (task.assigned_to_id, task.reviewer_id)
+    ])
+    if entries:
+        tasks = Task.objects.with_related().filter(pk__in=upserted).order_by('pk')
+        broadcast(board.pk, 'tasks.bulk', lambda: {
+            'tasks': TaskSerializer(tasks, many=True).data,
+            'deleted': list(deleted),
+        }, entries[-1].pk)
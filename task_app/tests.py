@@ -1,3 +1,564 @@
-from django.test import TestCase
+import json
+import tempfile
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from boards_app.api.models import Board, BoardStats
+from core.metrics import is_transaction_control, registry
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+from core.testing import QueryBudgetMixin
+from task_app import search
+from task_app.api.cache import dashboard_cache_key
+from task_app.api.models import Task, Comment
+from task_app.api.views import DashboardView
+from task_app.seeding import seed_dataset
+
+User = get_user_model()
+
+
+class DashboardTests(APITestCase):
+    """Dashboard is computed in a fixed number of queries and cached per user."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user@test.de', email='user@test.de', password='pw')
+        self.board = Board.objects.create(name='Dash', created_by=self.user)
+        self.client.force_authenticate(self.user)
+        self.url = reverse('dashboard')
+
+    def test_statistics(self):
+        Task.objects.create(board=self.board, title='late', due_date=date(2030, 5, 1), assigned_to=self.user)
+        Task.objects.create(board=self.board, title='soon', due_date=date(2030, 1, 1), reviewer=self.user)
+        Task.objects.create(board=self.board, title='finished', status='done', assigned_to=self.user)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['tasks_done_recently'], 1)
+        self.assertEqual(response.data['tickets_distribution'],
+                         {'to_do': 2, 'in_progress': 0, 'review': 0, 'done': 1})
+        self.assertEqual(response.data['urgent_to_do']['count'], 2)
+        self.assertEqual(response.data['urgent_to_do']['next_deadline']['title'], 'soon')
+        self.assertEqual(response.data['tasks_insights'], {'assigned_to_you': 2, 'to_review': 1})
+        self.assertEqual(len(response.data['your_tasks']), 2)
+
+    def test_query_budget_and_cache(self):
+        for i in range(10):
+            task = Task.objects.create(board=self.board, title=f'Task {i}', assigned_to=self.user,
+                                       due_date=date(2030, 1, i + 1))
+            task.comments.create(author=self.user, content='note')
+        with self.assertNumQueries(4):
+            first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(first.data, second.data)
+
+    def test_writes_invalidate_cache(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(board=self.board, title='new', assigned_to=self.user)
+        self.assertEqual(self.client.get(self.url).data['tasks_insights']['assigned_to_you'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.comments.create(author=self.user, content='hello')
+        self.assertEqual(self.client.get(self.url).data['your_tasks'][0]['comments_count'], 1)
+
+    def test_writes_invalidate_only_the_dashboards_of_the_board_users(self):
+        member, assignee, outsider = (
+            User.objects.create_user(username=f'{name}@test.de', email=f'{name}@test.de', password='pw')
+            for name in ('member', 'assignee', 'outsider')
+        )
+        self.board.members.add(member)
+        users = [self.user, member, assignee, outsider]
+
+        def load_dashboards():
+            for user in users:
+                self.client.force_authenticate(user)
+                self.client.get(self.url)
+
+        cached = lambda: {user.username for user in users if cache.get(dashboard_cache_key(user.pk)) is not None}
+
+        load_dashboards()
+        with self.captureOnCommitCallbacks() as callbacks:
+            Task.objects.create(board=self.board, title='new', assigned_to=assignee)
+        self.assertEqual(len(cached()), 4)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(cached(), {'outsider@test.de'})
+
+        load_dashboards()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.board.delete()
+        self.assertEqual(cached(), {'outsider@test.de'})
+
+    @override_settings(
+        CACHES={**settings.CACHES, 'dashboards': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                                  'LOCATION': 'dashboards'}},
+        DASHBOARD_CACHE='dashboards',
+    )
+    def test_uses_the_configured_cache(self):
+        self.client.get(self.url)
+        self.assertIsNotNone(caches['dashboards'].get(dashboard_cache_key(self.user.pk)))
+        self.assertIsNone(cache.get(dashboard_cache_key(self.user.pk)))
+
+
+class CursorPaginationTests(APITestCase):
+    """List endpoints paginate by keyset only when the client asks for it."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user@test.de', email='user@test.de', password='pw')
+        self.board = Board.objects.create(name='Pages', created_by=self.user)
+        self.client.force_authenticate(self.user)
+        self.tasks = [
+            Task.objects.create(board=self.board, title=f'Task {i}', assigned_to=self.user)
+            for i in range(7)
+        ]
+        # Identical timestamps must not make rows disappear between pages.
+        Task.objects.filter(id__in=[t.id for t in self.tasks[:4]]).update(updated_at=self.tasks[0].updated_at)
+        self.url = reverse('tasks_assigned')
+
+    def collect_pages(self, url):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [task['id'] for task in response.data['results']]
+            url, pages = response.data['next'], pages + 1
+        return ids, pages
+
+    def test_unpaginated_by_default(self):
+        response = self.client.get(self.url)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 7)
+
+    def test_pages_cover_every_task_once(self):
+        ids, pages = self.collect_pages(f'{self.url}?page_size=2')
+        self.assertEqual(pages, 4)
+        self.assertEqual(sorted(ids), sorted(t.id for t in self.tasks))
+
+    def test_comments_are_chronological(self):
+        task = self.tasks[0]
+        comments = [task.comments.create(author=self.user, content=str(i)) for i in range(5)]
+        ids, _ = self.collect_pages(reverse('task_comments', args=[task.id]) + '?page_size=2')
+        self.assertEqual(ids, [c.id for c in comments])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f'{self.url}?cursor=garbage')
+        self.assertEqual(response.status_code, 404)
+
+
+class UserTaskListConditionalGetTests(APITestCase):
+    """Assigned and reviewing lists are validated with one aggregate query."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user@test.de', email='user@test.de', password='pw')
+        self.board = Board.objects.create(name='Etag', created_by=self.user)
+        self.task = Task.objects.create(board=self.board, title='Mine', assigned_to=self.user, status='done')
+        self.client.force_authenticate(self.user)
+        self.url = reverse('tasks_assigned')
+
+    def revalidate(self, response):
+        return self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_not_modified_costs_one_query(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            second = self.revalidate(first)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['X-Tasks-Done-Recently'], '1')
+
+    def test_task_and_comment_writes_change_the_etag(self):
+        writes = [
+            lambda: self.task.comments.create(author=self.user, content='new'),
+            lambda: Task.objects.filter(pk=self.task.pk).update(title='Renamed', updated_at=timezone.now()),
+            lambda: Task.objects.create(board=self.board, title='Second', assigned_to=self.user),
+        ]
+        for write in writes:
+            before = self.client.get(self.url)
+            write()
+            self.assertEqual(self.revalidate(before).status_code, 200)
+
+
+class TaskBulkTests(APITestCase):
+    """Bulk endpoint writes a whole batch at once or reports per-item errors."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user@test.de', email='user@test.de', password='pw')
+        self.other = User.objects.create_user(username='other@test.de', email='other@test.de', password='pw')
+        self.board = Board.objects.create(name='Bulk', created_by=self.user)
+        self.client.force_authenticate(self.user)
+        self.url = reverse('task_bulk')
+
+    def test_create_update_delete(self):
+        moved = Task.objects.create(board=self.board, title='move me', created_by=self.user)
+        doomed = Task.objects.create(board=self.board, title='delete me', created_by=self.user)
+        payload = {
+            'board': self.board.id,
+            'create': [{'title': f'New {i}', 'assignee_id': self.other.id} for i in range(20)],
+            'update': [{'id': moved.id, 'status': 'done', 'reviewer_id': self.other.id}],
+            'delete': [doomed.id],
+        }
+        with self.assertNumQueries(17), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['created']), 20)
+        self.assertEqual(response.data['created'][0]['assignee']['id'], self.other.id)
+        self.assertEqual(response.data['updated'][0]['status'], 'done')
+        self.assertEqual(response.data['deleted'], [doomed.id])
+
+        moved.refresh_from_db()
+        self.assertEqual((moved.status, moved.reviewer_id), ('done', self.other.id))
+        self.assertFalse(Task.objects.filter(id=doomed.id).exists())
+        self.assertEqual(BoardStats.objects.get(board=self.board).ticket_count, 21)
+
+    def test_errors_are_reported_per_item_and_nothing_is_written(self):
+        payload = {
+            'board': self.board.id,
+            'create': [{'title': 'ok'}, {'title': ''}, {'title': 'x', 'assignee_id': 999}],
+            'delete': [12345],
+        }
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [(e['operation'], e['index']) for e in response.data['errors']],
+            [('create', 1), ('delete', 0), ('create', 2)],
+        )
+        self.assertFalse(Task.objects.exists())
+
+    def test_requires_membership(self):
+        self.client.force_authenticate(self.other)
+        response = self.client.post(self.url, {'board': self.board.id, 'create': [{'title': 'x'}]}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_rejects_malformed_bodies(self):
+        for payload in ([{'title': 'x'}], 'create', {'board': self.board.id, 'create': {'title': 'x'}},
+                        {'board': self.board.id, 'delete': None}):
+            response = self.client.post(self.url, payload, format='json')
+            self.assertEqual(response.status_code, 400, payload)
+
+
+class AsyncReadViewTests(APITestCase):
+    """Async read endpoints return the same payloads as their sync counterparts."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user@test.de', email='user@test.de', password='pw')
+        self.board = Board.objects.create(name='Async', created_by=self.user)
+        self.board.members.add(self.user)
+        for i in range(3):
+            task = Task.objects.create(board=self.board, title=f'Task {i}', assigned_to=self.user,
+                                       reviewer=self.user, due_date=date(2030, 1, i + 1))
+            task.comments.create(author=self.user, content='note')
+        self.client.force_authenticate(self.user)
+
+    def test_same_payloads(self):
+        pairs = [
+            (reverse('boards'), reverse('async_boards')),
+            (reverse('board_detail', args=[self.board.pk]), reverse('async_board_detail', args=[self.board.pk])),
+            (reverse('tasks_assigned'), reverse('async_tasks_assigned')),
+            (reverse('tasks_reviewing') + '?page_size=2', reverse('async_tasks_reviewing') + '?page_size=2'),
+            (reverse('dashboard'), reverse('async_dashboard')),
+        ]
+        for sync_url, async_url in pairs:
+            expected, actual = self.client.get(sync_url), self.client.get(async_url)
+            self.assertEqual(actual.status_code, 200, async_url)
+            expected_data = expected.json()
+            if 'next' in expected_data:
+                expected_data['next'] = expected_data['next'].replace(sync_url.split('?')[0], async_url.split('?')[0])
+            self.assertEqual(actual.json(), expected_data, async_url)
+
+    def test_conditional_get_and_header(self):
+        url = reverse('async_tasks_assigned')
+        first = self.client.get(url)
+        self.assertEqual(first['X-Tasks-Done-Recently'], '0')
+        with self.assertNumQueries(1):
+            second = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.get(reverse('async_dashboard'))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {'detail': 'Authentication credentials were not provided.'})
+
+
+class QueryMetricsTests(QueryBudgetMixin, APITestCase):
+    """Endpoints stay within their query budgets; the middleware reports what they cost."""
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.user = User.objects.create_user(username='user@test.de', email='user@test.de', password='pw')
+        self.board = Board.objects.create(name='Metrics', created_by=self.user)
+        self.board.members.add(self.user)
+        for i in range(5):
+            task = Task.objects.create(board=self.board, title=f'Task {i}', assigned_to=self.user,
+                                       reviewer=self.user, due_date=date(2030, 1, i + 1))
+            task.comments.create(author=self.user, content='note')
+        self.task = task
+        self.client.force_authenticate(self.user)
+
+    def test_read_endpoints_stay_within_budget(self):
+        urls = [
+            reverse('boards'), reverse('board_detail', args=[self.board.pk]),
+            reverse('board_tasks', args=[self.board.pk]), reverse('board_changes', args=[self.board.pk]) + '?since=0',
+            reverse('tasks_assigned'), reverse('tasks_reviewing'), reverse('dashboard'),
+            reverse('task_detail', args=[self.task.pk]), reverse('task_comments', args=[self.task.pk]),
+            reverse('async_boards'), reverse('async_tasks_assigned'), reverse('async_dashboard'),
+        ]
+        for url in urls:
+            self.assertEqual(self.assertWithinQueryBudget('GET', url).status_code, 200, url)
+
+    def test_write_endpoints_stay_within_budget(self):
+        other = User.objects.create_user(username='other@test.de', email='other@test.de', password='pw')
+        response = self.assertWithinQueryBudget('POST', reverse('task_create'), {
+            'board': self.board.pk, 'title': 'New', 'assignee_id': self.user.pk, 'reviewer_id': other.pk,
+            'due_date': '2030-02-01',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        url = reverse('task_detail', args=[response.data['id']])
+        response = self.assertWithinQueryBudget('PATCH', url, {
+            'status': 'review', 'priority': 'high', 'assignee_id': other.pk, 'reviewer_id': self.user.pk,
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertWithinQueryBudget('DELETE', url)
+
+        comments = reverse('task_comments', args=[self.task.pk])
+        response = self.assertWithinQueryBudget('POST', comments, {'content': 'Later'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertWithinQueryBudget('DELETE', reverse('comment_delete', args=[self.task.pk, response.data['id']]))
+
+    def test_board_writes_with_members_stay_within_budget(self):
+        first, second, third = (
+            User.objects.create_user(username=f'm{i}@test.de', email=f'm{i}@test.de', password='pw') for i in range(3)
+        )
+        response = self.assertWithinQueryBudget('POST', reverse('boards'), {
+            'title': 'Team', 'members': [self.user.pk, first.pk, second.pk],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        url = reverse('board_detail', args=[response.data['id']])
+        payloads = [
+            {'title': 'Renamed'},
+            {'members': [self.user.pk, first.pk, second.pk]},
+            {'members': [self.user.pk, first.pk, third.pk]},
+            {'members_add': [second.pk]},
+            {'members_remove': [second.pk]},
+            {'members_add': [second.pk], 'members_remove': [third.pk]},
+        ]
+        for payload in payloads:
+            self.assertEqual(self.assertWithinQueryBudget('PATCH', url, payload, format='json').status_code, 200)
+
+    def test_transaction_control_is_not_counted(self):
+        self.assertTrue(all(map(is_transaction_control, [
+            'BEGIN', 'BEGIN IMMEDIATE', 'COMMIT', 'ROLLBACK TO SAVEPOINT "s1"', 'SAVEPOINT "s1"', 'RELEASE SAVEPOINT "s1"',
+        ])))
+        self.assertFalse(is_transaction_control('SELECT "begin" FROM t'))
+
+    def test_budget_helper_fails_when_exceeded(self):
+        with mock.patch.object(DashboardView, 'query_budget', 3), self.assertRaises(AssertionError):
+            self.assertWithinQueryBudget('GET', reverse('dashboard'))
+
+    def test_disabled_by_default(self):
+        self.assertNotIn('Server-Timing', self.client.get(reverse('boards')))
+
+    @override_settings(REQUEST_METRICS={'ENABLED': True})
+    def test_server_timing_and_histograms(self):
+        response = self.client.get(reverse('dashboard'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="4 queries", serialize;dur=[\d.]+, render;dur=[\d.]+, total;dur=')
+        with mock.patch.object(DashboardView, 'query_budget', 0), self.assertLogs('core.metrics', 'WARNING'):
+            cache.clear()
+            self.client.get(reverse('dashboard'))
+
+        self.user.is_staff = True
+        self.user.save()
+        dashboard = self.client.get(reverse('request_metrics')).data['endpoints']['dashboard']
+        self.assertEqual((dashboard['requests'], dashboard['over_budget']), (2, 1))
+        self.assertEqual(dashboard['queries']['buckets']['5'], 2)
+        self.assertEqual(dashboard['size_bytes']['count'], 2)
+        self.assertEqual((dashboard['serialize_ms']['count'], dashboard['render_ms']['count']), (2, 2))
+
+
+class SearchTests(QueryBudgetMixin, APITestCase):
+    """Search ranks tasks and comments of accessible boards and follows every write."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user@test.de', email='user@test.de', password='pw')
+        self.other = User.objects.create_user(username='other@test.de', email='other@test.de', password='pw')
+        self.board = Board.objects.create(name='Search', created_by=self.user)
+        self.hidden = Board.objects.create(name='Hidden', created_by=self.other)
+        self.in_title = Task.objects.create(board=self.board, title='Fix login redirect', description='after reset')
+        self.in_body = Task.objects.create(board=self.board, title='Cleanup', description='the login page is slow')
+        self.comment = self.in_body.comments.create(author=self.user, content='Login <b>fails</b> on mobile')
+        Task.objects.create(board=self.hidden, title='Login audit')
+        self.client.force_authenticate(self.user)
+        self.url = reverse('search')
+
+    def query(self, q, **params):
+        response = self.client.get(self.url, {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def hits(self, q):
+        return [(hit['type'], hit['id']) for hit in self.query(q)['results']]
+
+    def test_ranks_title_matches_first_and_hides_other_boards(self):
+        hits = self.hits('login')
+        self.assertEqual(hits[0], ('task', self.in_title.pk))
+        self.assertCountEqual(hits, [('task', self.in_title.pk), ('task', self.in_body.pk),
+                                     ('comment', self.comment.pk)])
+
+    def test_comment_hit_names_its_task_and_escapes_snippet(self):
+        result = self.query('fails mob')['results'][0]
+        self.assertEqual((result['type'], result['task']['id']), ('comment', self.in_body.pk))
+        self.assertIn('&lt;b&gt;<mark>fails</mark>&lt;/b&gt;', result['snippet'])
+
+    def test_index_follows_writes(self):
+        self.in_title.title = 'Fix logout'
+        self.in_title.save()
+        self.comment.delete()
+        self.in_body.delete()
+        self.assertEqual(self.hits('login'), [])
+        self.assertEqual(self.hits('logout'), [('task', self.in_title.pk)])
+
+        response = self.client.post(reverse('task_bulk'), {
+            'board': self.board.pk, 'create': [{'title': 'Bulk login task'}], 'delete': [self.in_title.pk],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.hits('login'), [('task', response.data['created'][0]['id'])])
+        self.assertEqual(self.hits('logout'), [])
+
+    def test_board_delete_drops_its_documents(self):
+        def document_count():
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM {search.TABLE}')
+                return cursor.fetchone()[0]
+
+        before = document_count()
+        self.board.delete()
+        self.assertEqual(document_count(), before - 3)
+
+    def test_pages_and_budget(self):
+        for i in range(3):
+            Task.objects.create(board=self.board, title=f'Login step {i}')
+        first = self.assertWithinQueryBudget('GET', f'{self.url}?q=login&page_size=4')
+        self.assertEqual(len(first.data['results']), 4)
+        second = self.client.get(first.data['next']).data
+        self.assertEqual((len(second['results']), second['next']), (2, None))
+
+    def test_rebuild_restores_index(self):
+        search.remove(search.TASK, [self.in_title.pk])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertIn(('task', self.in_title.pk), self.hits('login'))
+
+    def test_query_is_required(self):
+        self.assertEqual(self.client.get(self.url, {'q': ' ?! '}).status_code, 400)
+
+
+class FastJSONTests(APITestCase):
+    """The orjson renderer and parser match DRF's JSON classes and fall back without orjson."""
+
+    payload = {
+        'id': 1, 'title': 'Line\u2028break ünïcode', 'due_date': date(2030, 1, 2),
+        'updated_at': datetime.fromisoformat('2030-01-02T03:04:05.678901+00:00'),
+        'ratio': Decimal('1.50'), 'key': uuid.UUID(int=1), 'tags': {'a', 'b'} - {'b'}, 'none': None,
+    }
+
+    def test_renders_like_drf(self):
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+        indented = FastJSONRenderer().render(self.payload, 'application/json; indent=2')
+        self.assertEqual(indented, JSONRenderer().render(self.payload, 'application/json; indent=2'))
+
+    def test_falls_back_for_values_orjson_refuses(self):
+        for data in ({'big': 2 ** 64}, {'big': -(2 ** 70)}, [10 ** 30, 'x']):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_non_finite_floats_become_null(self):
+        self.assertEqual(FastJSONRenderer().render({'n': float('nan'), 'i': float('inf')}), b'{"n":null,"i":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({'n': float('nan')})
+
+    def test_falls_back_without_orjson(self):
+        with mock.patch('core.renderers.orjson', None), mock.patch('core.parsers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+            self.assertEqual(FastJSONParser().parse(BytesIO(b'{"a": [1]}')), {'a': [1]})
+
+    def test_parses_and_rejects_invalid_json(self):
+        self.assertEqual(FastJSONParser().parse(BytesIO('{"title": "ü", "n": 1.5}'.encode())), {'title': 'ü', 'n': 1.5})
+        for body in (b'{"title": ', b'{"n": NaN}'):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(BytesIO(body))
+
+    def test_api_uses_fast_classes(self):
+        user = User.objects.create_user(username='user@test.de', email='user@test.de', password='pw')
+        board = Board.objects.create(name='JSON', created_by=user)
+        self.client.force_authenticate(user)
+        response = self.client.post(reverse('task_create'), b'{"board": %d, "title": "Fast", "due_date": "2030-01-02"}'
+                                    % board.pk, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response.json()['due_date'], '2030-01-02')
+
+
+class SeedDataTests(APITestCase):
+    """Seeded data is reproducible, skewed and keeps the board counters right."""
+
+    def snapshot(self, data):
+        """Describe the tasks independently of the user prefix."""
+        index = {user.pk: i for i, user in enumerate(data.users)}
+        return [(data.boards.index(t.board), index.get(t.assigned_to_id), t.status, t.due_date) for t in data.tasks]
+
+    def test_same_seed_same_data(self):
+        first = seed_dataset(users=10, boards=4, tasks=50, comments=30, prefix='a')
+        second = seed_dataset(users=10, boards=4, tasks=50, comments=30, prefix='b')
+        self.assertEqual(self.snapshot(first), self.snapshot(second))
+        self.assertEqual(Comment.objects.count(), 60)
+
+    def test_activity_is_skewed(self):
+        data = seed_dataset(users=20, boards=10, tasks=500, comments=0)
+        counts = sorted((board.tasks.count() for board in data.boards), reverse=True)
+        self.assertGreater(counts[0], 500 / 10 * 2)
+        self.assertEqual(BoardStats.objects.get(board=data.boards[0]).ticket_count, data.boards[0].tasks.count())
+        self.assertTrue(all(board.members.filter(pk=board.created_by_id).exists() for board in data.boards))
+
+
+@override_settings(PASSWORD_HASHING={**settings.PASSWORD_HASHING, 'PBKDF2_ITERATIONS': 1000})
+class BenchmarkApiCommandTests(APITestCase):
+    """The API benchmark covers every route, writes a baseline and flags regressions."""
+
+    def run_benchmark(self, baseline, *args):
+        out = StringIO()
+        call_command('benchmark_api', '--users', '5', '--boards', '3', '--tasks', '30', '--comments', '20',
+                     '--repeat', '1', '--baseline', str(baseline), *args, stdout=out)
+        return out.getvalue()
+
+    def test_baseline_and_regressions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = Path(directory) / 'baseline.json'
+            output = self.run_benchmark(baseline, '--write-baseline')
+            self.assertNotIn('has no benchmark scenario', output)
+            results = json.loads(baseline.read_text())['endpoints']
+            self.assertTrue(all(result['status'] < 400 for result in results.values()), results)
+            self.assertEqual(results['boards']['queries'], 1)
+            self.assertFalse(Task.objects.exists())
+
+            self.assertIn('No regressions', self.run_benchmark(baseline, '--tolerance', '1000'))
+
+            results['dashboard']['queries'] = 1
+            baseline.write_text(json.dumps({'meta': {}, 'endpoints': results}))
+            with self.assertRaisesMessage(CommandError, '1 endpoint(s) regressed'):
+                self.run_benchmark(baseline, '--tolerance', '1000')